@@ -0,0 +1,378 @@
+"""Benchmark suite with per-phase timing
+
+Runs a set of model problems over a range of mesh sizes and, for each
+run, records the wall and CPU time spent in matrix assembly
+(`_buildAndAddMatrices`), in the linear solve (`Solver._solve`), in
+recomputing `Variable` values (`_calcValue`) and in everything else.
+Times are exclusive: variables evaluated while assembling a matrix are
+charged to "variables", not "assembly".  Results are written as JSON so that runs
+from different versions can be compared.
+
+The solver suite is selected when :mod:`fipy` is first imported, and
+the peak memory of a process (`maxrss`) only ever grows, so each problem
+at each size, with each suite given with ``--suites``, is run in a
+process of its own::
+
+    $ python examples/benchmarking/suite.py --suites=scipy,petsc \\
+    >     --problems=diffusion,phaseField --sizes=1e3,1e4,1e5 \\
+    >     --numberOfSteps=10 --output=benchmarks.json
+
+Pass ``--tracemalloc`` to also record the peak memory allocated within
+each phase (at a substantial cost in speed).
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+
+import argparse
+import functools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+PHASES = ("assembly", "solve", "variables", "other")
+
+class PhaseTimer(object):
+    """Accumulate exclusive wall time, CPU time and calls per phase.
+
+    Phases nest: entering a phase pauses the enclosing one.  Re-entering
+    the phase that is already running (e.g., a `_BinaryTerm` building
+    its constituent terms) is counted as part of the outer call.
+    """
+
+    def __init__(self, traceMemory=False):
+        self.traceMemory = traceMemory and tracemalloc is not None
+        self.reset()
+
+    def reset(self):
+        self.stats = dict((phase, dict(wall=0., cpu=0., calls=0, peak=0))
+                          for phase in PHASES)
+        self._stack = [["other", 0]]
+        self._mark = self._now()
+        if self.traceMemory and tracemalloc.is_tracing():
+            tracemalloc.clear_traces()
+
+    @staticmethod
+    def _now():
+        return (time.perf_counter(), time.process_time())
+
+    def _charge(self, phase):
+        now = self._now()
+        stats = self.stats[phase]
+        stats["wall"] += now[0] - self._mark[0]
+        stats["cpu"] += now[1] - self._mark[1]
+        self._mark = now
+
+    def _notePeak(self, phase):
+        if self.traceMemory:
+            current, peak = tracemalloc.get_traced_memory()
+            stats = self.stats[phase]
+            stats["peak"] = max(stats["peak"], peak)
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+
+    def enter(self, phase):
+        top = self._stack[-1]
+        if top[0] == phase:
+            top[1] += 1
+            return
+        self._charge(top[0])
+        self._notePeak(top[0])
+        self.stats[phase]["calls"] += 1
+        self._stack.append([phase, 0])
+
+    def exit(self, phase):
+        top = self._stack[-1]
+        if top[1] > 0:
+            top[1] -= 1
+            return
+        self._charge(phase)
+        self._notePeak(phase)
+        self._stack.pop()
+
+    def finish(self):
+        self._charge(self._stack[-1][0])
+        self._notePeak(self._stack[-1][0])
+        return self.stats
+
+    def wrap(self, cls, name, phase):
+        """Replace the method `name` of `cls` with a timed version.
+        """
+        method = cls.__dict__[name]
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            self.enter(phase)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.exit(phase)
+
+        setattr(cls, name, timed)
+        return (cls, name, method)
+
+def _subclasses(cls):
+    result = [cls]
+    for sub in cls.__subclasses__():
+        result.extend(_subclasses(sub))
+    return result
+
+def instrument(timer):
+    """Time the assembly, solve and variable evaluation methods of FiPy.
+
+    Returns a list of the replaced methods to pass to `restore`.
+    """
+    from fipy.terms.term import Term
+    from fipy.solvers.solver import Solver
+    from fipy.variables.variable import Variable
+
+    replaced = []
+    # with `FIPY_INPLACE`, cached variables are evaluated by
+    # `_calcValueInPlace()` and `_calcValueIn()`, not `_calcValue()`
+    for base, name, phase in ((Term, "_buildAndAddMatrices", "assembly"),
+                              (Solver, "_solve", "solve"),
+                              (Variable, "_calcValue", "variables"),
+                              (Variable, "_calcValueIn", "variables"),
+                              (Variable, "_calcValueInPlace", "variables")):
+        for cls in set(_subclasses(base)):
+            if name in cls.__dict__:
+                replaced.append(timer.wrap(cls, name, phase))
+
+    return replaced
+
+def restore(replaced):
+    for cls, name, method in replaced:
+        setattr(cls, name, method)
+
+def diffusion(N):
+    """Transient diffusion with a solution-dependent diffusivity.
+    """
+    import fipy as fp
+
+    mesh = fp.Grid2D(nx=N, ny=N, dx=1. / N, dy=1. / N)
+    var = fp.CellVariable(mesh=mesh, value=0., hasOld=True)
+    var.constrain(1., mesh.facesLeft)
+    var.constrain(0., mesh.facesRight)
+    eq = fp.TransientTerm() == fp.DiffusionTerm(coeff=1. + var**2)
+
+    def step():
+        var.updateOld()
+        eq.sweep(var=var, dt=1e-3)
+
+    return mesh, step
+
+def convectionDiffusion(N):
+    """Transient convection-diffusion with the power-law scheme.
+    """
+    import fipy as fp
+
+    mesh = fp.Grid2D(nx=N, ny=N, dx=1. / N, dy=1. / N)
+    var = fp.CellVariable(mesh=mesh, value=0., hasOld=True)
+    var.constrain(1., mesh.facesLeft)
+    velocity = fp.FaceVariable(mesh=mesh, rank=1, value=(1., 0.5))
+    eq = (fp.TransientTerm()
+          == fp.DiffusionTerm(coeff=0.01)
+          - fp.PowerLawConvectionTerm(coeff=velocity))
+
+    def step():
+        var.updateOld()
+        eq.sweep(var=var, dt=1e-2)
+
+    return mesh, step
+
+def phaseField(N):
+    """Allen-Cahn solidification with a nonlinear implicit source.
+    """
+    import fipy as fp
+
+    mesh = fp.Grid2D(nx=N, ny=N, dx=1. / N, dy=1. / N)
+    x, y = mesh.cellCenters
+    phase = fp.CellVariable(mesh=mesh, value=0., hasOld=True)
+    phase.setValue(1., where=(x - 0.5)**2 + (y - 0.5)**2 < 0.1**2)
+    eps = 2. / N
+    mPhi = (1 - phase) * (phase - 0.5 - 0.1 * phase.grad.mag) / eps**2
+    eq = (fp.TransientTerm()
+          == fp.DiffusionTerm(coeff=1.)
+          + fp.ImplicitSourceTerm(coeff=mPhi * (phase < 0.5))
+          + mPhi * phase * (phase >= 0.5))
+
+    def step():
+        phase.updateOld()
+        for sweep in range(2):
+            eq.sweep(var=phase, dt=eps**2 / 10.)
+
+    return mesh, step
+
+PROBLEMS = dict(diffusion=diffusion,
+                convectionDiffusion=convectionDiffusion,
+                phaseField=phaseField)
+
+def run(problem, size, steps, traceMemory=False):
+    """Benchmark `steps` steps of `problem` on a mesh of about `size` cells.
+    """
+    N = max(1, int(round(size**0.5)))
+
+    timer = PhaseTimer(traceMemory=traceMemory)
+    if timer.traceMemory:
+        tracemalloc.start()
+
+    replaced = instrument(timer)
+    try:
+        timer.reset()
+        mesh, step = PROBLEMS[problem](N)
+        setup = timer.finish()
+
+        timer.reset()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        for i in range(steps):
+            step()
+        wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+        phases = timer.finish()
+    finally:
+        restore(replaced)
+        if timer.traceMemory:
+            tracemalloc.stop()
+
+    result = dict(problem=problem,
+                  numberOfCells=mesh.globalNumberOfCells,
+                  steps=steps,
+                  setup=dict(wall=sum(s["wall"] for s in setup.values()),
+                             cpu=sum(s["cpu"] for s in setup.values())),
+                  wall=wall,
+                  cpu=cpu,
+                  phases=phases)
+
+    if resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            # Linux reports KiB, macOS reports bytes
+            maxrss *= 1024
+        result["maxrss"] = maxrss
+
+    return result
+
+def _environment():
+    import numpy
+    import fipy
+    from fipy.solvers import solver
+
+    return dict(fipy=fipy.__version__,
+                numpy=numpy.__version__,
+                python=platform.python_version(),
+                platform=platform.platform(),
+                suite=solver,
+                time=time.strftime("%Y-%m-%dT%H:%M:%S"))
+
+def runSuite(problems, sizes, steps, traceMemory=False, verbose=True):
+    """Run every problem at every size with the current solver suite.
+    """
+    results = []
+    for problem in problems:
+        for size in sizes:
+            result = run(problem, size, steps, traceMemory=traceMemory)
+            if verbose:
+                print("%-20s %10d cells %8.3f s  " % (problem, result["numberOfCells"], result["wall"])
+                      + "  ".join("%s %.3f" % (phase, result["phases"][phase]["wall"])
+                                  for phase in PHASES),
+                      file=sys.stderr)
+            results.append(result)
+
+    return dict(environment=_environment(), results=results)
+
+def _parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--problems", default=",".join(sorted(PROBLEMS)),
+                        help="comma-separated problems (%s)" % ", ".join(sorted(PROBLEMS)))
+    parser.add_argument("--sizes", default="1e3,1e4",
+                        help="comma-separated approximate numbers of cells")
+    parser.add_argument("--numberOfSteps", type=int, default=10)
+    parser.add_argument("--suites", default=None,
+                        help="comma-separated solver suites")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="record the peak memory allocated in each phase")
+    parser.add_argument("--output", default=None,
+                        help="JSON file to write (default: standard output)")
+    parser.add_argument("--inProcess", action="store_true",
+                        help=argparse.SUPPRESS)
+    return parser
+
+def _runIsolated(suite, problem, size, args, unknown):
+    """Run one problem at one size in a new process and return its run.
+    """
+    fd, path = tempfile.mkstemp(".json")
+    os.close(fd)
+    try:
+        cmd = [sys.executable or "python", os.path.abspath(__file__),
+               "--problems=%s" % problem,
+               "--sizes=%d" % size,
+               "--numberOfSteps=%d" % args.numberOfSteps,
+               "--output=%s" % path,
+               "--inProcess"]
+        if args.tracemalloc:
+            cmd.append("--tracemalloc")
+        env = os.environ.copy()
+        if suite is not None:
+            env["FIPY_SOLVERS"] = suite
+        subprocess.check_call(cmd + unknown, env=env)
+        with open(path) as f:
+            run, = json.load(f)["runs"]
+    finally:
+        os.remove(path)
+
+    return run
+
+def main(argv=None):
+    args, unknown = _parser().parse_known_args(argv)
+
+    problems = args.problems.split(",")
+    for problem in problems:
+        if problem not in PROBLEMS:
+            raise ValueError("Unknown problem: %s" % problem)
+    sizes = [int(float(size)) for size in args.sizes.split(",")]
+
+    if args.inProcess:
+        runs = [runSuite(problems, sizes, args.numberOfSteps, traceMemory=args.tracemalloc)]
+    else:
+        if args.suites is None:
+            # use whatever suite FiPy selects
+            suites = [None]
+        else:
+            suites = args.suites.split(",")
+
+        runs = []
+        for suite in suites:
+            run = None
+            for problem in problems:
+                for size in sizes:
+                    isolated = _runIsolated(suite, problem, size, args, unknown)
+                    if run is None:
+                        run = isolated
+                    else:
+                        run["results"].extend(isolated["results"])
+            runs.append(run)
+
+    report = json.dumps(dict(runs=runs), indent=2, sort_keys=True)
+    if args.output is None:
+        print(report)
+    else:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+if __name__ == "__main__":
+    main()
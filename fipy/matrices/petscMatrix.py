@@ -186,6 +186,10 @@ class _PETScMatrix(_SparseMatrix):
     @property
     def _range(self):
         return list(range(self._shape[1])), list(range(self._shape[0]))
+
+    @property
+    def _numberOfNonzeros(self):
+        return int(self.matrix.getInfo(PETSc.Mat.InfoType.GLOBAL_SUM)["nz_used"])
         
     def put(self, vector, id1, id2):
         """
@@ -595,7 +599,7 @@ class _PETScMeshMatrix(_PETScMatrixFromShape):
             
         return self._ghosts_
         
-    def _fipy2petscGhost(self, var):
+    def _fipy2petscGhost(self, var, vec=None):
         """Convert a FiPy Variable to a PETSc `GhostVec`
         
         Moves the ghosts to the end, as necessary. 
@@ -622,11 +626,20 @@ class _PETScMeshMatrix(_PETScMatrixFromShape):
         ```
         
         where the [a, b] are the global ghost indices
+
+        If `vec` is a `GhostVec` from a previous conversion for the
+        same mesh, the values are copied into it, instead of creating
+        a new `GhostVec` and its scatter.
         """
         corporeal = numerix.asarray(var[..., self._bodies]).ravel()
         incorporeal = numerix.asarray(var[..., ~self._bodies]).ravel()
         array = numerix.concatenate([corporeal, incorporeal])
 
+        if vec is not None and vec.getLocalSize() == len(corporeal):
+            with vec.localForm() as lf:
+                lf.setArray(array)
+            return vec
+
         comm = self.mesh.communicator.petsc4py_comm
         vec = PETSc.Vec().createGhostWithArray(ghosts=self._ghosts.astype('int32'),
                                                array=array,
@@ -154,6 +154,10 @@ class _PysparseMatrix(_SparseMatrix):
     def _range(self):
         return list(range(self._shape[1])), list(range(self._shape[0]))
 
+    @property
+    def _numberOfNonzeros(self):
+        return self.matrix.nnz
+
     def put(self, vector, id1, id2):
         """
         Put elements of `vector` at positions of the matrix corresponding to (`id1`, `id2`)
@@ -4,11 +4,54 @@ __docformat__ = 'restructuredtext'
 
 __all__ = []
 
+import hashlib
+from collections import OrderedDict
+
 import scipy.sparse as sp
 from fipy.tools import numerix
 
 from fipy.matrices.sparseMatrix import _SparseMatrix
 
+class _ScipyPattern(object):
+    """Sparsity pattern of an assembled set of `(id1, id2)` triplets.
+
+    Holds the CSR structure together with the map from each triplet to
+    its slot in the CSR data array, so that assembling the same triplets
+    again only requires summing the values into place.
+    """
+
+    def __init__(self, id1, id2, shape):
+        self.id1 = id1
+        self.id2 = id2
+        keys = id1.astype('int64') * shape[1] + id2
+        keys, self.slots = numerix.unique(keys, return_inverse=True)
+        rows = keys // shape[1]
+        self.indices = (keys % shape[1]).astype('int32')
+        self.indptr = numerix.concatenate(([0], numerix.cumsum(numerix.bincount(rows, minlength=shape[0])))).astype('int32')
+        self.shape = shape
+
+    def matches(self, pending, shape):
+        """Whether the `(vector, id1, id2)` triplets in `pending` are the
+        ones this pattern was built from.
+        """
+        if shape != self.shape:
+            return False
+        start = 0
+        for vector, id1, id2 in pending:
+            stop = start + len(id1)
+            if not (numerix.array_equal(id1, self.id1[start:stop])
+                    and numerix.array_equal(id2, self.id2[start:stop])):
+                return False
+            start = stop
+        return start == len(self.id1)
+
+    def assemble(self, vector):
+        data = numerix.bincount(self.slots, weights=vector, minlength=len(self.indices))
+        matrix = sp.csr_matrix((data, self.indices, self.indptr), shape=self.shape)
+        # keys are unique and sorted
+        matrix.has_canonical_format = True
+        return matrix
+
 class _ScipyMatrix(_SparseMatrix):
 
     """class wrapper for a scipy sparse matrix.
@@ -16,8 +59,53 @@ class _ScipyMatrix(_SparseMatrix):
     `_ScipyMatrix` is always `NxN`.
     Allows basic python operations __add__, __sub__ etc.
     Facilitate matrix populating in an easy way.
+
+    Calls to `addAt` are deferred: the `(vector, id1, id2)` triplets are
+    accumulated and only converted to CSR, in a single pass, when
+    `matrix` is first accessed.  The sparsity pattern of each assembly
+    is cached, so subsequent assemblies of the same structure (e.g., the
+    next time step on the same mesh) only write the values into the data
+    array.
+
+        >>> L = _ScipyMatrixFromShape(size=3)
+        >>> L.addAt([1., 2., 3.], [0, 1, 2], [0, 1, 2])
+        >>> L.addAt([4., 5.], [0, 2], [1, 2])
+        >>> len(L._pending)
+        2
+        >>> print(L)
+         1.000000   4.000000      ---    
+            ---     2.000000      ---    
+            ---        ---     8.000000  
+        >>> len(L._pending)
+        0
+
+    Assembling the same structure again reuses the cached pattern
+
+        >>> M = _ScipyMatrixFromShape(size=3)
+        >>> M.addAt([1., 2., 3.], [0, 1, 2], [0, 1, 2])
+        >>> M.addAt([6., 7.], [0, 2], [1, 2])
+        >>> numerix.may_share_memory(M.matrix.indices, L.matrix.indices)
+        True
+        >>> print(M)
+         1.000000   6.000000      ---    
+            ---     2.000000      ---    
+            ---        ---    10.000000  
+
+    but a pattern offered for different triplets is not used
+
+        >>> N = _ScipyMatrixFromShape(size=3)
+        >>> N._setSparsityPattern(M._getSparsityPattern())
+        >>> N.addAt([1., 2., 3.], [0, 1, 2], [0, 1, 2])
+        >>> N.addAt([6., 7.], [1, 2], [0, 2])
+        >>> print(N)
+         1.000000      ---        ---    
+         6.000000   2.000000      ---    
+            ---        ---    10.000000  
     """
 
+    _patterns = OrderedDict()
+    _maxPatterns = 16
+
     def __init__(self, matrix):
         """Creates a `_ScipyMatrix`.
 
@@ -28,6 +116,84 @@ class _ScipyMatrix(_SparseMatrix):
         """
         self.matrix = matrix
 
+    def _getMatrix(self):
+        if self._pending:
+            self._assemble()
+        return self._matrix
+
+    def _setMatrix(self, m):
+        self._pending = []
+        self._structural = True
+        self._pattern = None
+        self._patternHint = None
+        self._matrix = m
+
+    def _delMatrix(self):
+        self._pending = []
+        del self._matrix
+
+    matrix = property(_getMatrix, _setMatrix, _delMatrix)
+
+    @classmethod
+    def _getPattern(cls, id1, id2, shape):
+        key = hashlib.sha1()
+        key.update(id1.tobytes())
+        key.update(id2.tobytes())
+        key = (shape, id1.dtype.str, id2.dtype.str, key.hexdigest())
+
+        pattern = cls._patterns.pop(key, None)
+        if pattern is None:
+            pattern = _ScipyPattern(id1, id2, shape)
+        cls._patterns[key] = pattern
+        while len(cls._patterns) > cls._maxPatterns:
+            cls._patterns.popitem(last=False)
+
+        return pattern
+
+    def _assemble(self):
+        """Convert the accumulated triplets to CSR in one pass.
+        """
+        pending = self._pending
+        self._pending = []
+        shape = self._matrix.shape
+
+        if self._matrix.nnz > 0:
+            # entries of an assembled matrix may have been pruned,
+            # so their structure depends on their values
+            self._structural = False
+            coo = self._matrix.tocoo()
+            pending.insert(0, (coo.data, coo.row, coo.col))
+
+        hint = self._patternHint
+        if (hint is not None
+            and self._structural
+            and hint.matches(pending, shape)):
+            vector = numerix.concatenate([vector for vector, id1, id2 in pending])
+            if not numerix.iscomplexobj(vector):
+                self._pattern = hint
+                self._matrix = hint.assemble(vector)
+                return
+
+        vector, id1, id2 = [numerix.concatenate(arrays) for arrays in zip(*pending)]
+
+        if numerix.iscomplexobj(vector):
+            self._pattern = None
+            self._matrix = sp.csr_matrix((vector, (id1, id2)), shape)
+        else:
+            self._pattern = self._getPattern(id1, id2, shape)
+            self._matrix = self._pattern.assemble(vector)
+
+    def _getSparsityPattern(self):
+        if self._pending:
+            self._assemble()
+        if self._structural:
+            return self._pattern
+        else:
+            return None
+
+    def _setSparsityPattern(self, pattern):
+        self._patternHint = pattern
+
     def getCoupledClass(self):
         return _CoupledScipyMeshMatrix
 
@@ -45,7 +211,15 @@ class _ScipyMatrix(_SparseMatrix):
         return self._iadd(other)
 
     def _iadd(self, other, sign=1):
-        if hasattr(other, "matrix"):
+        if isinstance(other, _ScipyMatrix) and other._matrix.shape == self._matrix.shape:
+            # defer the addition until the sum is needed
+            for vector, id1, id2 in other._pending:
+                self._pending.append((sign * vector, id1, id2))
+            if other._matrix.nnz > 0:
+                self._structural = False
+                coo = other._matrix.tocoo()
+                self._pending.append((sign * coo.data, coo.row, coo.col))
+        elif hasattr(other, "matrix"):
             self.matrix = self.matrix + (sign * other.matrix)
         elif type(other) in [float, int]:
             fillVec = numerix.repeat(other, self.matrix.nnz)
@@ -161,6 +335,10 @@ class _ScipyMatrix(_SparseMatrix):
     def _range(self):
         return list(range(self._shape[1])), list(range(self._shape[0]))
 
+    @property
+    def _numberOfNonzeros(self):
+        return self.matrix.nnz
+
     def put(self, vector, id1, id2):
         """
         Put elements of `vector` at positions of the matrix corresponding to (`id1`, `id2`)
@@ -174,12 +352,38 @@ class _ScipyMatrix(_SparseMatrix):
         """
         assert(len(id1) == len(id2) == len(vector))
 
+        id1 = numerix.asarray(id1)
+        id2 = numerix.asarray(id2)
+
+        slots = self._findSlots(id1, id2)
+        if slots is not None:
+            # every position is already stored, so write in place
+            self._matrix.data[slots] = vector
+            return
+
         # done in such a way to vectorize everything
         tempVec = numerix.array(vector) - self.matrix[id1, id2].flat
         tempMat = sp.csr_matrix((tempVec, (id1, id2)), self.matrix.shape)
 
         self.matrix = self.matrix + tempMat
 
+    def _findSlots(self, id1, id2):
+        """Positions of (`id1`, `id2`) in the CSR data array or `None`.
+        """
+        A = self.matrix
+        if len(id1) == 0 or A.nnz == 0:
+            return None
+        A.sum_duplicates()
+        rows = numerix.repeat(numerix.arange(A.shape[0]), numerix.diff(A.indptr))
+        keys = rows.astype('int64') * A.shape[1] + A.indices
+        wanted = id1.astype('int64') * A.shape[1] + id2
+        slots = numerix.searchsorted(keys, wanted)
+        slots = numerix.minimum(slots, len(keys) - 1)
+        if numerix.all(keys[slots] == wanted):
+            return slots
+        else:
+            return None
+
     def putDiagonal(self, vector):
         """
         Put elements of `vector` along diagonal of matrix
@@ -221,9 +425,9 @@ class _ScipyMatrix(_SparseMatrix):
         """
         assert(len(id1) == len(id2) == len(vector))
 
-        temp = sp.csr_matrix((vector, (id1, id2)), self.matrix.shape)
-
-        self.matrix = self.matrix + temp
+        self._pending.append((numerix.array(vector).ravel(),
+                              numerix.array(id1, dtype='int64').ravel(),
+                              numerix.array(id2, dtype='int64').ravel()))
 
     def addAtDiagonal(self, vector):
         if type(vector) in [type(1), type(1.)]:
@@ -18,6 +18,7 @@ class _SparseMatrix(object):
     matrix     = None
     numpyArray = property()
     _shape     = property()
+    _numberOfNonzeros = None
 
     __array_priority__ = 100.0
 
@@ -119,6 +120,16 @@ class _SparseMatrix(object):
     def exportMmf(self, filename):
         pass
 
+    def _getSparsityPattern(self):
+        """Return the assembled sparsity pattern, if the backend supports reuse.
+        """
+        return None
+
+    def _setSparsityPattern(self, pattern):
+        """Provide the pattern of a previous assembly of the same structure.
+        """
+        pass
+
 ##     def __array__(self):
 ##      shape = self._shape
 ##      indices = numerix.indices(shape)
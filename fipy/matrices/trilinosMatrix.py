@@ -278,6 +278,10 @@ class _TrilinosMatrix(_SparseMatrix):
         N = self.matrix.NumGlobalRows()
         return (N, N)
 
+    @property
+    def _numberOfNonzeros(self):
+        return self.matrix.NumGlobalNonzeros()
+
 
 
     def put(self, vector, id1, id2):
@@ -557,6 +561,33 @@ class _TrilinosMatrixFromShape(_TrilinosMatrix):
                                      domainMap=domainMap,
                                      bandwidth=bandwidth)
 
+class _TrilinosMeshMaps(object):
+    """The `Epetra.Map` objects, and the `Epetra.Import` between them,
+    shared by every matrix of a `Mesh` with the same number of variables
+    and equations.
+
+    Building a map requires global communication, so the maps are built
+    once per `Mesh` rather than once per matrix.
+
+    Parameters
+    ----------
+    rowMap : Epetra.Map
+        The non-overlapping rows (and domain) held by this processor.
+    colMap : Epetra.Map
+        The overlapping columns held by this processor.
+    """
+    def __init__(self, rowMap, colMap):
+        self.rowMap = rowMap
+        self.colMap = colMap
+
+    @property
+    def importer(self):
+        """`Epetra.Import` of non-overlapping values into overlapping values
+        """
+        if not hasattr(self, '_importer'):
+            self._importer = Epetra.Import(self.colMap, self.rowMap)
+        return self._importer
+
 class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
     def __init__(self, mesh, bandwidth=0, sizeHint=None, numberOfVariables=1, numberOfEquations=1):
         """Creates a `_TrilinosMatrixFromShape` associated with a `Mesh`
@@ -578,19 +609,48 @@ class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
         self.numberOfVariables = numberOfVariables
         self.numberOfEquations = numberOfEquations
 
-        comm = mesh.communicator.epetra_comm
-        rowMap = Epetra.Map(-1, list(self._globalNonOverlappingRowIDs), 0, comm)
-        colMap = Epetra.Map(-1, list(self._globalOverlappingColIDs), 0, comm)
-        domainMap = rowMap
+        self._maps = self._getMaps()
 
         _TrilinosMatrixFromShape.__init__(self,
                                  rows=self.numberOfEquations * self.mesh.globalNumberOfCells,
                                  cols=self.numberOfVariables * self.mesh.globalNumberOfCells,
                                  bandwidth=bandwidth,
                                  sizeHint=sizeHint,
-                                 rowMap=rowMap,
-                                 colMap=colMap,
-                                 domainMap=domainMap)
+                                 rowMap=self._maps.rowMap,
+                                 colMap=self._maps.colMap,
+                                 domainMap=self._maps.rowMap)
+
+    def _getMaps(self):
+        """Maps of this matrix, cached on the `Mesh`
+
+            >>> from fipy import Grid1D
+            >>> mesh = Grid1D(nx=3)
+            >>> A = _TrilinosMeshMatrix(mesh=mesh, numberOfVariables=2, numberOfEquations=2)
+            >>> B = _TrilinosMeshMatrix(mesh=mesh, numberOfVariables=2, numberOfEquations=2)
+            >>> print(A.colMap is B.colMap and A._importer is B._importer)
+            True
+            >>> C = _TrilinosMeshMatrix(mesh=mesh)
+            >>> print(C.colMap is A.colMap)
+            False
+        """
+        if not hasattr(self.mesh, '_trilinosMapsCache'):
+            self.mesh._trilinosMapsCache = {}
+
+        key = (self.numberOfVariables, self.numberOfEquations)
+        if key not in self.mesh._trilinosMapsCache:
+            comm = self.mesh.communicator.epetra_comm
+            rowMap = Epetra.Map(-1, list(self._globalNonOverlappingRowIDs), 0, comm)
+            colMap = Epetra.Map(-1, list(self._globalOverlappingColIDs), 0, comm)
+            self.mesh._trilinosMapsCache[key] = _TrilinosMeshMaps(rowMap=rowMap,
+                                                                  colMap=colMap)
+
+        return self.mesh._trilinosMapsCache[key]
+
+    @property
+    def _importer(self):
+        """`Epetra.Import` from the domain map to the column map
+        """
+        return self._maps.importer
 
     def _cellIDsToGlobalRowIDs(self, IDs):
          N = len(IDs)
@@ -687,10 +747,8 @@ class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
 
     def _getMatrixProperty(self):
         if not hasattr(self, '_matrix'):
-            self._matrix = _TrilinosMeshMatrix(self.mesh,
-                                               bandwidth=self.bandwidth,
-                                               numberOfVariables=self.numberOfVariables,
-                                               numberOfEquations=self.numberOfEquations).matrix
+            self._matrix = Epetra.CrsMatrix(Epetra.Copy, self.rowMap,
+                                            (self.bandwidth*3)//2)
         return super(_TrilinosMeshMatrix, self).matrix
 
     matrix = property(_getMatrixProperty, _TrilinosMatrixFromShape._setMatrix)
@@ -708,8 +766,7 @@ class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
 
         overlapping_result = Epetra.Vector(self.colMap)
         overlapping_result.Import(nonoverlapping_result,
-                                  Epetra.Import(self.colMap,
-                                                self.domainMap),
+                                  self._importer,
                                   Epetra.Insert)
 
         return overlapping_result
@@ -790,8 +847,7 @@ class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
                     if other_map.SameAs(self.colMap):
                         overlapping_result = Epetra.Vector(self.colMap)
                         overlapping_result.Import(nonoverlapping_result,
-                                                  Epetra.Import(self.colMap,
-                                                                self.domainMap),
+                                                  self._importer,
                                                   Epetra.Insert)
 
                         return overlapping_result
@@ -1354,6 +1410,11 @@ class _TrilinosMeshMatrixKeepStencil(_TrilinosMeshMatrix):
         """Deletes the matrix but maintains the stencil used
         `_globalNonOverlapping()` in as it can be expensive to construct.
 
+        When the stencil is kept, the matrix is kept as well, with its
+        values zeroed.  Its `Epetra.CrsGraph` is already fill-completed
+        with exactly the entries of the stencil, so the next assembly sums
+        into it in place instead of inserting into a new matrix.
+
         Parameters
         ----------
         cacheStencil : bool
@@ -1362,9 +1423,12 @@ class _TrilinosMeshMatrixKeepStencil(_TrilinosMeshMatrix):
 
         """
 
-        del self._matrix
-        if not cacheStencil:
-            del self.stencil
+        if cacheStencil and self.matrix.Filled():
+            self.matrix.PutScalar(0.)
+        else:
+            del self._matrix
+            if not cacheStencil:
+                del self.stencil
 
 def _test():
     import fipy.tests.doctestPlus
@@ -259,6 +259,8 @@ class AbstractMesh(object):
 
         ## calculate new topology
         self._setTopology()
+        if hasattr(self, '_cellFaceSumCache'):
+            del self._cellFaceSumCache
 
         ## calculate new geometry
         self._handleFaceConnection()
@@ -496,6 +498,110 @@ class AbstractMesh(object):
                                                      self.interiorFaceIDs, axis=1)
         return self._interiorFaceCellIDs
 
+    @property
+    def _bufferPool(self):
+        """Scratch arrays recycled among the variables on this mesh"""
+        if not hasattr(self, '_bufferPoolCache'):
+            from fipy.tools.bufferPool import _BufferPool
+            self._bufferPoolCache = _BufferPool()
+        return self._bufferPoolCache
+
+    @property
+    def _cellFaceSum(self):
+        """Sparse operator that adds up the values on the faces of each
+        cell, signed by the orientation of each face with respect to the
+        cell, or `None` if :term:`SciPy` is not available
+
+        Each row holds the faces of a cell in the order of
+        `cellFaceIDs`, so the sums are accumulated in the same order as
+        summing `numerix.take(faceValues, cellFaceIDs)` over the faces.
+
+            >>> from fipy import Grid2D
+            >>> mesh = Grid2D(nx=2, ny=1)
+            >>> print(mesh._cellFaceSum.toarray().astype(int)) # doctest: +SCIPY
+            [[ 1  0  1  0  1  1  0]
+             [ 0  1  0  1  0 -1  1]]
+        """
+        if not hasattr(self, '_cellFaceSumCache'):
+            try:
+                from scipy import sparse
+            except ImportError:
+                self._cellFaceSumCache = None
+            else:
+                ids = self.cellFaceIDs
+                present = ~MA.getmaskarray(ids).swapaxes(0, 1)
+                indices = numerix.array(MA.filled(ids, 0)).swapaxes(0, 1)[present]
+                data = numerix.array(MA.filled(self._cellToFaceOrientations, 0)).swapaxes(0, 1)[present]
+                indptr = numerix.concatenate(([0], numerix.cumsum(present.sum(axis=1))))
+                self._cellFaceSumCache = sparse.csr_matrix((data.astype(float), indices, indptr),
+                                                           shape=(self.numberOfCells, self.numberOfFaces))
+        return self._cellFaceSumCache
+
+    def _addOverCellFaces(self, faceValues, out=None):
+        """Sum `faceValues`, signed by orientation, over the faces of
+        each cell
+
+        Returns `None` if the sparse operator can't be applied, e.g.,
+        because `faceValues` has units or masked values, in which case
+        the sum must be calculated some other way.
+
+        The sums are written into `out`, if it is a contiguous array of
+        the right shape and type, rather than into a new array.
+
+            >>> from fipy import Tri2D
+            >>> mesh = Tri2D(nx=2, ny=1)
+            >>> faceValues = numerix.sin(numerix.arange(2. * mesh.numberOfFaces))
+            >>> faceValues = faceValues.reshape((2, mesh.numberOfFaces))
+            >>> contributions = (numerix.take(faceValues, mesh.cellFaceIDs, axis=-1)
+            ...                  * mesh._cellToFaceOrientations)
+            >>> print(numerix.allequal(mesh._addOverCellFaces(faceValues),
+            ...                        numerix.sum(contributions, -2))) # doctest: +SCIPY
+            True
+            >>> print(mesh._addOverCellFaces(faceValues * PhysicalField(1, "m")))
+            None
+            >>> print(mesh._addOverCellFaces(MA.masked_less(faceValues, 0)))
+            None
+            >>> out = numerix.empty((2, mesh.numberOfCells))
+            >>> print(mesh._addOverCellFaces(faceValues, out=out) is out) # doctest: +SCIPY
+            True
+            >>> print(numerix.allequal(out, numerix.sum(contributions, -2))) # doctest: +SCIPY
+            True
+        """
+        if isinstance(faceValues, MA.MaskedArray) and not MA.getmaskarray(faceValues).any():
+            # unstructured mesh geometry is masked, but rarely has masked values
+            faceValues = faceValues.filled()
+
+        if (type(faceValues) is not numerix.ndarray
+            or faceValues.dtype.kind != 'f'
+            or faceValues.ndim == 0
+            or faceValues.shape[-1] != self.numberOfFaces
+            or 0 in faceValues.shape
+            or self.numberOfCells == 0
+            or self._cellFaceSum is None):
+            return None
+
+        shape = faceValues.shape[:-1]
+        S = self._cellFaceSum
+        if (out is not None
+            and type(out) is numerix.ndarray
+            and out.shape == shape + (self.numberOfCells,)
+            and out.dtype == faceValues.dtype == S.dtype
+            and out.flags.c_contiguous
+            and faceValues.flags.c_contiguous):
+            try:
+                from scipy.sparse._sparsetools import csr_matvec
+            except ImportError:
+                from scipy.sparse.sparsetools import csr_matvec
+            # accumulates each row in the same order as `dot()`
+            rows = out.reshape((-1, self.numberOfCells))
+            rows[:] = 0.
+            for row, values in zip(rows, faceValues.reshape((-1, self.numberOfFaces))):
+                csr_matvec(S.shape[0], S.shape[1], S.indptr, S.indices, S.data, values, row)
+            return out
+
+        summed = S.dot(faceValues.reshape((-1, self.numberOfFaces)).swapaxes(0, 1))
+        return summed.swapaxes(0, 1).reshape(shape + (self.numberOfCells,))
+
     @property
     def _numberOfFacesPerCell(self):
         cellFaceIDs = self.cellFaceIDs
@@ -17,7 +17,7 @@ class _AbstractGridBuilder(object):
     NumPtsCalcClass = None
 
     def buildGridData(self, ds, ns, overlap, communicator,
-                            cacheOccupiedNodes=False):
+                            cacheOccupiedNodes=False, decompositionAxes=None):
         """
         Build and save any information relevant to the construction of a grid.
         Generalized to handle any dimension. Has side-effects.
@@ -35,6 +35,10 @@ class _AbstractGridBuilder(object):
               though `spatialNums` may be of length 1, 2, or 3 depending on
               dimensionality.
 
+        In parallel, the grid is split into blocks along the
+        `decompositionAxes` (all axes by default), with the number of
+        processors along each axis chosen by `_calcProcessGrid`.
+
         Parameters
         ----------
         ds : list
@@ -43,6 +47,8 @@ class _AbstractGridBuilder(object):
             Number of grid spacings in each direction, e.g. `[nx, ny]`
         offset : list
             Displacement of grid spacings, e.g., `[Ox, Oy]`
+        decompositionAxes : list
+            Axes along which the grid may be split between processors.
         """
 
         dim = len(ns)
@@ -78,33 +84,45 @@ class _AbstractGridBuilder(object):
         parallel stuff
         """
 
+        globalNs = tuple(newNs)
         newNs = list(newNs)
 
         procID = communicator.procID
         Nproc = communicator.Nproc
 
-        overlap = min(overlap, newNs[-1])
-        cellsPerNode = max(newNs[-1] // Nproc, overlap)
-        occupiedNodes = min(newNs[-1] // (cellsPerNode or 1), Nproc)
+        if decompositionAxes is None:
+            decompositionAxes = list(range(dim))
 
-        (firstOverlap,
-         secOverlap,
-         overlap) = self._buildOverlap(overlap, procID, occupiedNodes)
+        processGrid = self._calcProcessGrid(newNs, overlap, Nproc, decompositionAxes)
+        occupiedNodes = reduce(self._mult, processGrid)
+        coordinates = self._calcProcessCoordinates(min(procID, occupiedNodes - 1), processGrid)
 
-        offsetArg = min(procID, occupiedNodes-1) * cellsPerNode - firstOverlap
-        offset = self._packOffset(offsetArg)
+        firstOverlaps = []
+        secOverlaps = []
+        offsets = []
+        for axis, (n, nodes, coordinate) in enumerate(zip(newNs, processGrid, coordinates)):
+            axisOverlap = min(overlap, n)
+            cellsPerNode = max(n // nodes, axisOverlap)
 
-        """
-        local nx, [ny, [nz]] calculation
-        """
-        local_n = cellsPerNode * (procID < occupiedNodes)
+            if procID >= occupiedNodes:
+                # idle processors hold no cells
+                first, sec = 0, 0
+                newNs[axis] = 0
+            else:
+                first, sec = self._buildOverlap(axisOverlap, coordinate, nodes)
+                newNs[axis] = cellsPerNode
+                if coordinate == nodes - 1:
+                    newNs[axis] += n - cellsPerNode * nodes
+                newNs[axis] += first + sec
 
-        if procID == occupiedNodes - 1:
-            local_n += (newNs[-1] - cellsPerNode * occupiedNodes)
+            firstOverlaps.append(first)
+            secOverlaps.append(sec)
+            offsets.append(coordinate * cellsPerNode - first)
 
-        local_n += firstOverlap + secOverlap
+        overlap = self._packOverlap(firstOverlaps, secOverlaps)
+        offset = self._packOffset(offsets)
 
-        newNs = tuple(newNs[:-1] + [local_n])
+        newNs = tuple(newNs)
 
         """
         post-parallel
@@ -133,6 +151,7 @@ class _AbstractGridBuilder(object):
         self.ns      = newNs
         self.scale   = scale
 
+        self.globalNs = globalNs
         self.globalNumberOfCells = globalNumCells
         self.globalNumberOfFaces = globalNumFaces
 
@@ -200,7 +219,8 @@ class _AbstractGridBuilder(object):
         """
         Dimensionally independent face-number calculation.
 
-        >>> from fipy.meshes.builders import *
+        >>> from fipy.meshes.builders import (_Grid1DBuilder, _Grid2DBuilder,
+        ...                                    _Grid3DBuilder)
 
         >>> gb = _Grid1DBuilder()
         >>> gb._calcGlobalNumFaces([1])
@@ -244,16 +264,90 @@ class _AbstractGridBuilder(object):
     def _calcNs(self, ns, ds):
         return self.NumPtsCalcClass.calcNs(ns, ds)
 
-    def _buildOverlap(self, overlap, procID, occupiedNodes):
-        (first, sec) = (overlap * (procID > 0) * (procID < occupiedNodes),
-                        overlap * (procID < occupiedNodes - 1))
+    @staticmethod
+    def _calcProcessGrid(ns, overlap, Nproc, axes):
+        """
+        Choose the number of processors along each axis.
+
+        As many processors as possible are occupied, provided that each
+        block is at least `overlap` cells thick, and then the number of
+        faces between blocks is minimized.  Ties are resolved in favor of
+        splitting the last axes, so that a grid split along one axis is
+        split into slabs along the last axis.
+
+        >>> _AbstractGridBuilder._calcProcessGrid([100, 100], 2, 4, [0, 1])
+        (2, 2)
+        >>> _AbstractGridBuilder._calcProcessGrid([100, 10], 2, 4, [0, 1])
+        (4, 1)
+        >>> _AbstractGridBuilder._calcProcessGrid([10, 10], 2, 2, [0, 1])
+        (1, 2)
+        >>> _AbstractGridBuilder._calcProcessGrid([10, 10, 10], 2, 8, [0, 1, 2])
+        (2, 2, 2)
+        >>> _AbstractGridBuilder._calcProcessGrid([10, 10, 4], 2, 8, [0, 1, 2])
+        (2, 4, 1)
+        >>> _AbstractGridBuilder._calcProcessGrid([10, 10, 2], 2, 8, [0, 1, 2])
+        (2, 4, 1)
+
+        Processors are left idle if the grid is too small
+
+        >>> _AbstractGridBuilder._calcProcessGrid([10, 4], 2, 16, [1])
+        (1, 2)
+        >>> _AbstractGridBuilder._calcProcessGrid([10], 2, 3, [0])
+        (3,)
+        """
+        maxima = [1] * len(ns)
+        for axis in axes:
+            maxima[axis] = max(1, ns[axis] // max(min(overlap, ns[axis]), 1))
+
+        def divisors(N):
+            return [d for d in range(1, N + 1) if N % d == 0]
+
+        def factorizations(N, dims):
+            if dims == 1:
+                yield (N,)
+            else:
+                for d in divisors(N):
+                    for rest in factorizations(N // d, dims - 1):
+                        yield (d,) + rest
 
-        return first, sec, self._packOverlap(first, sec)
+        def surface(grid):
+            return sum((nodes - 1) * reduce(lambda x, y: x * y, ns[:axis] + ns[axis + 1:], 1)
+                       for axis, nodes in enumerate(grid))
+
+        for occupied in range(min(Nproc, reduce(lambda x, y: x * y, maxima)), 0, -1):
+            grids = [grid for grid in factorizations(occupied, len(ns))
+                     if all(nodes <= maximum for nodes, maximum in zip(grid, maxima))]
+            if grids:
+                return min(grids, key=lambda grid: (surface(grid),
+                                                    tuple(-nodes for nodes in reversed(grid))))
+
+    @staticmethod
+    def _calcProcessCoordinates(procID, processGrid):
+        """
+        Position of processor `procID` in the `processGrid`.  The first
+        axis varies most quickly.
+
+        >>> _AbstractGridBuilder._calcProcessCoordinates(5, (2, 3))
+        [1, 2]
+        """
+        coordinates = []
+        for nodes in processGrid:
+            coordinates.append(procID % nodes)
+            procID //= nodes
+        return coordinates
+
+    def _buildOverlap(self, overlap, procID, occupiedNodes):
+        """
+        Number of overlapping cells before and after the block of
+        processor `procID` of the `occupiedNodes` along an axis.
+        """
+        return (overlap * (procID > 0) * (procID < occupiedNodes),
+                overlap * (procID < occupiedNodes - 1))
 
-    def _packOverlap(self, first, sec):
+    def _packOverlap(self, firsts, secs):
         raise NotImplementedError
 
-    def _packOffset(self, arg):
+    def _packOffset(self, offsets):
         raise NotImplementedError
 
     def _mult(self, x, y):
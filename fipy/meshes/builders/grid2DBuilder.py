@@ -68,7 +68,8 @@ class _Grid2DBuilder(_AbstractGridBuilder):
     def _specificGridData(self):
         return [self.numberOfHorizontalRows,
                 self.numberOfVerticalColumns,
-                self.numberOfHorizontalFaces]
+                self.numberOfHorizontalFaces,
+                self.globalNs]
 
     @staticmethod
     def createVertices(nx, ny, dx, dy, numVerts, numVertCols):
@@ -160,11 +161,12 @@ class _Grid2DBuilder(_AbstractGridBuilder):
                 cellFaceIDs[3,:] = cellFaceIDs[1,:] - 1
             return cellFaceIDs
 
-    def _packOverlap(self, first, second):
-        return {'left': 0, 'right': 0, 'bottom': first, 'top': second}
+    def _packOverlap(self, firsts, seconds):
+        return {'left': firsts[0], 'right': seconds[0],
+                'bottom': firsts[1], 'top': seconds[1]}
 
-    def _packOffset(self, arg):
-        return (0, arg)
+    def _packOffset(self, offsets):
+        return tuple(offsets)
 
 class _NonuniformGrid2DBuilder(_Grid2DBuilder):
 
@@ -2,11 +2,13 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import unicode_literals
 from builtins import object
-from builtins import zip
 from builtins import range
 from builtins import str
 __docformat__ = 'restructuredtext'
 
+import hashlib
+import json
+import mmap
 import os
 from subprocess import Popen, PIPE
 import sys
@@ -26,7 +28,7 @@ from fipy.meshes.topologies.meshTopology import _MeshTopology
 
 from fipy.tools.debug import PRINT
 
-__all__ = ["openMSHFile", "openPOSFile",
+__all__ = ["openMSHFile", "openPOSFile", "GmshCache",
            "Gmsh2D", "Gmsh2DIn3DSpace", "Gmsh3D",
            "GmshGrid2D", "GmshGrid3D"]
 from future.utils import text_to_native_str
@@ -102,7 +104,7 @@ def _gmshVersion(communicator=parallelComm):
 
     return version
 
-def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parallelComm, overlap=1, mode='r', background=None):
+def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parallelComm, overlap=1, mode='r', background=None, cache=None):
     """Open a Gmsh `MSH` file
 
     Parameters
@@ -126,21 +128,24 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
         Add a `b` to the mode for binary files.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : ~fipy.meshes.gmshMesh.GmshCache
+        Where to look for (and keep) the mesh generated from a geometry
+        script.  Defaults to a cache in the directory named by the
+        `FIPY_GMSH_CACHE` environment variable, if it is set.
     """
 
     if overlap > 1:
         communicator = serialComm
 
-    # Enforce gmsh version to be either >= 2 or 2.5, based on Nproc.
-    version = _gmshVersion(communicator=communicator)
-    if version < StrictVersion("2.0"):
-        raise EnvironmentError("Gmsh version must be >= 2.0.")
+    if cache is None and 'FIPY_GMSH_CACHE' in os.environ:
+        cache = GmshCache(os.environ['FIPY_GMSH_CACHE'])
 
     # If we're being passed a .msh file, leave it be. Otherwise,
     # we've gotta compile a .msh file from either (i) a .geo file,
     # or (ii) a gmsh script passed as a string.
 
     fileIsTemporary = False
+    cacheKey = None
 
     if mode.startswith('r'):
         if not os.path.exists(name):
@@ -157,8 +162,8 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
         else:
             # Gmsh isn't picky about file extensions,
             # so we peek at the start of the file to deduce the type
-            f = open(name, 'r')
-            filetype = f.readline().strip()
+            f = open(name, 'rb')
+            filetype = f.readline().strip().decode('ascii', 'replace')
             f.close()
             if filetype == "$MeshFormat":
                 geoFile = None
@@ -173,6 +178,11 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
                 geoFile = name
 
         if geoFile is not None:
+            # Enforce gmsh version to be either >= 2 or 2.5, based on Nproc.
+            version = _gmshVersion(communicator=communicator)
+            if version < StrictVersion("2.0"):
+                raise EnvironmentError("Gmsh version must be >= 2.0.")
+
             gmshFlags = ["-%d" % dimensions, "-nopopup"]
 
             if communicator.Nproc > 1:
@@ -196,6 +206,32 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
 
             gmshFlags += ["-format", "msh2"]
 
+            if cache is not None:
+                if os.path.exists(name):
+                    with open(name, 'rb') as f:
+                        geometry = f.read()
+                else:
+                    geometry = name
+                if background is None:
+                    backgroundKey = [None]
+                else:
+                    backgroundKey = [background.mesh.vertexCoords,
+                                     nx.MA.filled(background.mesh._orderedCellVertexIDs, -1),
+                                     background.value]
+                cacheKey = cache._key(geometry, str(version), gmshFlags,
+                                      dimensions, coordDimensions,
+                                      communicator.Nproc, communicator.procID,
+                                      *backgroundKey)
+                entry = cache._load(cacheKey)
+                # every process must find its part of the mesh,
+                # or they all generate it
+                if communicator.all(nx.array(entry is not None)):
+                    if communicator.procID == 0 and not os.path.exists(name):
+                        os.unlink(geoFile)
+                    return _CachedMSHFile(entry=entry,
+                                          coordDimensions=coordDimensions,
+                                          communicator=communicator)
+
             if background is not None:
                 if communicator.procID == 0:
                     f, bgmf = tempfile.mkstemp(suffix=".pos")
@@ -254,7 +290,9 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
                    communicator=communicator,
                    gmshOutput=gmshOutput,
                    mode=mode,
-                   fileIsTemporary=fileIsTemporary)
+                   fileIsTemporary=fileIsTemporary,
+                   cache=cache if cacheKey is not None else None,
+                   cacheKey=cacheKey)
 
 def openPOSFile(name, communicator=parallelComm, mode='w'):
     """Open a Gmsh `POS` post-processing file
@@ -266,6 +304,192 @@ def openPOSFile(name, communicator=parallelComm, mode='w'):
                    communicator=communicator,
                    mode=mode)
 
+class GmshCache(object):
+    """On-disk cache of meshes generated by Gmsh
+
+    Meshing a geometry script and building the topology of the result
+    can take far longer than the simulation that uses it.  A `GmshCache`
+    keeps the processed arrays of each mesh in `directory`, keyed by a
+    hash of the geometry script, the Gmsh version and flags, any
+    `background`, and the partition being read, so that meshing the
+    same geometry again loads the arrays instead of running Gmsh.
+
+    The cache is only used when asked for, either by passing one as the
+    `cache` argument of `Gmsh2D`, `Gmsh3D`, etc., or by setting the
+    `FIPY_GMSH_CACHE` environment variable to a directory.  Meshes read
+    directly from `.msh` files are not cached.
+
+    >>> import tempfile, shutil
+    >>> directory = tempfile.mkdtemp()
+    >>> cache = GmshCache(directory)
+
+    >>> geo = '''
+    ... cellSize = 0.5;
+    ... Point(1) = {0, 0, 0, cellSize};
+    ... Point(2) = {1, 0, 0, cellSize};
+    ... Point(3) = {1, 1, 0, cellSize};
+    ... Point(4) = {0, 1, 0, cellSize};
+    ... Line(5) = {1, 2};
+    ... Line(6) = {2, 3};
+    ... Line(7) = {3, 4};
+    ... Line(8) = {4, 1};
+    ... Line Loop(9) = {5, 6, 7, 8};
+    ... Plane Surface(10) = {9};
+    ... '''
+    >>> first = Gmsh2D(geo, cache=cache) # doctest: +GMSH
+    >>> second = Gmsh2D(geo, cache=cache) # doctest: +GMSH
+    >>> print(cache.misses, cache.hits) # doctest: +GMSH, +SERIAL
+    1 1
+    >>> print(nx.allclose(first.cellVolumes, second.cellVolumes)) # doctest: +GMSH
+    True
+
+    When the cache grows beyond `maxSize` bytes, the least recently
+    used meshes are removed, but never the one just stored.
+
+    >>> cache = GmshCache(directory, maxSize=1)
+    >>> cache._store(cache._key("a"), dict(x=nx.arange(10)))
+    >>> cache._store(cache._key("b"), dict(x=nx.arange(20)))
+    >>> print(cache._load(cache._key("a")))
+    None
+    >>> print(cache._load(cache._key("b"))["x"].sum())
+    190
+    >>> print(len(os.listdir(directory)))
+    1
+
+    >>> cache.clear()
+    >>> print(cache.size)
+    0
+    >>> shutil.rmtree(directory)
+
+    .. note::
+
+       Only the text of a geometry script is hashed.  Files that the
+       script reads with `Include` or `Merge` are not, so the cache must
+       be cleared if they change.
+
+    Parameters
+    ----------
+    directory : str
+        Where to store cached meshes; created if it doesn't exist
+    maxSize : int
+        Number of bytes the cached meshes may occupy
+    """
+
+    # bump whenever the cached arrays change meaning
+    _format = 1
+
+    def __init__(self, directory, maxSize=2**30):
+        self.directory = directory
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # another process got there first
+                if not os.path.isdir(directory):
+                    raise
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    @property
+    def size(self):
+        """Number of bytes occupied by the cached meshes
+        """
+        return sum([size for mtime, size, path in self._entries()])
+
+    def _key(self, *parts):
+        """Hash everything that determines a mesh
+        """
+        sha = hashlib.sha256(("GmshCache %d" % self._format).encode("ascii"))
+        for part in parts:
+            if isinstance(part, bytes):
+                pass
+            elif isinstance(part, nx.ndarray):
+                part = (str(part.dtype) + str(part.shape)).encode("ascii") + nx.ascontiguousarray(part).tobytes()
+            else:
+                part = repr(part).encode("utf-8")
+            sha.update(("%d:" % len(part)).encode("ascii"))
+            sha.update(part)
+        return sha.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def _load(self, key):
+        """Retrieve the arrays stored under `key`, or `None`
+        """
+        path = self._path(key)
+        try:
+            with nx.load(path, allow_pickle=False) as f:
+                entry = dict((name, f[name]) for name in f.files)
+            # mark as recently used
+            os.utime(path, None)
+        except (IOError, OSError, ValueError, KeyError):
+            if os.path.exists(path):
+                # unreadable, so it's no use to anyone
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def _store(self, key, arrays):
+        """Save a dictionary of `arrays` under `key`
+        """
+        # write to a temporary file and rename it, so that other
+        # processes never see a partial entry
+        (f, tmp) = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(f, 'wb') as f:
+                nx.savez(f, **arrays)
+            getattr(os, "replace", os.rename)(tmp, self._path(key))
+        finally:
+            if os.path.exists(tmp):
+                # the entry was not stored
+                os.unlink(tmp)
+
+        self._evict(keep=self._path(key))
+
+    def _evict(self, keep=None):
+        entries = self._entries()
+        total = sum([size for mtime, size, path in entries])
+        for mtime, size, path in entries:
+            if total <= self.maxSize:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        """Remove all cached meshes
+        """
+        for mtime, size, path in self._entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
 class GmshFile(object):
     def __init__(self, filename, communicator, mode, fileIsTemporary=False):
         self.filename = filename
@@ -492,10 +716,9 @@ class MSHFile(GmshFile):
     partitions matching `Nproc`, or the mesh must be specified with a `.geo` file
     or multiline string.
 
+    Reads ASCII and binary `.msh` files of format versions 2 and 4.1.
     Does not support gmsh versions < 2. If partitioning, gmsh
-    version must be >= 2.5.
-
-    TODO: Refactor face extraction functions.
+    version must be >= 2.5 and the file format version must be 2.
     """
     def __init__(self, filename,
                        dimensions,
@@ -503,7 +726,9 @@ class MSHFile(GmshFile):
                        communicator=parallelComm,
                        gmshOutput="",
                        mode='r',
-                       fileIsTemporary=False):
+                       fileIsTemporary=False,
+                       cache=None,
+                       cacheKey=None):
         """
         Parameters
         ----------
@@ -526,8 +751,14 @@ class MSHFile(GmshFile):
             Add a `b` to the mode for binary files.
         fileIsTemporary : bool
             If `True`, `filename` should be cleaned up on deletion
+        cache : ~fipy.meshes.gmshMesh.GmshCache
+            Where to store the mesh once it has been read
+        cacheKey : str
+            Identity of the mesh in `cache`
         """
         self.dimensions = dimensions
+        self.cache = cache
+        self.cacheKey = cacheKey
         self.coordDimensions = coordDimensions
         self.gmshOutput = gmshOutput
 
@@ -536,215 +767,182 @@ class MSHFile(GmshFile):
 
         GmshFile.__init__(self, filename=filename, communicator=communicator, mode=mode, fileIsTemporary=fileIsTemporary)
 
-    def _getMetaData(self):
-        """
-        Extracts `gmshVersion`, file-type, and data-size in that
-        order.
-        """
-        self._seekForHeader("MeshFormat")
-        metaData = self.fileobj.readline().split()
-        self.fileobj.seek(0)
-        return [float(x) for x in metaData]
-
-    def _isolateData(self, title):
+    def _getMetaData(self, data):
         """
-        Gets all data between $[title] and $End[title], writes
-        it out to its own file.
+        Extracts `gmshVersion`, file-type, data-size, and, for binary
+        files, the byte order in that order.
         """
-        newF, newPath = tempfile.mkstemp(title, text=True)
-        newF = os.fdopen(newF, 'w')
-        try:
-            self._seekForHeader(title)
-        except Exception as e:
-            newF.close()
-            os.unlink(newPath)
-            raise
+        begin, end = self._findSection(data, "MeshFormat")
+        newline = data.find(b"\n", begin)
+        version, fileType, dataSize = [float(x) for x in data[begin:newline].split()]
 
-        # extract the actual data within section
-        while True:
-            line = self.fileobj.readline()
-            if ("$End%s" % title) not in line:
-                newF.write(line)
-            else: break
+        byteOrder = "<"
+        if fileType == 1:
+            # binary files write the integer 1 to reveal their endianness
+            if nx.frombuffer(data[newline + 1:newline + 5], dtype="<i4")[0] != 1:
+                byteOrder = ">"
 
-        self.fileobj.seek(0)
-        newF.close()
-        return newPath
+        return version, int(fileType), int(dataSize), byteOrder
 
-    def _seekForHeader(self, title):
+    def _findSection(self, data, title, start=0, stop=None):
         """
-        Iterate through a file until we end up at the section header
-        for `title`. Function has obvious side-effects on `self.fileobj`.
+        Locate the data between $[title] and $End[title].
+
+        Returns the offsets of the first byte of the section and of its
+        end marker.  Only searches `data[start:stop]` for the section
+        header.
         """
+        if stop is None:
+            stop = len(data)
+        header = ("$%s" % title).encode("ascii")
+        position = start
         while True:
-            line = self.fileobj.readline()
-            if len(line) == 0:
+            position = data.find(header, position, stop)
+            if position < 0:
                 raise EOFError("No `%s' header found!" % title)
-                break
-            elif (("$%s" % title) not in line):
-                continue
-            else:
+            after = position + len(header)
+            if ((position == 0 or data[position - 1:position] == b"\n")
+                and data[after:after + 1] in (b"\n", b"\r")):
                 break # found header
+            position = after
+
+        begin = data.find(b"\n", after) + 1
+        end = data.find(("$End%s" % title).encode("ascii"), begin)
+        if end < 0:
+            raise EOFError("No `$End%s' found!" % title)
+
+        return begin, end
 
     def _deriveCellsAndFaces(self, cellsToVertIDs, shapeTypes, numCells):
         """
-        Uses element information obtained from `_parseElementFile` to deliver
-        `facesToVertices` and `cellsToFaces`.
+        Uses element information obtained from `_parseElements` to deliver
+        `facesToVertices` and `cellsToFaces`, along with the sorted
+        vertices of each face, which identify it.
         """
-
         allShapes  = nx.unique(shapeTypes).tolist()
-        maxFaces   = max([self.numFacesPerCell[x] for x in allShapes])
+        maxFaces   = max([len(_cellFaceVertices[x]) for x in allShapes])
+        maxFaceLen = max([len(face) for x in allShapes for face in _cellFaceVertices[x]])
+
+        # the appended column of -1 pads the faces with fewer vertices
+        cellsToVertIDs = nx.concatenate((cellsToVertIDs,
+                                         -nx.ones((numCells, 1), dtype=nx.INT_DTYPE)),
+                                        axis=1)
+
+        cellsFaces = -nx.ones((numCells, maxFaces, maxFaceLen), dtype=nx.INT_DTYPE)
+        hasFace = nx.zeros((numCells, maxFaces), dtype=bool)
+        for shapeType in allShapes:
+            faceVertices = _cellFaceVertices[shapeType]
+            faceVertices = nx.array([[-1] * (maxFaceLen - len(f)) + f for f in faceVertices])
+            cells = nx.nonzero(shapeTypes == shapeType)[0]
+            cellsFaces[cells, :len(faceVertices)] = cellsToVertIDs[cells[..., nx.newaxis, nx.newaxis],
+                                                                   faceVertices]
+            hasFace[cells, :len(faceVertices)] = True
+
+        # faces in order of cell, then face within the cell
+        faces = cellsFaces[hasFace]
+        del cellsFaces
+
+        # NB: faces are sorted to spot duplicates
+        faceKeys = nx.sort(faces, axis=1)
+        first, faceIDs = _uniqueRows(faceKeys)
 
         # `cellsToFaces` must be padded with -1; see mesh.py
-        currNumFaces = 0
-        cellsToFaces = nx.ones((numCells, maxFaces), 'l') * -1
-        facesDict    = {}
-        uniqueFaces  = []
-
-        # we now build `cellsToFaces` and `uniqueFaces`,
-        # the latter will result in `facesToVertices`.
-        for cellIdx in range(numCells):
-            shapeType = shapeTypes[cellIdx]
-            cell = cellsToVertIDs[cellIdx]
-
-            if shapeType in [5, 12, 17]: # hexahedron
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3], # ordering of vertices gleaned from
-                                                                 [4, 5, 6, 7], # a one-cube Grid3D example
-                                                                 [0, 1, 5, 4],
-                                                                 [3, 2, 6, 7],
-                                                                 [0, 3, 7, 4],
-                                                                 [1, 2, 6, 5]])
-            elif shapeType in [6, 13, 18]: # prism
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2],
-                                                                 [5, 4, 3],
-                                                                 [3, 4, 1, 0],
-                                                                 [4, 5, 2, 1],
-                                                                 [5, 3, 0, 2]])
-            elif shapeType in [7, 14, 19]: # pyramid
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3],
-                                                                 [0, 1, 4],
-                                                                 [1, 2, 4],
-                                                                 [2, 3, 4],
-                                                                 [3, 0, 4]])
-            else:
-                if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
-                    faceLength = 2 # triangle
-                elif shapeType in [3, 10, 16]:
-                    faceLength = 2 # quadrangle
-                elif shapeType in [4, 11, 29, 30, 31]:
-                    faceLength = 3 # tetrahedron
-
-                faces = self._extractRegularFaces(cell=cell,
-                                                  faceLength=faceLength,
-                                                  facesPerCell=self.numFacesPerCell[shapeType])
-
-            for faceIdx in range(len(faces)):
-                # NB: currFace is sorted for the key to spot duplicates
-                currFace = faces[faceIdx]
-                keyStr   = ' '.join([str(x) for x in sorted(currFace)])
-
-                if keyStr in facesDict:
-                    cellsToFaces[cellIdx][faceIdx] = facesDict[keyStr]
-                else: # new face
-                    facesDict[keyStr] = currNumFaces
-                    cellsToFaces[cellIdx][faceIdx] = currNumFaces
-                    uniqueFaces.append(currFace)
-                    currNumFaces += 1
-
-        # pad short faces with -1
-        maxFaceLen = max([len(f) for f in uniqueFaces])
-        uniqueFaces = [[-1] * (maxFaceLen - len(f)) + f for f in uniqueFaces]
-
-        facesToVertices = nx.array(uniqueFaces, dtype=nx.INT_DTYPE)
-
-        return facesToVertices.swapaxes(0, 1)[::-1], cellsToFaces.swapaxes(0, 1).copy('C'), facesDict
+        cellsToFaces = -nx.ones((numCells, maxFaces), dtype=nx.INT_DTYPE)
+        cellsToFaces[hasFace] = faceIDs
+
+        facesToVertices = faces[first]
+
+        return facesToVertices.swapaxes(0, 1)[::-1], cellsToFaces.swapaxes(0, 1).copy('C'), faceKeys[first]
 
     def _translateNodesToVertices(self, entitiesNodes, vertexMap):
-        """Translates e`ntitiesNodes` from Gmsh node IDs to `vertexCoords` indices.
+        """Translates `entitiesNodes` from Gmsh node IDs to `vertexCoords` indices.
+
+        Nodes that are not vertices of any cell become -1.
         """
-        entitiesVertices = []
+        known = (entitiesNodes >= 0) & (entitiesNodes < len(vertexMap))
+        return nx.where(known, vertexMap[nx.where(known, entitiesNodes, 0)], -1)
 
-        for entity in entitiesNodes:
-            try:
-                vertIndices = vertexMap[nx.array(entity)]
-            except IndexError:
-                vertIndices = nx.ones((len(entity),), 'l') * -1
-            entitiesVertices.append(vertIndices)
+    def _identifyFaces(self, faceKeys, facesToVertIDs, shapeTypes):
+        """Find the faces that Gmsh face elements coincide with.
 
-        return entitiesVertices
+        Returns the IDs of the faces and the indices of the Gmsh face
+        elements that were found.
+        """
+        numFaces, maxFaceLen = faceKeys.shape
 
-    def _extractRegularFaces(self, cell, faceLength, facesPerCell):
-        """Return faces for a regular poly(gon|hedron)
+        corners = nx.array([_faceCorners.get(x, 0) for x in range(max(_faceCorners) + 1)])[shapeTypes]
+        keys = -nx.ones((len(shapeTypes), maxFaceLen), dtype=nx.INT_DTYPE)
+        complete = nx.zeros((len(shapeTypes),), dtype=bool)
+        for numCorners in nx.unique(corners):
+            if numCorners > maxFaceLen:
+                continue
+            elements = nx.nonzero(corners == numCorners)[0]
+            vertices = facesToVertIDs[elements, :numCorners]
+            keys[elements, maxFaceLen - numCorners:] = vertices
+            complete[elements] = (vertices >= 0).all(axis=1)
 
-        Given `cell`, defined by node IDs, returns an array of
-        `facesPerCell` faces of length `faceLength` in terms of nodes.
-        """
-        faces = []
-        for i in range(facesPerCell):
-            aFace = []
-            for j in range(faceLength):
-                aVertex = (i + j) % len(cell) # we may wrap
-                aFace.append(int(cell[aVertex]))
-            faces.append(aFace)
-        return faces
-
-    def _extractOrderedFaces(self, cell, faceOrderings):
-        """Return faces for a 8-node hexahedron cell.
-        """
-        def orderingToFace(vertList):
-            aFace = []
-            for i in vertList:
-                aFace.append(int(cell[i]))
-            return aFace
+        elements = nx.nonzero(complete)[0]
+        keys = nx.sort(keys[elements], axis=1)
 
-        return [orderingToFace(o) for o in faceOrderings]
+        # faces are numbered by first appearance,
+        # so any element labeled less than `numFaces` matches that face
+        first, labels = _uniqueRows(nx.concatenate((faceKeys, keys)))
+        labels = labels[numFaces:]
+        found = labels < numFaces
+
+        return labels[found], elements[found]
 
     def read(self):
         """
-        0. Build `cellsToVertices`
+        0. Parse `$Nodes` and `$Elements`
         1. Recover needed `vertexCoords` and mapping from file using
            `cellsToVertices`
         2. Build `cellsToVertIDs` proper from `vertexCoords` and vertex map
         3. Build faces
         4. Build `cellsToFaces`
 
-        Isolate relevant data into three files, store in
-        `self.nodesPath` for `$Nodes`,
-        `self.elemsPath` for `$Elements`.
-        `self.namesFile` for `$PhysicalNames`.
+        ASCII and binary files of format versions 2 and 4.1 are
+        understood.  Each section is parsed in bulk into arrays; the file
+        itself is memory mapped, so only one section at a time is copied
+        into memory.
 
         Returns `vertexCoords`, `facesToVertexID`, `cellsToFaceID`,
-                `cellGlobalIDMap`, `ghostCellGlobalIDMap`.
+                `cellGlobalIDMap`, `ghostCellGlobalIDMap`,
+                `cellsToVertIDs`.
         """
-        self.version, self.fileType, self.dataSize = self._getMetaData()
-        self.nodesPath = self._isolateData("Nodes")
-        self.elemsPath = self._isolateData("Elements")
+        f = open(self.filename, 'rb')
         try:
-            self.namesPath = self._isolateData("PhysicalNames")
-        except EOFError as e:
-            self.namesPath = None
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            f.close()
 
         try:
-            if self.dimensions is None:
-                nodesFile = open(self.nodesPath, 'r')
-                nodesFile.readline() # skip number of nodes
+            (self.version,
+             self.fileType,
+             self.dataSize,
+             self.byteOrder) = self._getMetaData(data)
+
+            if not (2 <= self.version < 3 or self.version == 4.1):
+                raise GmshException("Gmsh MSH file format version %g is not supported" % self.version)
+            if self.version >= 4 and self.communicator.Nproc > 1:
+                raise GmshException("Partitioned meshes must be read from Gmsh MSH file format version 2")
+
+            nodesBegin, nodesEnd = self._findSection(data, "Nodes")
+
+            # `$PhysicalNames` and `$Entities` precede `$Nodes`
+            self.physicalNames = self._parseNames(data, stop=nodesBegin)
+            if self.version >= 4:
+                entities = self._parseEntities(data, stop=nodesBegin)
+            else:
+                entities = {}
 
+            parprint("Parsing nodes.")
+            nodeIDs, nodeCoords = self._parseNodes(data[nodesBegin:nodesEnd])
+
+            if self.dimensions is None:
                 # We assume we have a 2D file unless we find a node
                 # with a non-zero Z coordinate
-                self.dimensions = 2
-                for node in nodesFile:
-                    line   = node.split()
-
-                    newVert = [float(x) for x in line]
-
-                    if newVert[2] != 0.0:
-                        self.dimensions = 3
-                        break
-
-                nodesFile.close()
+                self.dimensions = 2 + int((nodeCoords[..., 2] != 0).any())
 
             self.coordDimensions = self.coordDimensions or self.dimensions
 
@@ -795,78 +993,74 @@ class MSHFile(GmshFile):
             parprint("Parsing elements.")
             (cellsData,
              ghostsData,
-             facesData) = self._parseElementFile()
-
-            cellsToGmshVerts = cellsData.nodes + ghostsData.nodes
-            numCellsTotal    = len(cellsData.nodes) + len(ghostsData.nodes)
-            allShapeTypes    = cellsData.shapes + ghostsData.shapes
-            allShapeTypes    = nx.array(allShapeTypes)
-            allShapeTypes    = nx.delete(allShapeTypes, nx.s_[numCellsTotal:])
-            self.physicalCellMap = nx.array(cellsData.physicalEntities
-                                            + ghostsData.physicalEntities)
-            self.geometricalCellMap = nx.array(cellsData.geometricalEntities
-                                               + ghostsData.geometricalEntities)
-
-            if numCellsTotal < 1:
-                errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
-                errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
-                raise GmshException(errStr)
-
-            parprint("Recovering coords.")
-            parprint("numcells %d" % numCellsTotal)
-            vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts)
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
-                                                            vertIDtoIdx)
-
-            parprint("Building cells and faces.")
-            (facesToV,
-             cellsToF,
-             facesDict) = self._deriveCellsAndFaces(cellsToVertIDs,
-                                                    allShapeTypes,
-                                                    numCellsTotal)
-
-            # cell entities were easy to record on parsing
-            # but we don't use Gmsh faces, so we need to correlate the nodes
-            # that make up the Gmsh faces with the vertex IDs of the FiPy faces
-            # so that we can check if any are named
-            faceEntitiesDict = dict()
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
-                                                            vertIDtoIdx)
-
-            for face, physicalEntity, geometricalEntity in zip(facesToVertIDs,
-                                                               facesData.physicalEntities,
-                                                               facesData.geometricalEntities):
-                faceEntitiesDict[' '.join([str(x) for x in sorted(face)])] = (physicalEntity, geometricalEntity)
-
-            self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            for face in list(facesDict.keys()):
-                # not all faces are necessarily tagged
-                if face in faceEntitiesDict:
-                    self.physicalFaceMap[facesDict[face]] = faceEntitiesDict[face][0]
-                    self.geometricalFaceMap[facesDict[face]] = faceEntitiesDict[face][1]
-
-            self.physicalNames = self._parseNamesFile()
-
+             facesData) = self._parseElements(data, entities=entities, start=nodesEnd)
         finally:
-            os.unlink(self.nodesPath)
-            os.unlink(self.elemsPath)
-            if self.namesPath is not None:
-                os.unlink(self.namesPath)
-
-        # convert lists of cell vertices to a properly oriented masked array
-        maxVerts = max([len(v) for v in cellsToVertIDs])
-        # ticket:539 - NumPy 1.7 casts to array before concatenation and empty array defaults to float
-        cellsToVertIDs = [nx.concatenate((v, nx.array([-1] * (maxVerts-len(v)), dtype=nx.INT_DTYPE))) for v in cellsToVertIDs]
+            data.close()
+
+        allCellsData = _ElementData.concatenate([cellsData, ghostsData])
+        numCellsTotal = len(allCellsData)
+        self.physicalCellMap = allCellsData.physicalEntities
+        self.geometricalCellMap = allCellsData.geometricalEntities
+
+        if numCellsTotal < 1:
+            errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
+            errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
+            raise GmshException(errStr)
+
+        parprint("Recovering coords.")
+        parprint("numcells %d" % numCellsTotal)
+        vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(allCellsData.nodes,
+                                                             nodeIDs, nodeCoords)
+        del nodeIDs, nodeCoords
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        cellsToVertIDs = self._translateNodesToVertices(allCellsData.nodes,
+                                                        vertIDtoIdx)
+
+        parprint("Building cells and faces.")
+        (facesToV,
+         cellsToF,
+         faceKeys) = self._deriveCellsAndFaces(cellsToVertIDs,
+                                               allCellsData.shapes,
+                                               numCellsTotal)
+
+        # cell entities were easy to record on parsing
+        # but we don't use Gmsh faces, so we need to correlate the nodes
+        # that make up the Gmsh faces with the vertex IDs of the FiPy faces
+        # so that we can check if any are named
+        facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
+                                                        vertIDtoIdx)
+        faceIDs, elements = self._identifyFaces(faceKeys, facesToVertIDs,
+                                                facesData.shapes)
+
+        # not all faces are necessarily tagged
+        self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.physicalFaceMap[faceIDs] = facesData.physicalEntities[elements]
+        self.geometricalFaceMap[faceIDs] = facesData.geometricalEntities[elements]
+
+        # convert cell vertices to a properly oriented masked array
         cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs, value=-1).swapaxes(0, 1)
 
         parprint("Done with cells and faces.")
+
+        if self.cache is not None:
+            self.cache._store(self.cacheKey,
+                              dict(vertexCoords=vertexCoords,
+                                   faceVertexIDs=facesToV,
+                                   cellFaceIDs=cellsToF,
+                                   cellGlobalIDs=cellsData.idmap,
+                                   ghostCellGlobalIDs=ghostsData.idmap,
+                                   cellVertexIDs=nx.MA.filled(cellsToVertIDs, -1),
+                                   physicalCellMap=self.physicalCellMap,
+                                   geometricalCellMap=self.geometricalCellMap,
+                                   physicalFaceMap=self.physicalFaceMap,
+                                   geometricalFaceMap=self.geometricalFaceMap,
+                                   physicalNames=nx.array(json.dumps(self.physicalNames)),
+                                   dimensions=nx.array(self.dimensions)))
+
         return (vertexCoords, facesToV, cellsToF,
-                cellsData.idmap, ghostsData.idmap,
+                cellsData.idmap.tolist(), ghostsData.idmap.tolist(),
                 cellsToVertIDs)
 
     def write(self, obj, time=0.0, timeindex=0):
@@ -996,50 +1190,148 @@ class MSHFile(GmshFile):
 
         self.fileobj.write("$EndElementData\n")
 
-    def _vertexCoordsAndMap(self, cellsToGmshVerts):
+    def _vertexCoordsAndMap(self, cellsToGmshVerts, nodeIDs, nodeCoords):
         """
         Returns `vertexCoords` and mapping from Gmsh ID to `vertexCoords`
-        indices (same as in `MSHFile`).
+        indices.
 
-        Unlike parent, doesn't use `genfromtxt`
-        because we want to avoid loading the entire `.msh` file into memory.
+        Only the nodes used by `cellsToGmshVerts` become vertices.
         """
-        allVerts     = [v for c in cellsToGmshVerts for v in c] # flatten
-        allVerts     = nx.unique(nx.array(allVerts, dtype=nx.INT_DTYPE)) # remove dups
-        allVerts     = nx.sort(allVerts)
+        allVerts     = nx.unique(cellsToGmshVerts[cellsToGmshVerts >= 0]) # sorted, without dups
         maxVertIdx   = allVerts[-1] + 1 # add one to offset zero
         vertGIDtoIdx = nx.ones(maxVertIdx, 'l') * -1 # gmsh ID -> vertexCoords idx
-        vertexCoords = nx.empty((len(allVerts), self.coordDimensions))
-        nodeCount    = 0
 
         # establish map. This works because allVerts is a sorted set.
         vertGIDtoIdx[allVerts] = nx.arange(len(allVerts))
 
-        nodesFile = open(self.nodesPath, 'r')
-        nodesFile.readline() # skip number of nodes
-
-        # now we walk through node file with a sorted unique list of vertices
-        # in hand. When we encounter 0th element in `allVerts`, save it
-        # to `vertexCoords` then pop its ID off `allVerts`.
-        for node in nodesFile:
-            line   = node.split()
-            nodeID = int(line[0])
+        # Gmsh doesn't promise to write nodes in order
+        order = nx.argsort(nodeIDs, kind='mergesort')
+        rows = nx.searchsorted(nodeIDs[order], allVerts)
+        rows = order[nx.minimum(rows, len(order) - 1)]
+        if (nodeIDs[rows] != allVerts).any():
+            raise GmshException("Elements refer to nodes missing from the `$Nodes` section")
 
-            if nodeID == allVerts[nodeCount]:
-                newVert = [float(x) for x in line[1:self.coordDimensions+1]]
-                vertexCoords[nodeCount,:] = nx.array(newVert)
-                nodeCount += 1
-
-            if len(allVerts) == nodeCount:
-                break
-
-        nodesFile.close()
+        vertexCoords = nodeCoords[rows, :self.coordDimensions].astype(float)
 
         # transpose for FiPy
-        transCoords = vertexCoords.swapaxes(0, 1)
-        return transCoords, vertGIDtoIdx
+        return vertexCoords.swapaxes(0, 1), vertGIDtoIdx
 
-    def _parseElementFile(self):
+    def _dtype(self, kind):
+        """The `dtype` of binary `int` (`i`), `size_t` (`t`), or `double` (`d`) data.
+        """
+        kind = {'i': 'i4', 't': 'i%d' % self.dataSize, 'd': 'f8'}[kind]
+        return nx.dtype(self.byteOrder + kind)
+
+    def _parseNodes(self, section):
+        """
+        Return the Gmsh ID and the coordinates of every node in the
+        `$Nodes` `section`.
+        """
+        if self.fileType == 1:
+            if self.version >= 4:
+                return self._parseBinaryNodes4(section)
+            else:
+                newline = section.index(b"\n")
+                numNodes = int(section[:newline])
+                nodes = nx.frombuffer(section,
+                                      dtype=[('id', self._dtype('i')),
+                                             ('coords', self._dtype('d'), (3,))],
+                                      count=numNodes, offset=newline + 1)
+                return nodes['id'].astype(nx.INT_DTYPE), nodes['coords']
+        else:
+            values = nx.fromstring(section, dtype=float, sep=" ")
+            if self.version >= 4:
+                return self._parseASCIINodes4(values)
+            else:
+                # skip number of nodes
+                values = values[1:].reshape((-1, 4))
+                return values[..., 0].astype(nx.INT_DTYPE), values[..., 1:]
+
+    def _parseASCIINodes4(self, values):
+        # header is numEntityBlocks numNodes minNodeTag maxNodeTag
+        numBlocks = int(values[0])
+        position = 4
+        IDs = []
+        coords = []
+        for block in range(numBlocks):
+            entityDim, entityTag, parametric, numNodes = values[position:position + 4].astype(int)
+            position += 4
+            IDs.append(values[position:position + numNodes])
+            position += numNodes
+            width = 3 + parametric * entityDim # x y z <u v w>
+            coords.append(values[position:position + numNodes * width].reshape((numNodes, width))[..., :3])
+            position += numNodes * width
+
+        return (nx.concatenate(IDs + [nx.zeros((0,))]).astype(nx.INT_DTYPE),
+                nx.concatenate(coords + [nx.zeros((0, 3))]))
+
+    def _parseBinaryNodes4(self, section):
+        intType, sizeType, doubleType = self._dtype('i'), self._dtype('t'), self._dtype('d')
+
+        numBlocks = nx.frombuffer(section, dtype=sizeType, count=4)[0]
+        position = 4 * sizeType.itemsize
+        IDs = []
+        coords = []
+        for block in range(numBlocks):
+            entityDim, entityTag, parametric = nx.frombuffer(section, dtype=intType, count=3, offset=position)
+            position += 3 * intType.itemsize
+            numNodes = nx.frombuffer(section, dtype=sizeType, count=1, offset=position)[0]
+            position += sizeType.itemsize
+            IDs.append(nx.frombuffer(section, dtype=sizeType, count=numNodes, offset=position))
+            position += numNodes * sizeType.itemsize
+            width = 3 + parametric * entityDim # x y z <u v w>
+            coords.append(nx.frombuffer(section, dtype=doubleType, count=numNodes * width,
+                                        offset=position).reshape((numNodes, width))[..., :3])
+            position += numNodes * width * doubleType.itemsize
+
+        return (nx.concatenate(IDs + [nx.zeros((0,), dtype=sizeType)]).astype(nx.INT_DTYPE),
+                nx.concatenate(coords + [nx.zeros((0, 3))]))
+
+    def _parseEntities(self, data, stop):
+        """
+        Return the physical entity of each `(dimension, tag)` geometrical
+        entity (0 if it has none) from the `$Entities` section of a format 4
+        file.
+        """
+        try:
+            begin, end = self._findSection(data, "Entities", stop=stop)
+        except EOFError:
+            return {}
+
+        section = data[begin:end]
+        physicalEntities = {}
+        if self.fileType == 1:
+            intType, sizeType = self._dtype('i'), self._dtype('t')
+            counts = nx.frombuffer(section, dtype=sizeType, count=4)
+            position = 4 * sizeType.itemsize
+            for dim, count in enumerate(counts):
+                for entity in range(count):
+                    tag = nx.frombuffer(section, dtype=intType, count=1, offset=position)[0]
+                    # skip the coordinates of the point or the bounding box
+                    position += intType.itemsize + (3 if dim == 0 else 6) * 8
+                    numPhysicals = nx.frombuffer(section, dtype=sizeType, count=1, offset=position)[0]
+                    position += sizeType.itemsize
+                    physicals = nx.frombuffer(section, dtype=intType, count=numPhysicals, offset=position)
+                    position += numPhysicals * intType.itemsize
+                    if dim > 0:
+                        # skip the bounding entities
+                        numBounding = nx.frombuffer(section, dtype=sizeType, count=1, offset=position)[0]
+                        position += sizeType.itemsize + numBounding * intType.itemsize
+                    physicalEntities[dim, int(tag)] = int(physicals[0]) if numPhysicals > 0 else 0
+        else:
+            lines = [line.split() for line in section.splitlines() if line.strip()]
+            counts = [int(x) for x in lines.pop(0)]
+            for dim, count in enumerate(counts):
+                # after the tag come the coordinates of the point or the bounding box
+                numPhysicals = 4 if dim == 0 else 7
+                for line in lines[:count]:
+                    physicals = line[numPhysicals + 1:numPhysicals + 1 + int(line[numPhysicals])]
+                    physicalEntities[dim, int(line[0])] = int(physicals[0]) if len(physicals) > 0 else 0
+                lines = lines[count:]
+
+        return physicalEntities
+
+    def _parseElements(self, data, entities, start=0):
         """
         Return three objects, the first for non-ghost cells, the second for
         ghost cells, and the third for faces.
@@ -1048,121 +1340,181 @@ class MSHFile(GmshFile):
         calculation is consolidated here: if we were ever to need to CALCULATE
         GHOST CELLS OURSELVES, the only code we'd have to change is in here.
         """
+        begin, end = self._findSection(data, "Elements", start=start)
+        section = data[begin:end]
 
-        def _parseTags(offset, currLineInts):
-            if offset == -1:
-                # if first valid shape
-                offset = currLineInts[0]
-
-            numTags = currLineInts[2]
-            tags    = currLineInts[3:(3+numTags)]
+        if self.version >= 4:
+            elementsData = self._parseElements4(section, entities)
+        elif self.fileType == 1:
+            elementsData = self._parseBinaryElements2(section)
+        else:
+            elementsData = self._parseASCIIElements2(section)
+        del section
 
-            # the partition tags for don't seem to always be present
-            # and don't always make much sense when they are
+        # the ID of the first cell (face) will be subtracted from
+        # the Gmsh IDs of the cells (faces) to obtain global IDs
+        cellsData = elementsData.take(nx.in1d(elementsData.shapes, list(self.numFacesPerCell.keys())))
+        facesData = elementsData.take(nx.in1d(elementsData.shapes, list(self.numVertsPerFace.keys())))
+        for elements in (cellsData, facesData):
+            if len(elements) > 0:
+                elements.idmap = elements.idmap - elements.idmap[0]
 
-            if len(tags) >= 2:
-                physicalEntity = tags.pop(0)
-                geometricalEntity = tags.pop(0)
-            else:
-                physicalEntity = geometricalEntity = -1
-
-            return offset, tags, physicalEntity, geometricalEntity
-
-
-        cellsData = _ElementData()
-        ghostsData = _ElementData()
-        facesData = _ElementData()
-
-        cellOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        faceOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        pid = self.communicator.procID + 1
-
-        elemsFile = open(self.elemsPath, 'r')
-
-        elemsFile.readline() # skip number of elements
-        for el in elemsFile:
-            currLineInts = [int(x) for x in el.split()]
-            elemType     = currLineInts[1]
-
-            if elemType in list(self.numFacesPerCell.keys()):
-                # element is a cell
-
-                (cellOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=cellOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= cellOffset
-
-                if len(tags) > 0:
-                    # next item is a count
-                    if tags[0] != len(tags) - 1:
-                        warnings.warn("Partition count %d does not agree with number of remaining tags %d." % (tags[0], len(tags) - 1),
-                                      SyntaxWarning, stacklevel=2)
-                    tags = tags[1:]
-
-                if self.communicator.Nproc > 1:
-                    for tag in tags:
-                        if -tag == pid:
-                            # if we're collecting ghost cells and this is our ghost cell
-                            ghostsData.add(currLine=currLineInts, elType=elemType,
-                                           physicalEntity=physicalEntity,
-                                           geometricalEntity=geometricalEntity)
-                        elif tag == pid:
-                            # el is in this processor's partition or we collect all cells
-                            cellsData.add(currLine=currLineInts, elType=elemType,
-                                          physicalEntity=physicalEntity,
-                                          geometricalEntity=geometricalEntity)
-                else:
-                    # we collect all cells
-                    cellsData.add(currLine=currLineInts, elType=elemType,
-                                  physicalEntity=physicalEntity,
-                                  geometricalEntity=geometricalEntity)
-            elif elemType in list(self.numVertsPerFace.keys()):
-                # element is a face
-
-                (faceOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=faceOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= faceOffset
-
-                facesData.add(currLine=currLineInts, elType=elemType,
-                              physicalEntity=physicalEntity,
-                              geometricalEntity=geometricalEntity)
-
-        elemsFile.close()
+        if self.communicator.Nproc > 1:
+            pid = self.communicator.procID + 1
+            # if we're collecting ghost cells and this is our ghost cell
+            ghostsData = cellsData.take((cellsData.partitions == -pid).any(axis=1))
+            # el is in this processor's partition
+            cellsData = cellsData.take((cellsData.partitions == pid).any(axis=1))
+        else:
+            # we collect all cells
+            ghostsData = cellsData.take(nx.zeros((len(cellsData),), dtype=bool))
 
         return cellsData, ghostsData, facesData
 
-
-    def _parseNamesFile(self):
+    def _parseTags(self, IDs, shapes, tags, nodes, order):
+        """
+        Build `_ElementData` for format 2 elements of the same type and
+        number of tags.
+        """
+        if tags.shape[-1] >= 2:
+            physicalEntities = tags[..., 0]
+            geometricalEntities = tags[..., 1]
+            tags = tags[..., 2:]
+        else:
+            physicalEntities = geometricalEntities = -nx.ones((len(IDs),), dtype=nx.INT_DTYPE)
+
+        # the partition tags don't seem to always be present
+        # and don't always make much sense when they are
+        if tags.shape[-1] > 0:
+            # next item is a count
+            disagree = (tags[..., 0] != tags.shape[-1] - 1)
+            if disagree.any():
+                warnings.warn("Partition count %d does not agree with number of remaining tags %d."
+                              % (tags[disagree][0, 0], tags.shape[-1] - 1),
+                              SyntaxWarning, stacklevel=4)
+            tags = tags[..., 1:]
+
+        return _ElementData(nodes=nodes, shapes=shapes, idmap=IDs,
+                            physicalEntities=physicalEntities,
+                            geometricalEntities=geometricalEntities,
+                            partitions=tags, order=order)
+
+    def _parseASCIIElements2(self, section):
+        values, starts, counts = _parseRaggedInts(section)
+
+        # the first line is the number of elements
+        lines = nx.arange(1, len(counts))
+        blocks = []
+        for count in nx.unique(counts[lines]):
+            # lines of the same length can be gathered into a table
+            sameCount = lines[counts[lines] == count]
+            rows = values[starts[sameCount][..., nx.newaxis] + nx.arange(count)]
+            for numTags in nx.unique(rows[..., 2]):
+                same = (rows[..., 2] == numTags)
+                table = rows[same]
+                blocks.append(self._parseTags(IDs=table[..., 0],
+                                              shapes=table[..., 1],
+                                              tags=table[..., 3:3 + numTags],
+                                              nodes=table[..., 3 + numTags:],
+                                              order=sameCount[same]))
+
+        elementsData = _ElementData.concatenate(blocks)
+        return elementsData.take(nx.argsort(elementsData.order, kind='mergesort'))
+
+    def _parseBinaryElements2(self, section):
+        intType = self._dtype('i')
+        newline = section.index(b"\n")
+        numElements = int(section[:newline])
+        position = newline + 1
+        numRead = 0
+        blocks = []
+        while numRead < numElements:
+            # header is elm-type num-elm-follow num-tags
+            shapeType, numFollow, numTags = nx.frombuffer(section, dtype=intType, count=3, offset=position)
+            position += 3 * intType.itemsize
+            width = 1 + numTags + _numNodes(shapeType)
+            table = nx.frombuffer(section, dtype=intType, count=numFollow * width,
+                                  offset=position).reshape((numFollow, width))
+            position += table.nbytes
+            blocks.append(self._parseTags(IDs=table[..., 0],
+                                          shapes=nx.zeros((numFollow,), dtype=nx.INT_DTYPE) + shapeType,
+                                          tags=table[..., 1:1 + numTags],
+                                          nodes=table[..., 1 + numTags:],
+                                          order=nx.arange(numRead, numRead + numFollow)))
+            numRead += numFollow
+
+        return _ElementData.concatenate(blocks)
+
+    def _parseElements4(self, section, entities):
+        if self.fileType == 1:
+            intType, sizeType = self._dtype('i'), self._dtype('t')
+            header = nx.frombuffer(section, dtype=sizeType, count=4)
+            position = 4 * sizeType.itemsize
+        else:
+            values = nx.fromstring(section, dtype=nx.INT_DTYPE, sep=" ")
+            header = values
+            position = 4
+
+        # header is numEntityBlocks numElements minElementTag maxElementTag
+        numRead = 0
+        blocks = []
+        for block in range(header[0]):
+            if self.fileType == 1:
+                entityDim, entityTag, shapeType = nx.frombuffer(section, dtype=intType, count=3, offset=position)
+                position += 3 * intType.itemsize
+                numElements = nx.frombuffer(section, dtype=sizeType, count=1, offset=position)[0]
+                position += sizeType.itemsize
+                width = 1 + _numNodes(shapeType)
+                table = nx.frombuffer(section, dtype=sizeType, count=numElements * width,
+                                      offset=position).reshape((numElements, width))
+                position += table.nbytes
+            else:
+                entityDim, entityTag, shapeType, numElements = values[position:position + 4]
+                position += 4
+                width = 1 + _numNodes(shapeType)
+                table = values[position:position + numElements * width].reshape((numElements, width))
+                position += numElements * width
+
+            ones = nx.ones((numElements,), dtype=nx.INT_DTYPE)
+            blocks.append(_ElementData(nodes=table[..., 1:],
+                                       shapes=ones * shapeType,
+                                       idmap=table[..., 0],
+                                       physicalEntities=ones * entities.get((entityDim, entityTag), 0),
+                                       geometricalEntities=ones * entityTag,
+                                       order=nx.arange(numRead, numRead + numElements)))
+            numRead += numElements
+
+        return _ElementData.concatenate(blocks)
+
+    def _parseNames(self, data, stop):
         physicalNames = {
             0: dict(),
             1: dict(),
             2: dict(),
             3: dict()
         }
-        if self.namesPath is not None:
-            namesFile = open(self.namesPath, 'r')
-
-            namesFile.readline() # skip number of elements
-            for nm in namesFile:
-                nm = nm.split()
-                if self.version > 2.0:
-                    dim = [int(nm.pop(0))]
-                else:
-                    # Gmsh format prior to 2.1 did not unambiguously tie
-                    # physical names to physical entities of different dimensions
-                    # http://article.gmane.org/gmane.comp.cad.gmsh.general/1601
-                    dim = [0, 1, 2, 3]
-                num = int(nm.pop(0))
-                name = " ".join(nm)[1:-1]
-                for d in dim:
-                    physicalNames[d][name] = int(num)
 
-            namesFile.close()
+        try:
+            begin, end = self._findSection(data, "PhysicalNames", stop=stop)
+        except EOFError:
+            return physicalNames
+
+        names = data[begin:end].decode("utf-8").splitlines()
+        for nm in names[1:]: # skip number of names
+            nm = nm.split()
+            if len(nm) == 0:
+                continue
+            if self.version > 2.0:
+                dim = [int(nm.pop(0))]
+            else:
+                # Gmsh format prior to 2.1 did not unambiguously tie
+                # physical names to physical entities of different dimensions
+                # http://article.gmane.org/gmane.comp.cad.gmsh.general/1601
+                dim = [0, 1, 2, 3]
+            num = int(nm.pop(0))
+            name = " ".join(nm)[1:-1]
+            for d in dim:
+                physicalNames[d][name] = int(num)
 
         return physicalNames
 
@@ -1263,36 +1615,296 @@ class MSHFile(GmshFile):
         ...     p = Popen(["gmsh", os.path.join(dir, "cyl.msh")]) # doctest: +GMSH
         ...     doctest_raw_input("CylindricalGrid2D... Press enter.")
 
+        Test importing
+
+        Reading a `.msh` file doesn't need Gmsh.  A square and a triangle,
+        with the left edge of the square named
+
+        >>> nodes = [(1, 0., 0.), (2, 1., 0.), (3, 2., 0.), (4, 0., 1.), (5, 1., 1.)]
+        >>> elements = [(1, 1, 3, 7, 4, 1), # id, type, physical, geometrical, nodes
+        ...             (2, 3, 1, 5, 1, 2, 5, 4),
+        ...             (3, 2, 2, 6, 2, 3, 5)]
+        >>> names = '''$PhysicalNames
+        ... 3
+        ... 1 3 "left"
+        ... 2 1 "square"
+        ... 2 2 "triangle"
+        ... $EndPhysicalNames
+        ... '''
+
+        can be written in ASCII format 2.2
+
+        >>> msh22 = os.path.join(dir, "msh22.msh")
+        >>> with open(msh22, 'w') as f:
+        ...     output = f.write("$MeshFormat\\n2.2 0 8\\n$EndMeshFormat\\n" + names)
+        ...     output = f.write("$Nodes\\n5\\n")
+        ...     output = f.write("".join(["%d %g %g 0\\n" % n for n in nodes]))
+        ...     output = f.write("$EndNodes\\n$Elements\\n3\\n")
+        ...     output = f.write("".join(["%d %d 2 %s\\n" % (e[0], e[1], " ".join([str(x) for x in e[2:]]))
+        ...                               for e in elements]))
+        ...     output = f.write("$EndElements\\n")
+
+        in binary format 2.2
+
+        >>> import struct
+        >>> msh22b = os.path.join(dir, "msh22b.msh")
+        >>> with open(msh22b, 'wb') as f:
+        ...     output = f.write(b"$MeshFormat\\n2.2 1 8\\n" + struct.pack("<i", 1) + b"\\n$EndMeshFormat\\n")
+        ...     output = f.write(names.encode("ascii") + b"$Nodes\\n5\\n")
+        ...     for n in nodes:
+        ...         output = f.write(struct.pack("<iddd", n[0], n[1], n[2], 0.))
+        ...     output = f.write(b"\\n$EndNodes\\n$Elements\\n3\\n")
+        ...     for e in elements:
+        ...         # elm-type num-elm-follow num-tags, then the element
+        ...         output = f.write(struct.pack("<3i", e[1], 1, 2)
+        ...                          + struct.pack("<%di" % (len(e) - 1), e[0], *e[2:]))
+        ...     output = f.write(b"\\n$EndElements\\n")
+
+        or in ASCII format 4.1, where the physical entities are attached to
+        the geometrical entities
+
+        >>> msh41 = os.path.join(dir, "msh41.msh")
+        >>> with open(msh41, 'w') as f:
+        ...     output = f.write("$MeshFormat\\n4.1 0 8\\n$EndMeshFormat\\n" + names + '''$Entities
+        ... 0 1 2 0
+        ... 7 0 0 0 0 1 0 1 3 0
+        ... 5 0 0 0 1 1 0 1 1 0
+        ... 6 1 0 0 2 1 0 1 2 0
+        ... $EndEntities
+        ... $Nodes
+        ... 1 5 1 5
+        ... 2 5 0 5
+        ... 1
+        ... 2
+        ... 3
+        ... 4
+        ... 5
+        ... ''')
+        ...     output = f.write("".join(["%g %g 0\\n" % n[1:] for n in nodes]))
+        ...     output = f.write('''$EndNodes
+        ... $Elements
+        ... 3 3 1 3
+        ... 1 7 1 1
+        ... 1 4 1
+        ... 2 5 3 1
+        ... 2 1 2 5 4
+        ... 2 6 2 1
+        ... 3 2 3 5
+        ... $EndElements
+        ... ''')
+
+        and all produce the same mesh
+
+        >>> for mshFile in [msh22, msh22b, msh41]:
+        ...     mesh = Gmsh2D(mshFile, communicator=serialComm)
+        ...     left = mesh.physicalFaces["left"].value
+        ...     print("%s %s %s" % (nx.allclose(mesh.cellVolumes, [1., 0.5]),
+        ...                         mesh.physicalCells["triangle"].value.tolist(),
+        ...                         mesh.faceCenters.value[..., left].tolist()))
+        True [False, True] [[0.0], [0.5]]
+        True [False, True] [[0.0], [0.5]]
+        True [False, True] [[0.0], [0.5]]
+
         >>> import shutil
         >>> shutil.rmtree(dir)
         """
         pass
 
+class _CachedMSHFile(MSHFile):
+    """Stands in for an `MSHFile` whose contents were found in a `GmshCache`
+    """
+    def __init__(self, entry, coordDimensions=None, communicator=parallelComm):
+        self.entry = entry
+        self.dimensions = int(entry["dimensions"])
+        self.coordDimensions = coordDimensions or self.dimensions
+        self.communicator = communicator
+        self.filename = None
+        self.fileIsTemporary = False
+        self.gmshOutput = ""
+        self.cache = None
+
+    def read(self):
+        entry = self.entry
+
+        self.physicalCellMap = entry["physicalCellMap"]
+        self.geometricalCellMap = entry["geometricalCellMap"]
+        self.physicalFaceMap = entry["physicalFaceMap"]
+        self.geometricalFaceMap = entry["geometricalFaceMap"]
+        # JSON turned the dimensions into strings
+        self.physicalNames = dict((int(dim), names) for dim, names
+                                  in json.loads(str(entry["physicalNames"])).items())
+
+        return (entry["vertexCoords"], entry["faceVertexIDs"], entry["cellFaceIDs"],
+                entry["cellGlobalIDs"].tolist(), entry["ghostCellGlobalIDs"].tolist(),
+                nx.MA.masked_equal(entry["cellVertexIDs"], value=-1))
+
+    def close(self):
+        pass
+
 class _ElementData(object):
     """
-    Bookkeeping for cells. Declared as own class for generality.
+    Bookkeeping for elements. Declared as own class for generality.
 
     :Properties:
-    - `nodes`: A Python list of the vertices that make up this element
-    - `shapes`: A `shapeTypes` Python list
-    - `idmap`: A Python list which maps `vertexCoords` index to global ID
-    - `physicalEntities`: A Python list of the Gmsh physical entities each element is in
-    - `geometricalEntities`: A Python list of the Gmsh geometrical entities each element is in
+    - `nodes`: An array of the nodes that make up each element, padded with -1
+    - `shapes`: An array of the `shapeTypes` of each element
+    - `idmap`: An array which maps `vertexCoords` index to global ID
+    - `physicalEntities`: An array of the Gmsh physical entities each element is in
+    - `geometricalEntities`: An array of the Gmsh geometrical entities each element is in
+    - `partitions`: An array of the partitions each element is in (negated
+      for ghosts), padded with 0
+    - `order`: An array of the position of each element in the file
+    """
+    def __init__(self, nodes, shapes, idmap, physicalEntities, geometricalEntities,
+                 partitions=None, order=None):
+        self.nodes = nodes
+        self.shapes = shapes
+        self.idmap = idmap # vertexCoords idx -> gmsh ID (global ID)
+        self.physicalEntities = physicalEntities
+        self.geometricalEntities = geometricalEntities
+        if partitions is None:
+            partitions = nx.zeros((len(shapes), 0), dtype=nx.INT_DTYPE)
+        self.partitions = partitions
+        if order is None:
+            order = nx.arange(len(shapes))
+        self.order = order
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def take(self, which):
+        """Select elements by index or mask
+        """
+        nodes = self.nodes[which]
+        if len(nodes) > 0:
+            # drop padding that is no longer needed
+            nodes = nodes[..., :(nodes >= 0).sum(axis=1).max()]
+        return _ElementData(nodes=nodes,
+                            shapes=self.shapes[which],
+                            idmap=self.idmap[which],
+                            physicalEntities=self.physicalEntities[which],
+                            geometricalEntities=self.geometricalEntities[which],
+                            partitions=self.partitions[which],
+                            order=self.order[which])
+
+    @staticmethod
+    def concatenate(blocks):
+        """Join `blocks` of elements end to end
+        """
+        def join(arrays, fill=None):
+            arrays = [nx.asarray(a).astype(nx.INT_DTYPE) for a in arrays]
+            if fill is not None:
+                width = max([a.shape[-1] for a in arrays])
+                arrays = [nx.concatenate((a, fill * nx.ones((len(a), width - a.shape[-1]), dtype=nx.INT_DTYPE)),
+                                         axis=1) for a in arrays]
+            return nx.concatenate(arrays)
+
+        if len(blocks) == 0:
+            empty = nx.zeros((0,), dtype=nx.INT_DTYPE)
+            return _ElementData(nodes=empty.reshape((0, 0)), shapes=empty, idmap=empty,
+                                physicalEntities=empty, geometricalEntities=empty)
+
+        return _ElementData(nodes=join([b.nodes for b in blocks], fill=-1),
+                            shapes=join([b.shapes for b in blocks]),
+                            idmap=join([b.idmap for b in blocks]),
+                            physicalEntities=join([b.physicalEntities for b in blocks]),
+                            geometricalEntities=join([b.geometricalEntities for b in blocks]),
+                            partitions=join([b.partitions for b in blocks], fill=0),
+                            order=join([b.order for b in blocks]))
+
+# number of nodes of each Gmsh element type
+_numNodesPerElement = {1: 2, 2: 3, 3: 4, 4: 4, 5: 8, 6: 6, 7: 5, 8: 3, 9: 6,
+                       10: 9, 11: 10, 12: 27, 13: 18, 14: 14, 15: 1, 16: 8,
+                       17: 20, 18: 15, 19: 13, 20: 9, 21: 10, 22: 12, 23: 15,
+                       24: 15, 25: 21, 26: 4, 27: 5, 28: 6, 29: 20, 30: 35,
+                       31: 56, 92: 64, 93: 125}
+
+def _numNodes(shapeType):
+    try:
+        return _numNodesPerElement[int(shapeType)]
+    except KeyError:
+        raise GmshException("Gmsh element type %d is not supported" % shapeType)
+
+# faces of each type of cell, in terms of the cell's (corner) nodes
+_cellFaceVertices = dict((shapeType, faces) for shapeTypes, faces in [
+    ((2, 9, 20, 21, 22, 23, 24, 25), [[0, 1], [1, 2], [2, 0]]), # triangle
+    ((3, 10, 16), [[0, 1], [1, 2], [2, 3], [3, 0]]), # quadrangle
+    ((4, 11, 29, 30, 31), [[0, 1, 2], [1, 2, 3], [2, 3, 0], [3, 0, 1]]), # tetrahedron
+    ((5, 12, 17), [[0, 1, 2, 3], # ordering of vertices gleaned from
+                   [4, 5, 6, 7], # a one-cube Grid3D example
+                   [0, 1, 5, 4],
+                   [3, 2, 6, 7],
+                   [0, 3, 7, 4],
+                   [1, 2, 6, 5]]), # hexahedron
+    ((6, 13, 18), [[0, 1, 2],
+                   [5, 4, 3],
+                   [3, 4, 1, 0],
+                   [4, 5, 2, 1],
+                   [5, 3, 0, 2]]), # prism
+    ((7, 14, 19), [[0, 1, 2, 3],
+                   [0, 1, 4],
+                   [1, 2, 4],
+                   [2, 3, 4],
+                   [3, 0, 4]]) # pyramid
+] for shapeType in shapeTypes)
+
+# number of corner nodes of each type of face element
+_faceCorners = dict((shapeType, corners) for shapeTypes, corners in [
+    ((1, 8), 2), # line
+    ((2, 9, 20, 21, 22, 23, 24, 25), 3), # triangle
+    ((3, 10, 16), 4) # quadrangle
+] for shapeType in shapeTypes)
+
+def _parseRaggedInts(text):
+    """Parse lines of whitespace-separated integers in bulk
+
+    Returns all of the integers, the index of the first integer of each
+    non-blank line, and the number of integers on each non-blank line.
+
+    >>> values, starts, counts = _parseRaggedInts(b"2\\n1 2 3\\n\\n 4 5\\n")
+    >>> print(values)
+    [2 1 2 3 4 5]
+    >>> print(starts)
+    [0 1 4]
+    >>> print(counts)
+    [1 3 2]
+    """
+    chars = nx.frombuffer(text, dtype=nx.uint8)
+    space = (chars <= ord(" "))
+    wordStarts = nx.nonzero(~space & nx.concatenate(([True], space[:-1])))[0]
+    newlines = nx.nonzero(chars == ord("\n"))[0]
+    counts = nx.bincount(nx.searchsorted(newlines, wordStarts))
+    counts = counts[counts > 0]
+    values = nx.fromstring(text, dtype=nx.INT_DTYPE, sep=" ")
+    if len(values) != len(wordStarts):
+        raise GmshException("Unable to parse MSH file data as integers")
+    return values, nx.cumsum(counts) - counts, counts
+
+def _uniqueRows(rows):
+    """Find the distinct rows of a 2D array
+
+    Distinct rows are numbered in order of their first appearance.
+    Returns the index of the first appearance of each distinct row and
+    the number of the distinct row that matches each row.
+
+    >>> first, inverse = _uniqueRows(nx.array([[3, 4], [1, 2], [3, 4], [0, 5], [1, 2]]))
+    >>> print(first)
+    [0 1 3]
+    >>> print(inverse)
+    [0 1 0 2 1]
     """
-    def __init__(self):
-        self.nodes = []
-        self.shapes = []
-        self.idmap = [] # vertexCoords idx -> gmsh ID (global ID)
-        self.physicalEntities = []
-        self.geometricalEntities = []
-
-    def add(self, currLine, elType, physicalEntity, geometricalEntity):
-        numTags = currLine[2]
-        self.nodes.append(currLine[(numTags+3):])
-        self.shapes.append(elType)
-        self.idmap.append(currLine[0])
-        self.physicalEntities.append(physicalEntity)
-        self.geometricalEntities.append(geometricalEntity)
+    order = nx.lexsort(rows.swapaxes(0, 1)[::-1])
+    rows = rows[order]
+    new = nx.ones((len(rows),), dtype=bool)
+    new[1:] = (rows[1:] != rows[:-1]).any(axis=1)
+    # stable sort puts the first appearance of each row first
+    first = order[new]
+    byAppearance = nx.argsort(first, kind='mergesort')
+    number = nx.empty((len(first),), dtype=nx.INT_DTYPE)
+    number[byAppearance] = nx.arange(len(first))
+    inverse = nx.empty((len(rows),), dtype=nx.INT_DTYPE)
+    inverse[order] = number[nx.cumsum(new) - 1]
+    return first[byAppearance], inverse
 
 class _GmshTopology(_MeshTopology):
 
@@ -1583,6 +2195,10 @@ class Gmsh2D(Mesh2D):
         of ghost cells.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : ~fipy.meshes.gmshMesh.GmshCache
+        Where to look for (and keep) the mesh generated from a geometry
+        script.  Defaults to the directory named by the `FIPY_GMSH_CACHE`
+        environment variable, if it is set.
     """
 
     def __init__(self,
@@ -1590,7 +2206,8 @@ class Gmsh2D(Mesh2D):
                  coordDimensions=2,
                  communicator=parallelComm,
                  overlap=1,
-                 background=None):
+                 background=None,
+                 cache=None):
 
         self.mshFile = openMSHFile(arg,
                                    dimensions=2,
@@ -1598,7 +2215,8 @@ class Gmsh2D(Mesh2D):
                                    communicator=communicator,
                                    overlap=overlap,
                                    mode='r',
-                                   background=background)
+                                   background=background,
+                                   cache=cache)
 
         # openMSHFile may have "downgraded" the communicator
         # if, e.g., too many overlaps were requested
@@ -1890,14 +2508,19 @@ class Gmsh2DIn3DSpace(Gmsh2D):
         of ghost cells.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : ~fipy.meshes.gmshMesh.GmshCache
+        Where to look for (and keep) the mesh generated from a geometry
+        script.  Defaults to the directory named by the `FIPY_GMSH_CACHE`
+        environment variable, if it is set.
     """
-    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None):
+    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None, cache=None):
         Gmsh2D.__init__(self,
                         arg,
                         coordDimensions=3,
                         communicator=communicator,
                         overlap=overlap,
-                        background=background)
+                        background=background,
+                        cache=cache)
 
     def _test(self):
         """
@@ -1972,14 +2595,19 @@ class Gmsh3D(Mesh):
         of ghost cells.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : ~fipy.meshes.gmshMesh.GmshCache
+        Where to look for (and keep) the mesh generated from a geometry
+        script.  Defaults to the directory named by the `FIPY_GMSH_CACHE`
+        environment variable, if it is set.
     """
-    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None):
+    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None, cache=None):
         self.mshFile  = openMSHFile(arg,
                                     dimensions=3,
                                     communicator=communicator,
                                     overlap=overlap,
                                     mode='r',
-                                    background=background)
+                                    background=background,
+                                    cache=cache)
 
         # openMSHFile may have "downgraded" the communicator
         # if, e.g., too many overlaps were requested
@@ -2206,7 +2834,7 @@ class GmshGrid2D(Gmsh2D):
     """Should serve as a drop-in replacement for `Grid2D`
     """
     def __init__(self, dx=1., dy=1., nx=1, ny=None,
-                 coordDimensions=2, communicator=parallelComm, overlap=1):
+                 coordDimensions=2, communicator=parallelComm, overlap=1, cache=None):
         self.dx = dx
         self.dy = dy or dx
         self.nx = nx
@@ -2214,7 +2842,7 @@ class GmshGrid2D(Gmsh2D):
 
         arg = self._makeGridGeo(self.dx, self.dy, self.nx, self.ny)
 
-        Gmsh2D.__init__(self, arg, coordDimensions, communicator, overlap, background=None)
+        Gmsh2D.__init__(self, arg, coordDimensions, communicator, overlap, background=None, cache=cache)
 
     @property
     def _meshSpacing(self):
@@ -2276,7 +2904,7 @@ class GmshGrid3D(Gmsh3D):
     """Should serve as a drop-in replacement for `Grid3D`
     """
     def __init__(self, dx=1., dy=1., dz=1., nx=1, ny=None, nz=None,
-                 communicator=parallelComm, overlap=1):
+                 communicator=parallelComm, overlap=1, cache=None):
         self.dx = dx
         self.dy = dy or dx
         self.dz = dz or dx
@@ -2288,7 +2916,7 @@ class GmshGrid3D(Gmsh3D):
         arg = self._makeGridGeo(self.dx, self.dy, self.dz,
                                 self.nx, self.ny, self.nz)
 
-        Gmsh3D.__init__(self, arg, communicator=communicator, overlap=overlap)
+        Gmsh3D.__init__(self, arg, communicator=communicator, overlap=overlap, cache=cache)
 
     @property
     def _meshSpacing(self):
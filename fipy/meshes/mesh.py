@@ -332,6 +332,7 @@ class Mesh(AbstractMesh):
         self._scaledCellCenters = self._scale['length'] * self._cellCenters
         self._scaledFaceToCellDistances = self._scale['length'] * self._faceToCellDistances
         self._scaledCellDistances = self._scale['length'] * self._cellDistances
+        self._cellCenterTreeCache = None
         self._setFaceDependentScaledValues()
 
     def _setFaceDependentScaledValues(self):
@@ -534,6 +535,26 @@ class Mesh(AbstractMesh):
 
     """scaling"""
 
+    @property
+    def _cellCenterTree(self):
+        """Spatial index of the global cell centers
+
+        A :class:`scipy.spatial.cKDTree` is built on first use and kept
+        until the geometry is rescaled.  `None` if SciPy is unavailable or
+        the cell centers carry physical units.
+        """
+        if getattr(self, "_cellCenterTreeCache", None) is None:
+            centers = self.cellCenters.globalValue
+            if numerix._isPhysical(centers) or centers.shape[-1] == 0:
+                return None
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                return None
+            self._cellCenterTreeCache = cKDTree(numerix.asarray(centers).T)
+
+        return self._cellCenterTreeCache
+
     def _getNearestCellID(self, points):
         """
         Test cases
@@ -544,8 +565,59 @@ class Mesh(AbstractMesh):
            >>> print(m0._getNearestCellID(m1.cellCenters.globalValue))
            [4 5 7 8]
 
+        The spatial index is built once and reused
+
+           >>> tree = m0._cellCenterTree
+           >>> print(m0._getNearestCellID(((0.05, 11.), (0.05, 0.5))))
+           [0 5]
+           >>> m0._cellCenterTree is tree
+           True
+
+        Like :func:`~fipy.tools.numerix.nearest`, a point equally close
+        to several cells gets the lowest of their IDs
+
+           >>> m2 = Tri2D(nx=3, ny=3)
+           >>> print(m2._getNearestCellID(((0.5, 1., 1.5), (0.5, 1., 0.))))
+           [ 0  0 28]
+           >>> vertices = m2.vertexCoords
+           >>> print(numerix.allequal(m2._getNearestCellID(vertices),
+           ...                        numerix.nearest(m2.cellCenters.globalValue, vertices)))
+           True
+
         """
-        return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        tree = self._cellCenterTree
+        if tree is None or numerix._isPhysical(points):
+            return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+
+        centers = numerix.asarray(self.cellCenters.globalValue)
+        points = numerix.asarray(points)
+        N = centers.shape[-1]
+
+        IDs = numerix.empty((points.shape[-1],), dtype=int)
+        todo = numerix.arange(points.shape[-1])
+        k = 2
+        while len(todo) > 0:
+            k = min(k, N)
+            distances, candidates = tree.query(points[..., todo].T, k=k)
+            distances = distances.reshape((len(todo), k))
+            candidates = candidates.reshape((len(todo), k))
+
+            # candidates as close as the nearest, allowing for rounding
+            tied = distances <= distances[..., :1] * (1 + 1e-10)
+            done = ~tied[..., -1] | (k == N)
+
+            # measure the tied candidates the way `nearest()` does and
+            # take the lowest ID among the closest
+            candidates = candidates[done]
+            diff = centers[..., candidates] - points[..., todo[done], numerix.newaxis]
+            squared = numerix.where(tied[done], numerix.dot(diff, diff, axis=0), numerix.inf)
+            closest = squared == squared.min(axis=-1)[..., numerix.newaxis]
+            IDs[todo[done]] = numerix.where(closest, candidates, N).min(axis=-1)
+
+            todo = todo[~done]
+            k *= 2
+
+        return IDs
 
     def _test(self):
         """
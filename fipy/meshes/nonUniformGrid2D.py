@@ -20,6 +20,9 @@ class NonUniformGrid2D(Mesh2D):
     Creates a 2D grid mesh with horizontal faces numbered
     first and then vertical faces.
     """
+
+    # axes along which the grid may be split between processors
+    _decompositionAxes = None
     def __init__(self, dx=1., dy=1., nx=None, ny=None, overlap=2, communicator=parallelComm,
                  _RepresentationClass=_Grid2DRepresentation, _TopologyClass=_Grid2DTopology):
 
@@ -33,7 +36,8 @@ class NonUniformGrid2D(Mesh2D):
             'overlap': overlap
         }
 
-        builder.buildGridData([dx, dy], [nx, ny], overlap, communicator)
+        builder.buildGridData([dx, dy], [nx, ny], overlap, communicator,
+                              decompositionAxes=self._decompositionAxes)
 
         ([self.dx, self.dy],
          [self.nx, self.ny],
@@ -52,6 +56,7 @@ class NonUniformGrid2D(Mesh2D):
          self.numberOfHorizontalRows,
          self.numberOfVerticalColumns,
          self.numberOfHorizontalFaces,
+         self._globalShape,
          vertices,
          faces,
          cells,
@@ -1,4 +1,5 @@
 from __future__ import unicode_literals
+from builtins import zip
 __docformat__ = 'restructuredtext'
 
 __all__ = []
@@ -12,11 +13,58 @@ from fipy.meshes.mesh import Mesh
 from fipy.meshes.topologies.abstractTopology import _AbstractTopology
 
 class _GridTopology(_AbstractTopology):
+    """
+    In parallel, each processor holds a block of the grid.  Together,
+    the non-overlapping cells of the processors cover the global grid
+    exactly once.
+
+    >>> from fipy import Grid2D, Grid3D
+    >>> class _Comm(object):
+    ...     def __init__(self, procID, Nproc):
+    ...         self.procID = procID
+    ...         self.Nproc = Nproc
+    >>> def cover(Grid, Nproc, **kwargs):
+    ...     meshes = [Grid(communicator=_Comm(procID, Nproc), **kwargs)
+    ...               for procID in range(Nproc)]
+    ...     IDs = numerix.concatenate([m._globalNonOverlappingCellIDs for m in meshes])
+    ...     return (numerix.sort(IDs) == numerix.arange(meshes[0].globalNumberOfCells)).all()
+    >>> print(cover(Grid2D, 4, nx=10, ny=10))
+    True
+    >>> print(cover(Grid3D, 8, nx=6, ny=6, nz=6))
+    True
+    >>> print(cover(Grid3D, 3, dx=[1.] * 5, dy=[1.] * 4, dz=[1.] * 7))
+    True
+
+    The local cells are in the same place as in the global grid
+
+    >>> globalMesh = Grid2D(nx=10, ny=10, communicator=_Comm(0, 1))
+    >>> mesh = Grid2D(nx=10, ny=10, communicator=_Comm(3, 4))
+    >>> print(mesh.offset, mesh.nx, mesh.ny)
+    (3, 3) 7 7
+    >>> print(numerix.allclose(mesh.cellCenters.value,
+    ...                        globalMesh.cellCenters.value[..., mesh._globalOverlappingCellIDs]))
+    True
+    """
 
     @property
     def _isOrthogonal(self):
         return True
 
+    @staticmethod
+    def _blockIDs(shape, start, stop):
+        """Return the IDs of the cells from `start` up to `stop` along
+        each axis of a grid of `shape` cells, with the first axis varying
+        most quickly.
+
+        >>> print(_GridTopology._blockIDs((4, 3), (1, 1), (3, 3)))
+        [ 5  6  9 10]
+        """
+        IDs = numerix.zeros((1,), dtype=numerix.INT_DTYPE)
+        for n, lo, hi in reversed(list(zip(shape, start, stop))):
+            IDs = (IDs[:, numerix.newaxis] * n
+                   + numerix.arange(lo, hi, dtype=numerix.INT_DTYPE)[numerix.newaxis, :]).ravel()
+        return IDs
+
 class _Grid1DTopology(_GridTopology):
 
     _concatenatedClass = Mesh1D
@@ -196,22 +244,28 @@ class _Grid2DTopology(_GridTopology):
 
         Does not include the IDs of boundary cells.
 
-        E.g., would return [0, 1] for mesh A
+        E.g., would return [0, 1, 4, 5] for mesh A
 
         ```
-        ---------
-        | 4 | 5 |
-        ---------  B
-        | 2 | 3 |
-        =========
-        | 0 | 1 |  A
-        ---------
+              C   ||   D
+        ---------------------
+        | 8 | 9 || 10 | 11 |
+        =====================
+        | 4 | 5 ||  6 |  7 |
+        ---------------------
+        | 0 | 1 ||  2 |  3 |
+        ---------------------
+              A   ||   B
         ```
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange((self.mesh.offset[1] + self.mesh.overlap['bottom']) * self.mesh.nx,
-                              (self.mesh.offset[1] + self.mesh.ny - self.mesh.overlap['top']) * self.mesh.nx)
+        mesh = self.mesh
+        return self._blockIDs(mesh._globalShape,
+                              (mesh.offset[0] + mesh.overlap['left'],
+                               mesh.offset[1] + mesh.overlap['bottom']),
+                              (mesh.offset[0] + mesh.nx - mesh.overlap['right'],
+                               mesh.offset[1] + mesh.ny - mesh.overlap['top']))
 
     @property
     def _globalOverlappingCellIDs(self):
@@ -219,21 +273,27 @@ class _Grid2DTopology(_GridTopology):
 
         Includes the IDs of boundary cells.
 
-        E.g., would return [0, 1, 2, 3] for mesh A
+        E.g., would return [0, 1, 2, 4, 5, 6, 8, 9, 10] for mesh A
 
         ```
-        ---------
-        | 4 | 5 |
-        ---------  B
-        | 2 | 3 |
-        =========
-        | 0 | 1 |  A
-        ---------
+              C   ||   D
+        ---------------------
+        | 8 | 9 || 10 | 11 |
+        =====================
+        | 4 | 5 ||  6 |  7 |
+        ---------------------
+        | 0 | 1 ||  2 |  3 |
+        ---------------------
+              A   ||   B
         ```
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.offset[1] * self.mesh.nx, (self.mesh.offset[1] + self.mesh.ny) * self.mesh.nx)
+        mesh = self.mesh
+        return self._blockIDs(mesh._globalShape,
+                              mesh.offset,
+                              (mesh.offset[0] + mesh.nx,
+                               mesh.offset[1] + mesh.ny))
 
     @property
     def _localNonOverlappingCellIDs(self):
@@ -241,22 +301,27 @@ class _Grid2DTopology(_GridTopology):
 
         Does not include the IDs of boundary cells.
 
-        E.g., would return [0, 1] for mesh A
+        E.g., would return [0, 1, 3, 4] for mesh A
 
         ```
-        ---------
-        | 4 | 5 |
-        ---------  B
-        | 2 | 3 |
-        =========
-        | 0 | 1 |  A
-        ---------
+              C   ||   D
+        ---------------------
+        | 6 | 7 ||  8 |    |
+        =====================
+        | 3 | 4 ||  5 |    |
+        ---------------------
+        | 0 | 1 ||  2 |    |
+        ---------------------
+              A   ||   B
         ```
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.overlap['bottom'] * self.mesh.nx,
-                              (self.mesh.ny - self.mesh.overlap['top']) * self.mesh.nx)
+        mesh = self.mesh
+        return self._blockIDs((mesh.nx, mesh.ny),
+                              (mesh.overlap['left'], mesh.overlap['bottom']),
+                              (mesh.nx - mesh.overlap['right'],
+                               mesh.ny - mesh.overlap['top']))
 
     @property
     def _localOverlappingCellIDs(self):
@@ -264,16 +329,18 @@ class _Grid2DTopology(_GridTopology):
 
         Includes the IDs of boundary cells.
 
-        E.g., would return [0, 1, 2, 3] for mesh A
+        E.g., would return [0, 1, 2, 3, 4, 5, 6, 7, 8] for mesh A
 
         ```
-        ---------
-        |   |   |
-        ---------  B
-        | 2 | 3 |
-        =========
-        | 0 | 1 |  A
-        ---------
+              C   ||   D
+        ---------------------
+        | 6 | 7 ||  8 |    |
+        =====================
+        | 3 | 4 ||  5 |    |
+        ---------------------
+        | 0 | 1 ||  2 |    |
+        ---------------------
+              A   ||   B
         ```
 
         .. note:: Trivial except for parallel meshes
@@ -301,8 +368,14 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange((self.mesh.offset[2] + self.mesh.overlap['front']) * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.offset[2] + self.mesh.nz - self.mesh.overlap['back']) * self.mesh.nx * self.mesh.ny)
+        mesh = self.mesh
+        return self._blockIDs(mesh._globalShape,
+                              (mesh.offset[0] + mesh.overlap['left'],
+                               mesh.offset[1] + mesh.overlap['bottom'],
+                               mesh.offset[2] + mesh.overlap['front']),
+                              (mesh.offset[0] + mesh.nx - mesh.overlap['right'],
+                               mesh.offset[1] + mesh.ny - mesh.overlap['top'],
+                               mesh.offset[2] + mesh.nz - mesh.overlap['back']))
 
     @property
     def _globalOverlappingCellIDs(self):
@@ -312,9 +385,12 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-
-        return numerix.arange(self.mesh.offset[2] * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.offset[2] + self.mesh.nz) * self.mesh.nx * self.mesh.ny)
+        mesh = self.mesh
+        return self._blockIDs(mesh._globalShape,
+                              mesh.offset,
+                              (mesh.offset[0] + mesh.nx,
+                               mesh.offset[1] + mesh.ny,
+                               mesh.offset[2] + mesh.nz))
 
     @property
     def _localNonOverlappingCellIDs(self):
@@ -324,8 +400,14 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.overlap['front'] * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.nz - self.mesh.overlap['back']) * self.mesh.nx * self.mesh.ny)
+        mesh = self.mesh
+        return self._blockIDs((mesh.nx, mesh.ny, mesh.nz),
+                              (mesh.overlap['left'],
+                               mesh.overlap['bottom'],
+                               mesh.overlap['front']),
+                              (mesh.nx - mesh.overlap['right'],
+                               mesh.ny - mesh.overlap['top'],
+                               mesh.nz - mesh.overlap['back']))
 
     @property
     def _localOverlappingCellIDs(self):
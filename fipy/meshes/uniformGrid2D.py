@@ -66,6 +66,7 @@ class UniformGrid2D(UniformGrid):
          self.numberOfHorizontalRows,
          self.numberOfVerticalColumns,
          self.numberOfHorizontalFaces,
+         self._globalShape,
          self.numberOfVerticalFaces,
          self.origin) = builder.gridData
 
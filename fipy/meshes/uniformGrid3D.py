@@ -77,6 +77,7 @@ class UniformGrid3D(UniformGrid):
          self.numberOfHorizontalRows,
          self.numberOfVerticalColumns,
          self.numberOfLayers,
+         self._globalShape,
          self.origin) = builder.gridData
 
     """
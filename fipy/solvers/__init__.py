@@ -5,7 +5,9 @@ import os
 from fipy.tools.parser import _parseSolver
 
 from fipy.solvers.solver import *
+from fipy.solvers.preconditionerReuse import *
 __all__ = list(solver.__all__)
+__all__.extend(preconditionerReuse.__all__)
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
@@ -153,4 +155,15 @@ register_skipper(flag='NOT_PYAMGX_SOLVER',
                  test=lambda: solver != 'pyamgx',
                  why="the PyAMGX solver is being used.",
                  skipWarning=True)
+def _checkForPyAMG():
+    try:
+        import pyamg
+    except Exception:
+        return False
+    return True
+
+register_skipper(flag='PYAMG',
+                 test=_checkForPyAMG,
+                 why="the `pyamg` package cannot be imported",
+                 skipWarning=True)
 del register_skipper
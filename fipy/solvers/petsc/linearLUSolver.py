@@ -58,7 +58,10 @@ class LinearLUSolver(PETScSolver):
 
             ksp.solve(errorVector, xError)
             x -= xError
-            
+
+        self._iterations = iteration + 1
+        self._residual = errorVector.norm()
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
 #             L.view()
@@ -37,33 +37,77 @@ class PETScKrylovSolver(PETScSolver):
 
     """
       
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=None):
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None, preconditionerReuse=None):
         """
         :Parameters:
           - `tolerance`: The required error tolerance.
           - `iterations`: The maximum number of iterative steps to perform.
           - `precon`: Preconditioner to use (string). 
+          - `preconditionerReuse`: Policy for keeping the preconditioner
+            across solves (see
+            :class:`~fipy.solvers.preconditionerReuse.PreconditionerReuse`).
 
         """
         if self.__class__ is PETScKrylovSolver:
             raise NotImplementedError("can't instantiate abstract base class")
             
         PETScSolver.__init__(self, tolerance=tolerance,
-                             iterations=iterations, precon=precon)
+                             iterations=iterations, precon=precon,
+                             preconditionerReuse=preconditionerReuse)
 
-    def _solve_(self, L, x, b):
+    def _getKSP(self, L):
+        """The `KSP` of the previous solve, if `L` has the same layout
+
+        Creating a `KSP` and reading the options database every sweep
+        is expensive on many processors, so the `KSP` is only replaced
+        when the sizes of the matrix change.  Returns the `KSP` and
+        whether it is new.
+        """
+        layout = (L.getSizes(), L.comm.size)
+        ksp = getattr(self, "_ksp", None)
+        if ksp is not None and self._kspLayout == layout:
+            return ksp, False
+
+        if ksp is not None:
+            ksp.destroy()
         ksp = PETSc.KSP()
         ksp.create(L.comm)
         ksp.setType(self.solver)
         if self.preconditioner is not None:
             ksp.getPC().setType(self.preconditioner)
         ksp.setTolerances(rtol=self.tolerance, max_it=self.iterations)
+        # command-line options override the tolerances
+        ksp.setFromOptions()
+
+        self._ksp = ksp
+        self._kspLayout = layout
+        self._kspTolerances = (self.tolerance, self.iterations)
+        return ksp, True
+
+    def _solve_(self, L, x, b):
+        ksp, new = self._getKSP(L)
+        if self._kspTolerances != (self.tolerance, self.iterations):
+            ksp.setTolerances(rtol=self.tolerance, max_it=self.iterations)
+            self._kspTolerances = (self.tolerance, self.iterations)
         L.assemblyBegin()
         L.assemblyEnd()
+
+        reuse = self.preconditionerReuse
+        if reuse is not None:
+            rebuild = new or reuse._rebuildNeeded()
+            ksp.getPC().setReusePreconditioner(not rebuild)
+            if rebuild:
+                reuse._rebuilt()
+
         ksp.setOperators(L)
-        ksp.setFromOptions()
         ksp.solve(b, x)
 
+        if reuse is not None:
+            reuse._solved(iterations=ksp.its)
+
+        self._iterations = ksp.its
+        self._residual = ksp.norm
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
 #             L.view()
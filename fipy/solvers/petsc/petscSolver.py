@@ -4,6 +4,7 @@ from petsc4py import PETSc
 
 from fipy.solvers.solver import Solver
 from fipy.tools import numerix
+from fipy.tools import hooks
 
 class PETScSolver(Solver):
 
@@ -22,7 +23,17 @@ class PETScSolver(Solver):
         if not hasattr(self, 'globalVectors'):
             globalMatrix = self.matrix
 
-            overlappingVector = self.matrix._fipy2petscGhost(var=self.var)
+            # the ghosted vectors (and their scatters) are kept from
+            # one solve to the next for the same mesh and equations
+            layout = getattr(self, '_ghostLayout', (None, None))
+            if (layout[0] is self.var.mesh
+                and layout[1] == self.matrix.numberOfEquations):
+                overlappingVector, overlappingRHSvector = self._ghostVectors
+            else:
+                overlappingVector, overlappingRHSvector = None, None
+
+            overlappingVector = self.matrix._fipy2petscGhost(var=self.var,
+                                                             vec=overlappingVector)
 
             from fipy.variables.coupledCellVariable import _CoupledCellVariable
             if isinstance(self.RHSvector, _CoupledCellVariable):
@@ -30,7 +41,11 @@ class PETScSolver(Solver):
             else:
                 RHSvector = numerix.reshape(numerix.asarray(self.RHSvector), self.var.shape)
                 
-            overlappingRHSvector = self.matrix._fipy2petscGhost(var=RHSvector)
+            overlappingRHSvector = self.matrix._fipy2petscGhost(var=RHSvector,
+                                                                vec=overlappingRHSvector)
+
+            self._ghostLayout = (self.var.mesh, self.matrix.numberOfEquations)
+            self._ghostVectors = (overlappingVector, overlappingRHSvector)
 
             self.globalVectors = (globalMatrix, overlappingVector, overlappingRHSvector)
 
@@ -40,6 +55,7 @@ class PETScSolver(Solver):
         self.matrix.flush()
         del self.globalVectors
         
+    @hooks._timedSolve
     def _solve(self):
         from fipy.terms import SolutionVariableNumberError
         
@@ -0,0 +1,127 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+__all__ = ["PreconditionerReuse"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class PreconditionerReuse(object):
+    """
+    Policy for keeping a solver's preconditioner across solves.
+
+    Without a policy, solvers build a new preconditioner for every
+    solve.  With one, the preconditioner from a previous sweep or time
+    step is applied to the new matrix until
+
+    - it has been used for `maxReuse` solves, or
+    - a solve takes more than `iterationGrowth` times as many iterations
+      as the first solve with that preconditioner, or
+    - :meth:`refresh` is called (or the size of the system changes).
+
+    `PreconditionerReuse(maxReuse=1)` rebuilds for every solve, just as no
+    policy does, but counts the rebuilds.
+
+    >>> from fipy import Grid1D, CellVariable, DiffusionTerm
+    >>> from fipy.tools import numerix
+    >>> from fipy.solvers.scipy import LinearGMRESSolver
+    >>> from fipy.solvers.scipy.preconditioners import ILUPreconditioner
+    >>> mesh = Grid1D(nx=100)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(1., mesh.facesLeft)
+    >>> coeff = CellVariable(mesh=mesh, value=1.)
+    >>> eq = DiffusionTerm(coeff=coeff)
+    >>> reuse = PreconditionerReuse(maxReuse=3)
+    >>> solver = LinearGMRESSolver(precon=ILUPreconditioner(),
+    ...                            preconditionerReuse=reuse)
+    >>> for sweep in range(7):
+    ...     coeff.setValue(1. + sweep / 10.)
+    ...     eq.solve(var=var, solver=solver)
+    >>> print(reuse.solveCount, reuse.rebuildCount)
+    7 3
+    >>> print(numerix.allclose(var, 1.))
+    True
+
+    A rebuild can be requested at any time
+
+    >>> reuse.refresh()
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(reuse.rebuildCount)
+    4
+
+    When the iteration count grows, the preconditioner is rebuilt for
+    the next solve
+
+    >>> reuse = PreconditionerReuse(iterationGrowth=2.)
+    >>> reuse._rebuilt()
+    >>> reuse._solved(iterations=10)
+    >>> print(reuse._rebuildNeeded())
+    False
+    >>> reuse._solved(iterations=15)
+    >>> print(reuse._rebuildNeeded())
+    False
+    >>> reuse._solved(iterations=25)
+    >>> print(reuse._rebuildNeeded())
+    True
+    """
+
+    def __init__(self, maxReuse=None, iterationGrowth=None):
+        """
+        Parameters
+        ----------
+        maxReuse : int
+            Number of solves a preconditioner is used for before it is
+            rebuilt.  `None` for no limit.
+        iterationGrowth : float
+            Rebuild once a solve takes more than this multiple of the
+            iterations of the first solve with the current
+            preconditioner.  `None` to ignore the iteration count.
+        """
+        if maxReuse is not None and maxReuse < 1:
+            raise ValueError("maxReuse must be at least 1")
+
+        self.maxReuse = maxReuse
+        self.iterationGrowth = iterationGrowth
+        self.solveCount = 0
+        self.rebuildCount = 0
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the preconditioner for the next solve.
+        """
+        self._stale = True
+        self._uses = 0
+        self._baseline = None
+
+    def _rebuildNeeded(self):
+        return (self._stale
+                or (self.maxReuse is not None and self._uses >= self.maxReuse))
+
+    def _rebuilt(self):
+        self.rebuildCount += 1
+        self._stale = False
+        self._uses = 0
+        self._baseline = None
+
+    def _solved(self, iterations=None):
+        self.solveCount += 1
+        self._uses += 1
+
+        if self.iterationGrowth is not None and iterations is not None:
+            if self._baseline is None:
+                self._baseline = max(iterations, 1)
+            elif iterations > self.iterationGrowth * self._baseline:
+                self._stale = True
+
+    def __repr__(self):
+        return "%s(maxReuse=%s, iterationGrowth=%s)" % (self.__class__.__name__,
+                                                       self.maxReuse,
+                                                       self.iterationGrowth)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
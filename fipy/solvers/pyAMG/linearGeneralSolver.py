@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.scipy.preconditioners.smoothedAggregationPreconditioner import _refreshCoarseOperators
 from pyamg import solve
 import os
 from fipy.tools import numerix
@@ -13,6 +14,11 @@ class LinearGeneralSolver(_ScipySolver):
     The `LinearGeneralSolver` is an interface to the generic PyAMG,
     which solves the arbitrary system Ax=b with the best out-of-the box
     choice for a solver. See `pyAMG.solve` for details.
+
+    With a `preconditionerReuse` policy, the multigrid hierarchy chosen
+    for the first matrix is kept, and only its Galerkin coarse operators
+    are recomputed for each new matrix, until the policy asks for the
+    hierarchy to be set up again.
     """
 
     def _solve_(self, L, x, b):
@@ -21,4 +27,32 @@ class LinearGeneralSolver(_ScipySolver):
         else:
             verbosity = False
 
-        return solve(L.matrix, b, verb=verbosity, tol=self.tolerance)
+        reuse = self.preconditionerReuse
+        if reuse is None:
+            return solve(L.matrix, b, verb=verbosity, tol=self.tolerance)
+
+        from pyamg import smoothed_aggregation_solver, solver, solver_configuration
+
+        A = L.matrix.tocsr()
+        if (reuse._rebuildNeeded()
+            or getattr(self, "_hierarchyShape", None) != A.shape):
+            self._configuration = solver_configuration(A, verb=verbosity)
+            self._hierarchy = solver(A, self._configuration)
+            self._hierarchyShape = A.shape
+            reuse._rebuilt()
+        else:
+            _refreshCoarseOperators(self._hierarchy, A, self._configuration,
+                                    smoothed_aggregation_solver)
+
+        if self._configuration.get('symmetry') == 'hermitian':
+            accel = 'cg'
+        else:
+            accel = 'gmres'
+
+        residuals = []
+        x = self._hierarchy.solve(b, x0=x, tol=self.tolerance,
+                                  maxiter=self.iterations, accel=accel,
+                                  residuals=residuals)
+        reuse._solved(iterations=max(len(residuals) - 1, 0))
+
+        return x
@@ -7,6 +7,7 @@ import pyamgx
 from fipy.solvers.solver import Solver
 from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
 from fipy.tools import numerix
+from fipy.tools import hooks
 
 __all__ = ["PyAMGXSolver"]
 from future.utils import text_to_native_str
@@ -76,11 +77,13 @@ class PyAMGXSolver(Solver):
 
         # solve system on GPU
         self.solver.solve(self.b_gpu, self.x_gpu)
+        self._iterations = self.solver.iterations_number
 
         # download values from GPU to CPU
         self.x_gpu.download(x)
         return x
 
+    @hooks._timedSolve
     def _solve(self):
          if self.var.mesh.communicator.Nproc > 1:
              raise Exception("SciPy solvers cannot be used with multiple processors")
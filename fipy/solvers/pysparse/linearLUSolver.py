@@ -76,6 +76,9 @@ class LinearLUSolver(PysparseSolver):
             LU.solve(errorVector, xError)
             x[:] = x - xError
 
+        self._iterations = iteration + 1
+        self._residual = numerix.sqrt(numerix.sum(errorVector**2))
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
             PRINT('iterations: %d / %d' % (iteration+1, self.iterations))
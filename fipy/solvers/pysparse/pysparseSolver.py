@@ -3,6 +3,7 @@ __docformat__ = 'restructuredtext'
 
 import os
 from fipy.solvers.pysparseMatrixSolver import _PysparseMatrixSolver
+from fipy.tools import hooks
 
 __all__ = ["PysparseSolver"]
 from future.utils import text_to_native_str
@@ -47,6 +48,7 @@ class PysparseSolver(_PysparseMatrixSolver):
                                            self.iterations, P)
 
         self._raiseWarning(info, iter, relres)
+        self._iterations, self._residual = iter, relres
 
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
@@ -56,6 +58,7 @@ class PysparseSolver(_PysparseMatrixSolver):
                 PRINT('failure', self._warningList[info].__class__.__name__)
             PRINT('relres:', relres)
 
+    @hooks._timedSolve
     def _solve(self):
 
         if self.var.mesh.communicator.Nproc > 1:
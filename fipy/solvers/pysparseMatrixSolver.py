@@ -5,6 +5,7 @@ __all__ = []
 
 from fipy.solvers.solver import Solver
 from fipy.matrices.pysparseMatrix import _PysparseMeshMatrix
+from fipy.tools import hooks
 
 class _PysparseMatrixSolver(Solver):
 
@@ -28,6 +29,7 @@ class _PysparseMatrixSolver(Solver):
     def _matrixClass(self):
         return _PysparseMeshMatrix
 
+    @hooks._timedSolve
     def _solve(self):
         """
         Call `_solve_` for the new value of `self.var`.
@@ -14,7 +14,7 @@ class LinearBicgstabSolver(_ScipyKrylovSolver):
     Scipy, with no preconditioning by default.
     """
 
-    def __init__(self, tolerance=1e-15, iterations=2000, precon=None):
+    def __init__(self, tolerance=1e-15, iterations=2000, precon=None, preconditionerReuse=None):
         """
         Parameters
         ----------
@@ -24,7 +24,9 @@ class LinearBicgstabSolver(_ScipyKrylovSolver):
             Maximum number of iterative steps to perform.
         precon
             Preconditioner to use.
+        preconditionerReuse : ~fipy.solvers.preconditionerReuse.PreconditionerReuse
+            Policy for keeping the preconditioner across solves.
         """
 
-        super(LinearBicgstabSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+        super(LinearBicgstabSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon, preconditionerReuse=preconditionerReuse)
         self.solveFnc = bicgstab
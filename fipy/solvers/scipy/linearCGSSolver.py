@@ -15,7 +15,7 @@ class LinearCGSSolver(_ScipyKrylovSolver):
     with no preconditioning by default.
     """
 
-    def __init__(self, tolerance=1e-15, iterations=2000, precon=None):
+    def __init__(self, tolerance=1e-15, iterations=2000, precon=None, preconditionerReuse=None):
         """
         Parameters
         ----------
@@ -25,7 +25,9 @@ class LinearCGSSolver(_ScipyKrylovSolver):
             Maximum number of iterative steps to perform.
         precon
             Preconditioner to use.
+        preconditionerReuse : ~fipy.solvers.preconditionerReuse.PreconditionerReuse
+            Policy for keeping the preconditioner across solves.
         """
 
-        super(LinearCGSSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+        super(LinearCGSSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon, preconditionerReuse=preconditionerReuse)
         self.solveFnc = cgs
@@ -4,6 +4,8 @@ from builtins import range
 __docformat__ = 'restructuredtext'
 
 import os
+import hashlib
+from collections import OrderedDict
 
 from scipy.sparse.linalg import splu
 
@@ -19,8 +21,104 @@ class LinearLUSolver(_ScipySolver):
     The `LinearLUSolver` solves a linear system of equations using
     LU-factorization.  The `LinearLUSolver` is a wrapper class for the
     the Scipy `scipy.sparse.linalg.splu` module.
+
+    Factorizations are cached, keyed on the values and structure of the
+    matrix, so that solving repeatedly with an unchanged operator (e.g.,
+    constant coefficients and a fixed time step) only performs the
+    triangular solves.
+
+    >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm
+    >>> mesh = Grid1D(nx=10)
+    >>> var = CellVariable(mesh=mesh, value=0.)
+    >>> var.constrain(1., mesh.facesLeft)
+    >>> eq = TransientTerm() == DiffusionTerm()
+    >>> solver = LinearLUSolver()
+    >>> for step in range(3):
+    ...     eq.solve(var=var, dt=1., solver=solver)
+    >>> print(solver.factorizationCount)
+    1
+    >>> print(len(solver._factorizations))
+    1
+
+    Changing the operator requires a new factorization
+
+    >>> eq.solve(var=var, dt=2., solver=solver)
+    >>> print(solver.factorizationCount)
+    2
+
+    but the cache is bounded
+
+    >>> print(len(solver._factorizations))
+    1
+
+    and can be discarded explicitly
+
+    >>> solver.invalidateFactorizations()
+    >>> eq.solve(var=var, dt=2., solver=solver)
+    >>> print(solver.factorizationCount)
+    3
     """
 
+    def __init__(self, tolerance=1e-10, iterations=10, precon=None, maxFactorizations=1):
+        """
+        Parameters
+        ----------
+        tolerance : float
+            Required error tolerance.
+        iterations : int
+            Maximum number of iterative steps to perform.
+        precon
+            *ignored*
+        maxFactorizations : int
+            Maximum number of LU factorizations to retain for reuse.  The
+            least recently used factorization is discarded when this
+            number is exceeded.  Set to `0` to disable caching.
+        """
+        super(LinearLUSolver, self).__init__(tolerance=tolerance,
+                                             iterations=iterations,
+                                             precon=precon)
+        self.maxFactorizations = maxFactorizations
+        self.factorizationCount = 0
+        self._factorizations = OrderedDict()
+
+    def invalidateFactorizations(self):
+        """Discard all cached LU factorizations.
+        """
+        self._factorizations.clear()
+
+    @staticmethod
+    def _matrixKey(A):
+        key = hashlib.sha1()
+        key.update(numerix.array(A.shape).tobytes())
+        for arr in (A.indptr, A.indices, A.data):
+            key.update(numerix.ascontiguousarray(arr).tobytes())
+        return key.hexdigest()
+
+    def _factorize(self, A):
+        if self.maxFactorizations > 0:
+            key = self._matrixKey(A)
+            if key in self._factorizations:
+                indptr, indices, data, LU = self._factorizations[key]
+                if (numerix.array_equal(indptr, A.indptr)
+                    and numerix.array_equal(indices, A.indices)
+                    and numerix.array_equal(data, A.data)):
+                    self._factorizations[key] = self._factorizations.pop(key)
+                    return LU
+
+        LU = splu(A, diag_pivot_thresh=1.,
+                     relax=1,
+                     panel_size=10,
+                     permc_spec=3)
+        self.factorizationCount += 1
+
+        if self.maxFactorizations > 0:
+            self._factorizations[key] = (A.indptr.copy(), A.indices.copy(),
+                                         A.data.copy(), LU)
+            while len(self._factorizations) > self.maxFactorizations:
+                self._factorizations.popitem(last=False)
+
+        return LU
+
     def _solve_(self, L, x, b):
         diag = L.takeDiagonal()
         maxdiag = max(numerix.absolute(diag))
@@ -28,10 +126,7 @@ class LinearLUSolver(_ScipySolver):
         L = L * (1 / maxdiag)
         b = b * (1 / maxdiag)
 
-        LU = splu(L.matrix.asformat("csc"), diag_pivot_thresh=1.,
-                                            relax=1,
-                                            panel_size=10,
-                                            permc_spec=3)
+        LU = self._factorize(L.matrix.asformat("csc"))
 
         error0 = numerix.sqrt(numerix.sum((L * x - b)**2))
 
@@ -44,9 +139,19 @@ class LinearLUSolver(_ScipySolver):
             xError = LU.solve(errorVector)
             x[:] = x - xError
 
+        self._iterations = iteration + 1
+        self._residual = numerix.sqrt(numerix.sum(errorVector**2))
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
             PRINT('iterations: %d / %d' % (iteration+1, self.iterations))
             PRINT('residual:', numerix.sqrt(numerix.sum(errorVector**2)))
 
         return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,38 @@
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+from scipy.sparse.linalg import LinearOperator, spilu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+
+__all__ = ["ILUPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class ILUPreconditioner(Preconditioner):
+    """
+    Incomplete LU preconditioner for the SciPy solvers.
+    Really just a wrapper for `scipy.sparse.linalg.spilu`.
+    """
+
+    def __init__(self, dropTolerance=1e-4, fillFactor=10., drift=0.):
+        """
+        Parameters
+        ----------
+        dropTolerance : float
+            Entries of the factors smaller than this (relative to the
+            matrix) are discarded.
+        fillFactor : float
+            Upper bound on the ratio of the number of entries in the
+            factors to the number of entries in the matrix.
+        drift : float
+            Largest relative change in the matrix for which the
+            preconditioner is reused.  `None` rebuilds for every solve.
+        """
+        super(ILUPreconditioner, self).__init__(drift=drift)
+        self.dropTolerance = dropTolerance
+        self.fillFactor = fillFactor
+
+    def _build(self, A):
+        ILU = spilu(A.tocsc(), drop_tol=self.dropTolerance, fill_factor=self.fillFactor)
+        return LinearOperator(A.shape, matvec=ILU.solve, dtype=A.dtype)
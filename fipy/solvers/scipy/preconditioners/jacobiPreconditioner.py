@@ -0,0 +1,21 @@
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+import scipy.sparse as sp
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["JacobiPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class JacobiPreconditioner(Preconditioner):
+    """
+    Jacobi (diagonal) preconditioner for the SciPy solvers.
+    """
+
+    def _build(self, A):
+        diagonal = A.diagonal()
+        diagonal = numerix.where(diagonal == 0, 1., diagonal)
+        return sp.diags(1. / diagonal, format="csr")
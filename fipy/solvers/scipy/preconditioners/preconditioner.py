@@ -0,0 +1,135 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+from fipy.tools import numerix
+
+__all__ = ["Preconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class Preconditioner(object):
+    """
+    Base preconditioner class for the SciPy solvers
+
+    A preconditioner is only rebuilt when the matrix it is applied to
+    has drifted from the matrix it was last built for.  The drift is the
+    relative change in the Frobenius norm of the matrix values; a change
+    in the sparsity pattern or shape always forces a rebuild.
+
+    >>> from fipy import Grid1D, CellVariable, DiffusionTerm
+    >>> from fipy.solvers.scipy import LinearGMRESSolver
+    >>> from fipy.solvers.scipy.preconditioners import JacobiPreconditioner
+    >>> mesh = Grid1D(nx=10)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(1., mesh.facesLeft)
+    >>> coeff = CellVariable(mesh=mesh, value=1.)
+    >>> eq = DiffusionTerm(coeff=coeff)
+
+    With the default `drift` of `0`, the preconditioner is reused only
+    while the matrix is unchanged
+
+    >>> precon = JacobiPreconditioner()
+    >>> solver = LinearGMRESSolver(precon=precon)
+    >>> for sweep in range(3):
+    ...     eq.solve(var=var, solver=solver)
+    >>> print(precon.buildCount)
+    1
+    >>> coeff.setValue(1.01)
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(precon.buildCount)
+    2
+
+    A tolerated `drift` keeps it across small changes in the matrix
+
+    >>> precon = JacobiPreconditioner(drift=0.1)
+    >>> solver = LinearGMRESSolver(precon=precon)
+    >>> eq.solve(var=var, solver=solver)
+    >>> coeff.setValue(1.02)
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(precon.buildCount)
+    1
+    >>> coeff.setValue(2.)
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(precon.buildCount)
+    2
+
+    and a rebuild can always be requested
+
+    >>> precon.refresh()
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(precon.buildCount)
+    3
+    >>> print(numerix.allclose(var, 1.))
+    True
+
+    .. attention:: This class is abstract. Always create one of its subclasses.
+    """
+
+    def __init__(self, drift=0.):
+        """
+        Create a `Preconditioner` object.
+
+        Parameters
+        ----------
+        drift : float
+            Largest relative change in the matrix for which the
+            preconditioner built for a previous matrix is reused.  Set to
+            `None` to rebuild the preconditioner for every solve.
+        """
+        if self.__class__ is Preconditioner:
+            raise NotImplementedError("can't instantiate abstract base class")
+
+        self.drift = drift
+        self.buildCount = 0
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the preconditioner the next time it is applied.
+        """
+        self._reference = None
+        self._preconditioner = None
+
+    def _drifted(self, A):
+        if self.drift is None or self._reference is None:
+            return True
+
+        shape, indptr, indices, data, norm = self._reference
+
+        if (A.shape != shape
+            or not (A.indptr is indptr or numerix.array_equal(A.indptr, indptr))
+            or not (A.indices is indices or numerix.array_equal(A.indices, indices))):
+            return True
+
+        change = numerix.sqrt(numerix.sum(abs(A.data - data)**2))
+
+        return change > self.drift * norm
+
+    def _applyToMatrix(self, A):
+        """
+        Returns the preconditioner `M` for the `scipy.sparse` matrix `A`,
+        suitable for the `M` argument of the `scipy.sparse.linalg` solvers.
+        """
+        A = A.tocsr()
+        if self._drifted(A):
+            self._preconditioner = self._build(A)
+            self.buildCount += 1
+            if self.drift is not None:
+                self._reference = (A.shape, A.indptr.copy(), A.indices.copy(), A.data.copy(),
+                                   numerix.sqrt(numerix.sum(abs(A.data)**2)))
+
+        return self._preconditioner
+
+    def _build(self, A):
+        """
+        Returns a new preconditioner for the CSR matrix `A`.
+        """
+        raise NotImplementedError
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,150 @@
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+
+__all__ = ["SmoothedAggregationPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class SmoothedAggregationPreconditioner(Preconditioner):
+    """
+    Smoothed aggregation algebraic multigrid preconditioner for the SciPy
+    solvers.  Requires :term:`PyAMG`.
+
+    Setting up the multigrid hierarchy usually costs several times as
+    much as the solve it preconditions.  On a fixed mesh, the aggregates
+    and interpolation operators change little from one time step to the
+    next, so with `keepHierarchy`, a solver with a
+    :class:`~fipy.solvers.preconditionerReuse.PreconditionerReuse`
+    policy only recomputes the Galerkin coarse operators from each new
+    matrix, and sets up the full hierarchy again when the policy asks
+    for it, e.g., once the iteration count has grown.
+
+    >>> from fipy import Grid2D, CellVariable, DiffusionTerm, TransientTerm
+    >>> from fipy.solvers import PreconditionerReuse
+    >>> from fipy.solvers.scipy import LinearPCGSolver
+    >>> mesh = Grid2D(nx=40, ny=40)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(1., mesh.facesLeft)
+    >>> coeff = CellVariable(mesh=mesh, value=1.)
+    >>> eq = TransientTerm() == DiffusionTerm(coeff=coeff)
+    >>> precon = SmoothedAggregationPreconditioner(keepHierarchy=True) # doctest: +PYAMG
+    >>> reuse = PreconditionerReuse(iterationGrowth=3.)
+    >>> solver = LinearPCGSolver(tolerance=1e-10, precon=precon,
+    ...                          preconditionerReuse=reuse) # doctest: +PYAMG
+    >>> for step in range(5):
+    ...     coeff.setValue(1. + step / 10.)
+    ...     eq.solve(var=var, dt=10., solver=solver) # doctest: +PYAMG
+    >>> print(precon.buildCount, precon.updateCount) # doctest: +PYAMG
+    1 4
+
+    The result is the same as with a hierarchy set up for every matrix
+
+    >>> var2 = CellVariable(mesh=mesh)
+    >>> var2.constrain(1., mesh.facesLeft)
+    >>> eq2 = TransientTerm() == DiffusionTerm(coeff=coeff)
+    >>> for step in range(5):
+    ...     coeff.setValue(1. + step / 10.)
+    ...     eq2.solve(var=var2, dt=10.,
+    ...               solver=LinearPCGSolver(tolerance=1e-10,
+    ...                                      precon=SmoothedAggregationPreconditioner())) # doctest: +PYAMG
+    >>> from fipy.tools import numerix
+    >>> print(numerix.allclose(var, var2, rtol=1e-6, atol=1e-6)) # doctest: +PYAMG
+    True
+    """
+
+    def __init__(self, cycle="V", drift=0., keepHierarchy=False, **kwargs):
+        """
+        Parameters
+        ----------
+        cycle : {"V", "W", "F"}
+            Multigrid cycle applied by the preconditioner.
+        drift : float
+            Largest relative change in the matrix for which the
+            multigrid hierarchy is reused.  `None` rebuilds for every solve.
+        keepHierarchy : bool
+            When the solver's `preconditionerReuse` policy keeps the
+            preconditioner for a new matrix, keep only the aggregates,
+            prolongators and restrictors, and recompute the coarse
+            operators, smoothers and coarse solver from the new matrix.
+            Otherwise, the multigrid cycle of the old matrix is applied
+            unchanged.
+        **kwargs
+            Passed to `pyamg.smoothed_aggregation_solver`.
+        """
+        super(SmoothedAggregationPreconditioner, self).__init__(drift=drift)
+        self.cycle = cycle
+        self.keepHierarchy = keepHierarchy
+        self.options = kwargs
+        self.updateCount = 0
+
+    def refresh(self):
+        super(SmoothedAggregationPreconditioner, self).refresh()
+        self._hierarchy = None
+
+    def _build(self, A):
+        from pyamg import smoothed_aggregation_solver
+
+        self._hierarchy = smoothed_aggregation_solver(A, **self.options)
+        return self._hierarchy.aspreconditioner(cycle=self.cycle)
+
+    def _update(self, A):
+        """
+        Returns the preconditioner `M` for the `scipy.sparse` matrix `A`,
+        when the solver keeps the preconditioner built for another matrix.
+        """
+        if self.keepHierarchy and self._hierarchy is not None:
+            from pyamg import smoothed_aggregation_solver
+
+            _refreshCoarseOperators(self._hierarchy, A.tocsr(),
+                                    self.options, smoothed_aggregation_solver)
+            self.updateCount += 1
+
+        return self._preconditioner
+
+def _refreshCoarseOperators(ml, A, options, setup):
+    """Recompute the Galerkin coarse operators of a PyAMG hierarchy in place
+
+    Parameters
+    ----------
+    ml : pyamg.multilevel.MultilevelSolver
+        Hierarchy to refresh.
+    A : scipy.sparse.csr_matrix
+        New finest level matrix, of the same shape as the old one.
+    options : dict
+        Keyword arguments that `ml` was set up with.
+    setup : function
+        PyAMG function that `ml` was set up with, for the default
+        smoothers.
+    """
+    import inspect
+    from pyamg.relaxation.smoothing import change_smoothers
+
+    def option(name):
+        if name in options:
+            return options[name]
+        else:
+            return inspect.signature(setup).parameters[name].default
+
+    ml.levels[0].A = A
+    for fine, coarse in zip(ml.levels[:-1], ml.levels[1:]):
+        coarse.A = (fine.R * fine.A * fine.P).tocsr()
+        coarse.A.sort_indices()
+
+    for level in ml.levels:
+        # drop other formats of the old matrix, cached by the smoothers
+        for name in [name for name in vars(level)
+                     if name[:1] == "A" and name[1:4] in ("csr", "csc", "bsr")]:
+            delattr(level, name)
+
+    change_smoothers(ml, option("presmoother"), option("postsmoother"))
+    # forget the factorization of the old coarsest matrix
+    vars(ml.coarse_solver).clear()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
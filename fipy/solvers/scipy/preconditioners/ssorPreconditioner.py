@@ -0,0 +1,75 @@
+from __future__ import division
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, splu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["SSORPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class SSORPreconditioner(Preconditioner):
+    r"""
+    Symmetric successive over-relaxation preconditioner for the SciPy solvers.
+
+    For :math:`\mathsf{A} = \mathsf{L} + \mathsf{D} + \mathsf{U}`, applies
+
+    .. math::
+
+       \mathsf{M}^{-1} = \omega (2 - \omega)
+       (\mathsf{D} + \omega \mathsf{U})^{-1} \mathsf{D}
+       (\mathsf{D} + \omega \mathsf{L})^{-1}
+
+    The triangular factors are handed to SuperLU without reordering, so
+    their "factorization" involves no fill.
+
+    >>> import scipy.sparse as sp
+    >>> A = sp.csr_matrix([[4., -1., 0.], [-1., 4., -1.], [0., -1., 4.]])
+    >>> M = SSORPreconditioner(omega=1.)._applyToMatrix(A)
+    >>> D = sp.diags(A.diagonal())
+    >>> L, U = sp.tril(A, -1), sp.triu(A, 1)
+    >>> P = (D + L).dot(sp.diags(1. / A.diagonal())).dot(D + U).toarray()
+    >>> print(numerix.allclose(M.matvec(P.dot([1., 2., 3.])), [1., 2., 3.]))
+    True
+    """
+
+    def __init__(self, omega=1., drift=0.):
+        """
+        Parameters
+        ----------
+        omega : float
+            Relaxation factor, between 0 and 2.
+        drift : float
+            Largest relative change in the matrix for which the
+            preconditioner is reused.  `None` rebuilds for every solve.
+        """
+        super(SSORPreconditioner, self).__init__(drift=drift)
+        self.omega = omega
+
+    def _build(self, A):
+        omega = self.omega
+        diagonal = A.diagonal()
+        diagonal = numerix.where(diagonal == 0, 1., diagonal)
+        D = sp.diags(diagonal)
+
+        lower = splu((D + omega * sp.tril(A, -1)).tocsc(),
+                     permc_spec="NATURAL", diag_pivot_thresh=0.)
+        upper = splu((D + omega * sp.triu(A, 1)).tocsc(),
+                     permc_spec="NATURAL", diag_pivot_thresh=0.)
+        scale = omega * (2 - omega)
+
+        def matvec(b):
+            return scale * upper.solve(diagonal * lower.solve(numerix.ravel(b)))
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
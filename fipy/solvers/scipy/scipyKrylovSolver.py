@@ -6,6 +6,8 @@ __all__ = []
 import os
 
 from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.tools import numerix
+from fipy.tools import hooks
 
 class _ScipyKrylovSolver(_ScipySolver):
     """
@@ -14,18 +16,59 @@ class _ScipyKrylovSolver(_ScipySolver):
     .. attention:: This class is abstract. Always create one of its subclasses.
     """
 
+    # additional arguments to `solveFnc` when counting iterations
+    _callbackOptions = {}
+
+    def _applyPreconditioner(self, A):
+        reuse = self.preconditionerReuse
+        if reuse is None:
+            return self.preconditioner._applyToMatrix(A)
+
+        if (reuse._rebuildNeeded()
+            or getattr(self, "_preconditionerShape", None) != A.shape):
+            if hasattr(self.preconditioner, "refresh"):
+                # the policy overrides the preconditioner's own reuse
+                self.preconditioner.refresh()
+            self._preconditionerM = self.preconditioner._applyToMatrix(A)
+            self._preconditionerShape = A.shape
+            reuse._rebuilt()
+        elif hasattr(self.preconditioner, "_update"):
+            # the preconditioner may refresh what is cheap to recompute
+            self._preconditionerM = self.preconditioner._update(A)
+
+        return self._preconditionerM
+
     def _solve_(self, L, x, b):
         A = L.matrix
         if self.preconditioner is None:
             M = None
         else:
-            M = self.preconditioner._applyToMatrix(A)
+            M = self._applyPreconditioner(A)
+
+        reuse = self.preconditionerReuse if self.preconditioner is not None else None
+
+        kwargs = {}
+        if hooks._hooks or reuse is not None:
+            iterations = [0]
+            def count(xk):
+                iterations[0] += 1
+            kwargs["callback"] = count
+            kwargs.update(self._callbackOptions)
 
         x, info = self.solveFnc(A, b, x,
                                 tol=self.tolerance,
                                 maxiter=self.iterations,
                                 M=M,
-                                atol='legacy')
+                                atol='legacy',
+                                **kwargs)
+
+        if "callback" in kwargs:
+            if reuse is not None:
+                reuse._solved(iterations=iterations[0])
+
+            if hooks._hooks:
+                self._iterations = iterations[0]
+                self._residual = numerix.L2norm(A * x - b)
 
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             if info < 0:
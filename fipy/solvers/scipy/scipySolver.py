@@ -6,6 +6,7 @@ __all__ = []
 from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
 from fipy.solvers.solver import Solver
 from fipy.tools import numerix
+from fipy.tools import hooks
 
 class _ScipySolver(Solver):
     """
@@ -18,6 +19,7 @@ class _ScipySolver(Solver):
     def _matrixClass(self):
         return _ScipyMeshMatrix
 
+    @hooks._timedSolve
     def _solve(self):
 
          if self.var.mesh.communicator.Nproc > 1:
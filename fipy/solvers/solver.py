@@ -18,6 +18,7 @@ from builtins import str
 __docformat__ = 'restructuredtext'
 
 from fipy.tools import numerix
+from fipy.tools import hooks
 
 __all__ = ["SolverConvergenceWarning", "MaximumIterationWarning",
            "PreconditionerWarning", "IllConditionedPreconditionerWarning",
@@ -69,7 +70,12 @@ class Solver(object):
     .. attention:: This class is abstract. Always create one of its subclasses.
     """
 
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=None):
+    # convergence of the most recent solution, recorded by `_solve_` for
+    # the hooks of `fipy.tools.hooks`, where the solver suite reports it
+    _iterations = None
+    _residual = None
+
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None, preconditionerReuse=None):
         """
         Create a `Solver` object.
 
@@ -82,6 +88,9 @@ class Solver(object):
         precon
             Preconditioner to use.  Not all solver suites support
             preconditioners.
+        preconditionerReuse : ~fipy.solvers.preconditionerReuse.PreconditionerReuse
+            Policy for keeping the preconditioner across solves.  If
+            `None`, the preconditioner is rebuilt for every solve.
         """
         if self.__class__ is Solver:
             raise NotImplementedError("can't instantiate abstract base class")
@@ -90,6 +99,7 @@ class Solver(object):
         self.iterations = iterations
 
         self.preconditioner = precon
+        self.preconditionerReuse = preconditionerReuse
 
     def _storeMatrix(self, var, matrix, RHSvector):
         self.var = var
@@ -163,4 +173,5 @@ class Solver(object):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        pass
+        if hooks._hooks:
+            hooks.emit("exit", solver=self)
@@ -1,12 +1,23 @@
 from __future__ import unicode_literals
 __all__ = []
 
-from fipy.tests.lateImportTest import _LateImportTestSuite
+from fipy.tests.doctestPlus import _LateImportDocTestSuite
 import fipy.tests.testProgram
+from fipy.solvers import solver
+
+if solver in ('scipy', 'pyamg'):
+    docTestModuleNames = ('preconditionerReuse',
+                          'scipy.linearLUSolver',
+                          'scipy.preconditioners.preconditioner',
+                          'scipy.preconditioners.ssorPreconditioner',
+                          'scipy.preconditioners.smoothedAggregationPreconditioner')
+elif solver == 'trilinos':
+    docTestModuleNames = ('trilinos.trilinosAztecOOSolver',)
+else:
+    docTestModuleNames = ()
 
 def _suite():
-    return _LateImportTestSuite(testModuleNames = (),
-                                base = __name__)
+    return _LateImportDocTestSuite(docTestModuleNames=docTestModuleNames, base=__name__)
 
 if __name__ == '__main__':
     fipy.tests.testProgram.main(defaultTest='_suite')
@@ -50,6 +50,15 @@ class ParallelEpetraCommWrapper(EpetraCommWrapper):
         """
         return self.mpi4py_comm.allgather(sendobj=obj)
 
+    def gather(self, obj, root=0):
+        """mpi4py `gather`
+
+        Communicates copies of each `obj` to `root` only, where it
+        returns a rank-dimensional list of them.  Returns `None` on the
+        other ranks.
+        """
+        return self.mpi4py_comm.gather(sendobj=obj, root=root)
+
     def MaxAll(self, obj):
         """return max across all processes
         """
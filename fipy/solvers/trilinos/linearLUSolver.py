@@ -73,6 +73,9 @@ class LinearLUSolver(TrilinosSolver):
 
              x[:] = x - xError
 
+        self._iterations = iteration + 1
+        self._residual = errorVector.Norm2()
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
             PRINT('iterations: %d / %d' % (iteration + 1, self.iterations))
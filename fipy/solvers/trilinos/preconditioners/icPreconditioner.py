@@ -17,7 +17,7 @@ class ICPreconditioner(Preconditioner):
 
     def _applyToSolver(self, solver, matrix):
         Factory = IFPACK.Factory()
-        Prec = Factory.Create(text_to_native_str("IC"), matrix)
-        Prec.Initialize()
-        Prec.Compute()
-        solver.SetPrecOperator(Prec)
+        self.Prec = Factory.Create(text_to_native_str("IC"), matrix)
+        self.Prec.Initialize()
+        self.Prec.Compute()
+        solver.SetPrecOperator(self.Prec)
@@ -20,7 +20,7 @@ class TrilinosAztecOOSolver(TrilinosSolver):
 
     """
 
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=JacobiPreconditioner()):
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=JacobiPreconditioner(), preconditionerReuse=None):
         """
         Parameters
         ----------
@@ -29,14 +29,76 @@ class TrilinosAztecOOSolver(TrilinosSolver):
         iterations : int
             Maximum number of iterative steps to perform.
         precon : ~fipy.solvers.trilinos.preconditioners.preconditioner.Preconditioner
+        preconditionerReuse : ~fipy.solvers.preconditionerReuse.PreconditionerReuse
+            Policy for keeping the preconditioner across solves.
+            Preconditioners that only set AztecOO options, like
+            `JacobiPreconditioner`, are built by AztecOO for every
+            solve, so they are not kept or counted as rebuilds.
         """
         if self.__class__ is TrilinosAztecOOSolver:
             raise NotImplementedError("can't instantiate abstract base class")
 
         TrilinosSolver.__init__(self, tolerance=tolerance,
-                                iterations=iterations, precon=None)
+                                iterations=iterations, precon=None,
+                                preconditionerReuse=preconditionerReuse)
         self.preconditioner = precon
 
+    def _applyPreconditioner(self, solver, L):
+        """
+        Only preconditioners that build an operator in `Prec` are kept
+
+        >>> from fipy.solvers.preconditionerReuse import PreconditionerReuse
+        >>> from fipy.solvers.trilinos.linearGMRESSolver import LinearGMRESSolver
+        >>> class _OptionsOnly(object):
+        ...     applied = 0
+        ...     def _applyToSolver(self, solver, matrix):
+        ...         self.applied += 1
+        >>> class _Operator(_OptionsOnly):
+        ...     def _applyToSolver(self, solver, matrix):
+        ...         _OptionsOnly._applyToSolver(self, solver, matrix)
+        ...         self.Prec = object()
+        >>> class _AztecOO(object):
+        ...     def SetPrecOperator(self, prec):
+        ...         self.prec = prec
+        >>> class _Matrix(object):
+        ...     def NumGlobalRows(self):
+        ...         return 3
+        ...     def NumGlobalCols(self):
+        ...         return 3
+        >>> for precon in (_OptionsOnly(), _Operator()):
+        ...     reuse = PreconditionerReuse()
+        ...     gmres = LinearGMRESSolver(precon=precon, preconditionerReuse=reuse)
+        ...     for solve in range(3):
+        ...         gmres._applyPreconditioner(solver=_AztecOO(), L=_Matrix())
+        ...         reuse._solved(iterations=10)
+        ...     print(precon.applied, reuse.rebuildCount)
+        3 0
+        1 1
+        """
+        reuse = self.preconditionerReuse
+        if reuse is None:
+            self.preconditioner._applyToSolver(solver=solver, matrix=L)
+            return
+
+        if (reuse._rebuildNeeded()
+            or getattr(self, "_preconditionerPrec", None) is None
+            or self._preconditionerShape != (L.NumGlobalRows(), L.NumGlobalCols())):
+            self.preconditioner._applyToSolver(solver=solver, matrix=L)
+            prec = getattr(self.preconditioner, 'Prec', None)
+            if prec is None:
+                # only AztecOO options were set, and AztecOO builds
+                # the preconditioner they describe for every solve
+                self._preconditionerPrec = None
+                return
+            # preconditioners may be shared between solvers, so hold on
+            # to what was built (and to the matrix it refers to) here
+            self._preconditionerPrec = prec
+            self._preconditionerMatrix = L
+            self._preconditionerShape = (L.NumGlobalRows(), L.NumGlobalCols())
+            reuse._rebuilt()
+        else:
+            solver.SetPrecOperator(self._preconditionerPrec)
+
     def _solve_(self, L, x, b):
 
         Solver = AztecOO.AztecOO(L, x, b)
@@ -47,12 +109,18 @@ class TrilinosAztecOOSolver(TrilinosSolver):
         Solver.SetAztecOption(AztecOO.AZ_output, AztecOO.AZ_none)
 
         if self.preconditioner is not None:
-            self.preconditioner._applyToSolver(solver=Solver, matrix=L)
+            self._applyPreconditioner(solver=Solver, L=L)
         else:
             Solver.SetAztecOption(AztecOO.AZ_precond, AztecOO.AZ_none)
 
         output = Solver.Iterate(self.iterations, self.tolerance)
 
+        self._iterations = Solver.NumIters()
+        self._residual = Solver.TrueResidual()
+
+        if self.preconditioner is not None and self.preconditionerReuse is not None:
+            self.preconditionerReuse._solved(iterations=self._iterations)
+
         if self.preconditioner is not None:
             if hasattr(self.preconditioner, 'Prec'):
                 del self.preconditioner.Prec
@@ -78,3 +146,10 @@ class TrilinosAztecOOSolver(TrilinosSolver):
             PRINT('AztecOO.AZ_Aztec_version:', status[AztecOO.AZ_Aztec_version])
 
         return output
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -6,6 +6,7 @@ from PyTrilinos import EpetraExt
 
 from fipy.solvers.solver import Solver
 from fipy.tools import numerix
+from fipy.tools import hooks
 
 class TrilinosSolver(Solver):
 
@@ -68,6 +69,7 @@ class TrilinosSolver(Solver):
         self.matrix.flush()
         del self.globalVectors
 
+    @hooks._timedSolve
     def _solve(self):
         from fipy.terms import SolutionVariableNumberError
 
@@ -83,8 +85,7 @@ class TrilinosSolver(Solver):
                      nonOverlappingRHSvector)
 
         overlappingVector.Import(nonOverlappingVector,
-                                 Epetra.Import(globalMatrix.colMap,
-                                               globalMatrix.domainMap),
+                                 globalMatrix._importer,
                                  Epetra.Insert)
 
         self.var.value = numerix.reshape(numerix.array(overlappingVector), self.var.shape)
@@ -106,8 +107,7 @@ class TrilinosSolver(Solver):
 
             overlappingResidual = Epetra.Vector(globalMatrix.colMap)
             overlappingResidual.Import(residual,
-                                       Epetra.Import(globalMatrix.colMap,
-                                                     globalMatrix.domainMap),
+                                       globalMatrix._importer,
                                        Epetra.Insert)
 
             return overlappingResidual
@@ -163,6 +163,30 @@ class _AbstractConvectionTerm(FaceTerm):
 
         mesh = var.mesh
 
+        self.__calcConstraints(var, transientGeomCoeff, diffusionGeomCoeff)
+
+        ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+        L.addAt(numerix.array(self.constraintL).ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
+        b += numerix.reshape(self.constraintB.value, ids.shape).sum(0).ravel()
+
+        return (var, L, b)
+
+    def _buildDiagonal(self, var, dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        system = FaceTerm._buildDiagonal(self, var, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+
+        if system is None:
+            return None
+
+        diagonal, b = system
+
+        self.__calcConstraints(var, transientGeomCoeff, diffusionGeomCoeff)
+
+        return (diagonal + numerix.array(self.constraintL).ravel(),
+                b + numerix.array(self.constraintB).ravel())
+
+    def __calcConstraints(self, var, transientGeomCoeff, diffusionGeomCoeff):
+        mesh = var.mesh
+
         if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
 
             weight = self._getWeight(var, transientGeomCoeff, diffusionGeomCoeff)
@@ -187,14 +211,6 @@ class _AbstractConvectionTerm(FaceTerm):
                 (alpha_constraint - 1) * var.arithmeticFaceValue + (alpha - 1)  * dvar * var.faceGrad.constraintMask
             )
 
-
-        ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
-        L.addAt(numerix.array(self.constraintL).ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
-        b += numerix.reshape(self.constraintB.value, ids.shape).sum(0).ravel()
-
-        return (var, L, b)
-
-
     def _test(self):
         """Test cases for convection with constraints.
 
@@ -9,6 +9,7 @@ import os
 from fipy import input
 from fipy.terms.unaryTerm import _UnaryTerm
 from fipy.tools import numerix
+from fipy.tools import vector
 from fipy.terms import TermMultiplyError
 from fipy.terms import AbstractBaseClassError
 from fipy.variables.faceVariable import FaceVariable
@@ -289,40 +290,100 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
         if self.order == 2:
 
-            if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
+            self.__calcConstraints(var)
 
-                normals = FaceVariable(mesh=mesh, rank=1, value=mesh._orientedFaceNormals)
+            ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+            L.addAt(self.constraintL.ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
+            b += numerix.reshape(self.constraintB.ravel(), ids.shape).sum(-2).ravel()
+
+        return (var, L, b)
+
+    def __calcConstraints(self, var):
+        mesh = var.mesh
 
-                if len(var.shape) == 1 and len(self.nthCoeff.shape) > 1:
-                    nthCoeffFaceGrad = var.faceGrad.dot(self.nthCoeff)
-                    normalsNthCoeff =  normals.dot(self.nthCoeff)
+        if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
+
+            normals = FaceVariable(mesh=mesh, rank=1, value=mesh._orientedFaceNormals)
+
+            if len(var.shape) == 1 and len(self.nthCoeff.shape) > 1:
+                nthCoeffFaceGrad = var.faceGrad.dot(self.nthCoeff)
+                normalsNthCoeff =  normals.dot(self.nthCoeff)
+            else:
+
+                if self.nthCoeff.shape != () and not isinstance(self.nthCoeff, FaceVariable):
+                    coeff = self.nthCoeff[..., numerix.newaxis]
                 else:
+                    coeff = self.nthCoeff
 
-                    if self.nthCoeff.shape != () and not isinstance(self.nthCoeff, FaceVariable):
-                        coeff = self.nthCoeff[..., numerix.newaxis]
-                    else:
-                        coeff = self.nthCoeff
+                nthCoeffFaceGrad = coeff[numerix.newaxis] * var.faceGrad[:, numerix.newaxis]
+                s = (slice(0, None, None),) + (numerix.newaxis,) * (len(coeff.shape) - 1) + (slice(0, None, None),)
+                normalsNthCoeff = coeff[numerix.newaxis] * normals[s]
 
-                    nthCoeffFaceGrad = coeff[numerix.newaxis] * var.faceGrad[:, numerix.newaxis]
-                    s = (slice(0, None, None),) + (numerix.newaxis,) * (len(coeff.shape) - 1) + (slice(0, None, None),)
-                    normalsNthCoeff = coeff[numerix.newaxis] * normals[s]
+            self.constraintB = -(var.faceGrad.constraintMask * nthCoeffFaceGrad).divergence * mesh.cellVolumes
 
-                self.constraintB = -(var.faceGrad.constraintMask * nthCoeffFaceGrad).divergence * mesh.cellVolumes
+            constrainedNormalsDotCoeffOverdAP = var.arithmeticFaceValue.constraintMask * \
+                                                normalsNthCoeff / mesh._cellDistances
 
-                constrainedNormalsDotCoeffOverdAP = var.arithmeticFaceValue.constraintMask * \
-                                                    normalsNthCoeff / mesh._cellDistances
+            self.constraintB -= (constrainedNormalsDotCoeffOverdAP * var.arithmeticFaceValue).divergence * mesh.cellVolumes
 
-                self.constraintB -= (constrainedNormalsDotCoeffOverdAP * var.arithmeticFaceValue).divergence * mesh.cellVolumes
+            self.constraintL = -constrainedNormalsDotCoeffOverdAP.divergence * mesh.cellVolumes
 
-                ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+    def _explicitRHSvector(self, var, value):
+        """Matrix-free `b - L * value` for the system `_buildMatrix()` would
+        assemble for `var` without boundary conditions.
 
-                self.constraintL = -constrainedNormalsDotCoeffOverdAP.divergence * mesh.cellVolumes
+        Returns `None` for higher-order terms.
+        """
+        if self.order != 2:
+            return None
 
-            ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
-            L.addAt(self.constraintL.ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
-            b += numerix.reshape(self.constraintB.ravel(), ids.shape).sum(-2).ravel()
+        mesh = var.mesh
 
-        return (var, L, b)
+        self.__calcCoeffDict(var)
+        self.__calcConstraints(var)
+
+        id1, id2 = mesh._adjacentCellIDs
+        interiorFaces = numerix.nonzero(mesh.interiorFaces)[0]
+
+        id1 = numerix.take(id1, interiorFaces)
+        id2 = numerix.take(id2, interiorFaces)
+
+        value = numerix.array(value).ravel()
+        coeff = numerix.take(numerix.array(self.coeffDict['cell 1 offdiag']).ravel(), interiorFaces)
+        flux = coeff * (numerix.take(value, id2) - numerix.take(value, id1))
+
+        b = numerix.zeros(len(value), 'd')
+        vector.putAdd(b, id1, -flux)
+        vector.putAdd(b, id2, flux)
+
+        if hasattr(self, 'anisotropySource'):
+            b -= numerix.array(self.anisotropySource).ravel()
+
+        b += numerix.array(self.constraintB).ravel() - numerix.array(self.constraintL).ravel() * value
+
+        return b
+
+    def __calcCoeffDict(self, var):
+        if not hasattr(self, 'coeffDict'):
+
+            coeff = self._getGeomCoeff(var)
+            minusCoeff = -coeff[0]
+
+            coeff[0].dontCacheMe()
+            minusCoeff.dontCacheMe()
+
+            self.coeffDict = {
+                'cell 1 diag':    minusCoeff,
+                'cell 1 offdiag':  coeff[0]
+                }
+
+            self.coeffDict['cell 2 offdiag'] = self.coeffDict['cell 1 offdiag']
+            self.coeffDict['cell 2 diag'] = self.coeffDict['cell 1 diag']
+
+            self.__calcAnisotropySource(coeff, var.mesh, var)
+
+            del coeff
+            del minusCoeff
 
     def __higherOrderbuildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
         mesh = var.mesh
@@ -381,26 +442,7 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
         elif self.order == 2:
 
-            if not hasattr(self, 'coeffDict'):
-
-                coeff = self._getGeomCoeff(var)
-                minusCoeff = -coeff[0]
-
-                coeff[0].dontCacheMe()
-                minusCoeff.dontCacheMe()
-
-                self.coeffDict = {
-                    'cell 1 diag':    minusCoeff,
-                    'cell 1 offdiag':  coeff[0]
-                    }
-
-                self.coeffDict['cell 2 offdiag'] = self.coeffDict['cell 1 offdiag']
-                self.coeffDict['cell 2 diag'] = self.coeffDict['cell 1 diag']
-
-                self.__calcAnisotropySource(coeff, mesh, var)
-
-                del coeff
-                del minusCoeff
+            self.__calcCoeffDict(var)
 
             higherOrderBCs, lowerOrderBCs = self.__getBoundaryConditions(boundaryConditions)
             del lowerOrderBCs
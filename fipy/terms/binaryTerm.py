@@ -40,6 +40,33 @@ class _BinaryTerm(_AbstractBinaryTerm):
 
         return (var, matrix, RHSvector)
 
+    def _buildAndAddDiagonals(self, var, dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None, buildExplicitIfOther=True):
+        """Matrix-free counterpart of `_buildAndAddMatrices()`
+
+        Returns `(diagonal, RHSvector)`, or `None` if any constituent
+        `Term` contributes off-diagonal entries or caches its matrix.
+        """
+
+        diagonal = 0.
+        RHSvector = 0.
+
+        for term in (self.term, self.other):
+            if term._cacheMatrix or term._cacheRHSvector:
+                return None
+
+            system = term._buildAndAddDiagonals(var,
+                                                dt=dt,
+                                                transientGeomCoeff=transientGeomCoeff,
+                                                diffusionGeomCoeff=diffusionGeomCoeff,
+                                                buildExplicitIfOther=buildExplicitIfOther)
+            if system is None:
+                return None
+
+            diagonal = diagonal + system[0]
+            RHSvector = RHSvector + system[1]
+
+        return (diagonal, RHSvector)
+
     def _getDefaultSolver(self, var, solver, *args, **kwargs):
         for term in (self.term, self.other):
             defaultSolver = term._getDefaultSolver(var, solver, *args, **kwargs)
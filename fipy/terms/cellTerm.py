@@ -134,6 +134,19 @@ class CellTerm(_NonDiffusionTerm):
 
         return (var, L, b)
 
+    def _buildDiagonal(self, var, dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        if self._vectorSize(var) > 1:
+            return None
+
+        coeffVectors = self._getCoeffVectors_(var=var, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+
+        dt = self._checkDt(dt)
+
+        diagonal = numerix.array(coeffVectors['new value'] / dt + coeffVectors['diagonal']).ravel()
+        b = numerix.array(var.old.value * coeffVectors['old value'] / dt + coeffVectors['b vector']).ravel()
+
+        return (diagonal, b)
+
     def _test(self):
         """
         The following tests demonstrate how the `CellVariable` objects
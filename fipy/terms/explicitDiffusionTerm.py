@@ -33,6 +33,22 @@ class ExplicitDiffusionTerm(_AbstractDiffusionTerm):
 
         return (var, SparseMatrix(mesh=var.mesh), b - L * var.value)
 
+    def _buildDiagonal(self, var, dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        if self._vectorSize(var) > 1:
+            return None
+
+        if hasattr(var, 'old'):
+            varOld = var.old
+        else:
+            varOld = var
+
+        b = self._explicitRHSvector(varOld, var.value)
+
+        if b is None:
+            return None
+
+        return (0., b)
+
     def _getNormals(self, mesh):
         return mesh._faceCellToCellNormals
 
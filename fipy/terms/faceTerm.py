@@ -151,3 +151,28 @@ class FaceTerm(_NonDiffusionTerm):
             self._explicitBuildMatrix_(SparseMatrix, var.old, id1, id2, b, weight['explicit'], var, boundaryConditions, interiorFaces, dt)
 
         return (var, L, b)
+
+    def _buildDiagonal(self, var, dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        """Only the explicit portion can be built without a matrix
+        """
+        weight = self._getWeight(var, transientGeomCoeff, diffusionGeomCoeff)
+
+        if 'implicit' in weight or self._vectorSize(var) > 1:
+            return None
+
+        b = numerix.zeros(var.shape, 'd').ravel()
+
+        if 'explicit' in weight:
+            mesh = var.mesh
+            id1, id2 = mesh._adjacentCellIDs
+            interiorFaces = numerix.nonzero(mesh.interiorFaces)[0]
+
+            id1 = numerix.take(id1, interiorFaces)
+            id2 = numerix.take(id2, interiorFaces)
+
+            coeffMatrix = self._getCoeffMatrix_(var, weight['explicit'])
+
+            self._explicitBuildMatrixInline_(oldArray=var.old, id1=id1, id2=id2, b=b, coeffMatrix=coeffMatrix,
+                                             mesh=mesh, interiorFaces=interiorFaces, dt=dt, weight=weight['explicit'])
+
+        return (0., b)
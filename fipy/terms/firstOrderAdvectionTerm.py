@@ -90,6 +90,16 @@ class FirstOrderAdvectionTerm(_NonDiffusionTerm):
 
     def _buildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, equation=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
 
+        return (var, SparseMatrix(mesh=var.mesh), self.__calcRHSvector(var))
+
+    def _buildDiagonal(self, var, dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        if self._vectorSize(var) > 1:
+            return None
+
+        return (0., self.__calcRHSvector(var))
+
+    def __calcRHSvector(self, var):
+
         oldArray = var.old
 
         mesh = var.mesh
@@ -118,7 +128,7 @@ class FirstOrderAdvectionTerm(_NonDiffusionTerm):
         else:
             coeffXdifferences = 0.
 
-        return (var, SparseMatrix(mesh=var.mesh), -coeffXdifferences * mesh.cellVolumes)
+        return -coeffXdifferences * mesh.cellVolumes
 
     def _getDifferences(self, adjacentValues, cellValues, oldArray, cellToCellIDs, mesh):
         return (adjacentValues - cellValues) / mesh._cellToCellDistances
@@ -4,9 +4,11 @@ from builtins import object
 __docformat__ = 'restructuredtext'
 
 import os
+import weakref
 
 from fipy import input
 from fipy.tools import numerix
+from fipy.tools import hooks
 from fipy.terms import AbstractBaseClassError
 from fipy.terms import SolutionVariableRequiredError
 
@@ -39,6 +41,7 @@ class Term(object):
         self._matrix = None
         self._cacheRHSvector = False
         self._RHSvector = None
+        self._sparsityPatterns = {}
         self.var = var
 
     def _calcVars(self):
@@ -56,6 +59,20 @@ class Term(object):
     def _buildAndAddMatrices(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None, buildExplicitIfOther=False):
         raise NotImplementedError
 
+    def _buildDiagonal(self, var, dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        """Matrix-free counterpart of `_buildMatrix()`
+
+        Returns the `(diagonal, RHSvector)` of the system `_buildMatrix()`
+        would assemble without boundary conditions, or `None` if that
+        matrix is not diagonal.
+        """
+        return None
+
+    def _buildAndAddDiagonals(self, var, dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None, buildExplicitIfOther=False):
+        """Matrix-free counterpart of `_buildAndAddMatrices()`
+        """
+        return None
+
     def _checkVar(self, var):
         raise NotImplementedError
 
@@ -104,6 +121,92 @@ class Term(object):
 
         return SparseMatrix
 
+    def _sparsityKey(self, var, solver, boundaryConditions):
+        """Identify the structure of the linear system for `var`.
+
+        The nonzero structure assembled by `_buildAndAddMatrices()` is
+        fixed by the mesh, the solution variable(s) and the terms
+        themselves; only the coefficient values change from sweep to
+        sweep.  Legacy `BoundaryCondition` objects may change the faces
+        they apply to, so no key is returned when they are used.
+
+        Returns the key and the objects whose `id` it holds, which must
+        still be alive for a pattern stored under the key to apply.
+        """
+        if len(boundaryConditions) > 0:
+            return None, None
+
+        vars = getattr(var, "vars", [var])
+        owners = (var.mesh,) + tuple(vars)
+
+        return ((solver._matrixClass, var.shape) + tuple(id(owner) for owner in owners),
+                owners)
+
+    def _reuseSparsityPattern(self, var, solver, matrix, boundaryConditions):
+        """Assemble `matrix` using the pattern of the previous sweep, if any.
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=3)
+        >>> v = CellVariable(mesh=m, value=1.)
+        >>> eq = TransientTerm() == DiffusionTerm() + ImplicitSourceTerm(v)
+        >>> eq.solve(var=v, dt=1.)
+        >>> patterns = [pattern for refs, pattern in eq._sparsityPatterns.values()]
+        >>> eq.solve(var=v, dt=2.)
+        >>> [pattern for refs, pattern in eq._sparsityPatterns.values()] == patterns
+        True
+
+        and gives the same solution as assembling from scratch
+
+        >>> w = CellVariable(mesh=m, value=1.)
+        >>> for dt in (1., 2.):
+        ...     (TransientTerm() == DiffusionTerm() + ImplicitSourceTerm(w)).solve(var=w, dt=dt)
+        >>> print(numerix.allclose(v, w))
+        True
+
+        A pattern stored for a mesh or variable that has since been
+        garbage collected is not offered to the matrix, even if a new
+        object has the same `id`
+
+        >>> class _Matrix(object):
+        ...     pattern = None
+        ...     def _setSparsityPattern(self, pattern):
+        ...         self.pattern = pattern
+        ...     def _getSparsityPattern(self):
+        ...         return self.pattern
+        >>> term = DiffusionTerm()
+        >>> solver = term.getDefaultSolver(var=v)
+        >>> matrix = _Matrix()
+        >>> matrix.pattern = pattern = object()
+        >>> term._reuseSparsityPattern(v, solver, matrix, ())
+        >>> matrix = _Matrix()
+        >>> term._reuseSparsityPattern(v, solver, matrix, ())
+        >>> print(matrix.pattern is pattern)
+        True
+        >>> class _Dead(object):
+        ...     pass
+        >>> [(key, (refs, pattern))] = term._sparsityPatterns.items()
+        >>> term._sparsityPatterns[key] = ([weakref.ref(_Dead())] + refs[1:], pattern)
+        >>> matrix = _Matrix()
+        >>> term._reuseSparsityPattern(v, solver, matrix, ())
+        >>> print(matrix.pattern)
+        None
+        """
+        key, owners = self._sparsityKey(var, solver, boundaryConditions)
+
+        if key is not None:
+            refs, pattern = self._sparsityPatterns.get(key, ((), None))
+            if (pattern is not None
+                and all(ref() is owner for ref, owner in zip(refs, owners))):
+                matrix._setSparsityPattern(pattern)
+
+            pattern = matrix._getSparsityPattern()
+
+            if pattern is None:
+                self._sparsityPatterns.pop(key, None)
+            else:
+                self._sparsityPatterns[key] = ([weakref.ref(owner) for owner in owners],
+                                               pattern)
+
     def _prepareLinearSystem(self, var, solver, boundaryConditions, dt):
         solver = self.getDefaultSolver(var, solver)
 
@@ -121,6 +224,8 @@ class Term(object):
                 from fipy.viewers.matplotlibViewer.matplotlibSparseMatrixViewer import MatplotlibSparseMatrixViewer
                 Term._viewer = MatplotlibSparseMatrixViewer()
 
+        start = hooks._clock() if hooks._hooks else None
+
         var, matrix, RHSvector = self._buildAndAddMatrices(var,
                                                            self._getMatrixClass(solver, var),
                                                            boundaryConditions=boundaryConditions,
@@ -129,10 +234,21 @@ class Term(object):
                                                            diffusionGeomCoeff=self._getDiffusionGeomCoeff(var),
                                                            buildExplicitIfOther=self._buildExplcitIfOther)
 
+        self._reuseSparsityPattern(var, solver, matrix, boundaryConditions)
+
         self._buildCache(matrix, RHSvector)
 
         solver._storeMatrix(var=var, matrix=matrix, RHSvector=RHSvector)
 
+        if start is not None and hooks._hooks:
+            hooks.emit("build",
+                       term=self,
+                       var=var,
+                       solver=solver,
+                       time=hooks._clock() - start,
+                       size=matrix._shape[0],
+                       nnz=matrix._numberOfNonzeros)
+
         if 'FIPY_DISPLAY_MATRIX' in os.environ:
             if var is None:
                 name = ""
@@ -153,7 +269,83 @@ class Term(object):
 
         return solver
 
-    def solve(self, var=None, solver=None, boundaryConditions=(), dt=None):
+    def _solveMatrixFree(self, var, boundaryConditions, dt, underRelaxation=None):
+        r"""Update `var` without assembling or solving a linear system
+
+        When every constituent `Term` contributes only to the diagonal of
+        the matrix, as for a `TransientTerm` equated to explicit terms,
+        the system is solved by dividing the right-hand side by the
+        diagonal.
+
+        Returns the residual :math:`\|\mathsf{L}\vec{x} - \vec{b}\|_2`
+        of the system before the update, or `None`, leaving `var`
+        untouched, if the system cannot be solved this way.
+
+        >>> from fipy import *
+        >>> m = Grid2D(nx=4, ny=3)
+        >>> def explicitStep(matrixFree):
+        ...     v = CellVariable(mesh=m, value=m.x * m.y, hasOld=True)
+        ...     v.constrain(1., where=m.facesLeft)
+        ...     v.faceGrad.constrain([[0.5], [0.]], where=m.facesRight)
+        ...     eq = (TransientTerm(coeff=2.)
+        ...           == ExplicitDiffusionTerm(coeff=1. + m.x)
+        ...           - ExplicitUpwindConvectionTerm(coeff=(1., -0.5))
+        ...           + ImplicitSourceTerm(coeff=-1.) + v**2)
+        ...     res = eq.sweep(var=v, dt=0.01, underRelaxation=0.9,
+        ...                    matrixFree=matrixFree)
+        ...     return v, res
+        >>> v0, res0 = explicitStep(matrixFree=False)
+        >>> v1, res1 = explicitStep(matrixFree=True)
+        >>> print(numerix.allclose(v0, v1), numerix.allclose(res0, res1))
+        True True
+
+        Implicit terms couple neighboring cells, so their systems must be
+        solved
+
+        >>> v = CellVariable(mesh=m, hasOld=True)
+        >>> print((TransientTerm() == DiffusionTerm())._solveMatrixFree(v, (), dt=1.))
+        None
+        """
+        var = self._verifyVar(var)
+
+        if (boundaryConditions
+            or var.mesh.communicator.Nproc > 1
+            or self._vectorSize(var) > 1
+            or self._cacheMatrix
+            or self._cacheRHSvector):
+            return None
+
+        self._checkVar(var)
+
+        system = self._buildAndAddDiagonals(var,
+                                            dt=dt,
+                                            transientGeomCoeff=self._getTransientGeomCoeff(var),
+                                            diffusionGeomCoeff=self._getDiffusionGeomCoeff(var),
+                                            buildExplicitIfOther=self._buildExplcitIfOther)
+        if system is None:
+            return None
+
+        diagonal, RHSvector = system
+        N = len(var.ravel())
+        diagonal = numerix.zeros((N,), 'd') + numerix.asarray(diagonal).ravel()
+        RHSvector = numerix.zeros((N,), 'd') + numerix.asarray(RHSvector).ravel()
+
+        if not numerix.all(diagonal):
+            return None
+
+        x = numerix.array(var).ravel()
+
+        if underRelaxation is not None:
+            diagonal = diagonal / underRelaxation
+            RHSvector = RHSvector + (1 - underRelaxation) * diagonal * x
+
+        residual = numerix.L2norm(diagonal * x - RHSvector)
+
+        var[:] = numerix.reshape(RHSvector / diagonal, var.shape)
+
+        return residual
+
+    def solve(self, var=None, solver=None, boundaryConditions=(), dt=None, matrixFree=False):
         r"""
         Builds and solves the `Term`'s linear system once. This method
         does not return the residual. It should be used when the
@@ -171,13 +363,22 @@ class Term(object):
         boundaryConditions : :obj:`tuple` of :obj:`~fipy.boundaryConditions.boundaryCondition.BoundaryCondition`
         dt : float
             Timestep size.
+        matrixFree : bool
+            If `True`, and the matrix is diagonal (e.g., a `TransientTerm`
+            equated to explicit terms), update `var` directly from the
+            right-hand side without assembling a matrix or calling the
+            `solver`.  Otherwise, the linear system is built and solved
+            as usual.
         """
 
+        if matrixFree and self._solveMatrixFree(var, boundaryConditions, dt) is not None:
+            return
+
         solver = self._prepareLinearSystem(var, solver, boundaryConditions, dt)
 
         solver._solve()
 
-    def sweep(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None, cacheResidual=False, cacheError=False):
+    def sweep(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None, cacheResidual=False, cacheError=False, matrixFree=False):
         r"""
         Builds and solves the `Term`'s linear system once. This method
         also recalculates and returns the residual as well as applying
@@ -210,26 +411,54 @@ class Term(object):
             :math:`\mathsf{L}\vec{e}=\vec{r}` for the error vector
             :math:`\vec{e}` and store it in the `errorVector` member of
             `Term`
+        matrixFree : bool
+            If `True`, and the matrix is diagonal (e.g., a `TransientTerm`
+            equated to explicit terms), update `var` directly from the
+            right-hand side without assembling a matrix or calling the
+            `solver`.  Otherwise, or if `residualFn`, `cacheResidual` or
+            `cacheError` is given, the linear system is built and solved
+            as usual.
         """
-        solver = self._prepareLinearSystem(var=var, solver=solver, boundaryConditions=boundaryConditions, dt=dt)
-        solver._applyUnderRelaxation(underRelaxation=underRelaxation)
-        residual = solver._calcResidual(residualFn=residualFn)
-
-        if cacheResidual or cacheError:
-            self.residualVector = solver._calcResidualVector(residualFn=residualFn)
-
-        if cacheError:
-            self.errorVector = solver.var.copy()
-            var_tmp = solver.var
-            RHS_tmp = solver.RHSvector
-            solver._storeMatrix(var=self.errorVector, matrix=solver.matrix, RHSvector=self.residualVector)
-            solver._solve()
-            solver._storeMatrix(var=var_tmp, matrix=solver.matrix, RHSvector=RHS_tmp)
+        start = hooks._clock() if hooks._hooks else None
 
-        if not cacheResidual:
+        residual = None
+        if matrixFree and residualFn is None and not (cacheResidual or cacheError):
+            residual = self._solveMatrixFree(var, boundaryConditions, dt, underRelaxation=underRelaxation)
+
+        if residual is not None:
+            solver = None
+            var = self._verifyVar(var)
             self.residualVector = None
+        else:
+            solver = self._prepareLinearSystem(var=var, solver=solver, boundaryConditions=boundaryConditions, dt=dt)
+            solver._applyUnderRelaxation(underRelaxation=underRelaxation)
+            residual = solver._calcResidual(residualFn=residualFn)
 
-        solver._solve()
+            if cacheResidual or cacheError:
+                self.residualVector = solver._calcResidualVector(residualFn=residualFn)
+
+            if cacheError:
+                self.errorVector = solver.var.copy()
+                var_tmp = solver.var
+                RHS_tmp = solver.RHSvector
+                solver._storeMatrix(var=self.errorVector, matrix=solver.matrix, RHSvector=self.residualVector)
+                solver._solve()
+                solver._storeMatrix(var=var_tmp, matrix=solver.matrix, RHSvector=RHS_tmp)
+
+            if not cacheResidual:
+                self.residualVector = None
+
+            var = solver.var
+
+            solver._solve()
+
+        if start is not None and hooks._hooks:
+            hooks.emit("sweep",
+                       term=self,
+                       var=var,
+                       solver=solver,
+                       time=hooks._clock() - start,
+                       residual=residual)
 
         return residual
 
@@ -86,6 +86,30 @@ class _UnaryTerm(Term):
 
         return (var, matrix, RHSvector)
 
+    def _buildAndAddDiagonals(self, var, dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None, buildExplicitIfOther=False):
+        """Matrix-free counterpart of `_buildAndAddMatrices()`
+
+        Returns `(diagonal, RHSvector)`, or `None` if the matrix is not
+        diagonal.
+        """
+
+        if var is self.var or self.var is None:
+            return self._buildDiagonal(var,
+                                       dt=dt,
+                                       transientGeomCoeff=transientGeomCoeff,
+                                       diffusionGeomCoeff=diffusionGeomCoeff)
+        elif buildExplicitIfOther:
+            system = self._buildDiagonal(self.var,
+                                         dt=dt,
+                                         transientGeomCoeff=transientGeomCoeff,
+                                         diffusionGeomCoeff=diffusionGeomCoeff)
+            if system is None:
+                return None
+            diagonal, RHSvector = system
+            return (0., RHSvector - diagonal * numerix.array(self.var).ravel())
+        else:
+            return (0., 0.)
+
     def _reshapeIDs(self, var, ids):
         shape = (self._vectorSize(var), self._vectorSize(var), ids.shape[-1])
         ids = numerix.resize(ids, shape)
@@ -34,8 +34,10 @@ for M in (2, 3):
                          why="not running on processor %d of %d" % (N, M),
                          skipWarning=False)
 
+import fipy.tools.checkpoint
 import fipy.tools.dump
 import fipy.tools.numerix
+import fipy.tools.timeSeries
 import fipy.tools.vector
 from .dimensions.physicalField import PhysicalField
 from fipy.tools.numerix import *
@@ -43,8 +45,10 @@ from fipy.tools.vitals import Vitals
 
 __all__ = ["serialComm",
            "parallelComm",
+           "checkpoint",
            "dump",
            "numerix",
+           "timeSeries",
            "vector",
            "PhysicalField",
            "Vitals",
@@ -0,0 +1,95 @@
+"""Recycling of scratch arrays
+
+Evaluating a `Variable` expression one operation at a time allocates
+a new array for every intermediate result, and a new array for the
+result itself, every time the expression is evaluated.  Over the many
+sweeps of a simulation the arrays have the same shapes and types every
+time, so, in the in-place evaluation mode of
+:class:`~fipy.variables.variable.Variable`, intermediate results are
+written into arrays borrowed from a `_BufferPool` and given back as
+soon as they have been consumed.
+
+    >>> pool = _BufferPool()
+    >>> a = pool.take((3,), 'd')
+    >>> b = pool.take((3,), 'd')
+    >>> pool.give(a)
+    >>> pool.give(b)
+    >>> c = pool.take((3,), numerix.float64)
+    >>> print(c is b)
+    True
+    >>> print(pool.take((3,), 'l') is a)
+    False
+    >>> print(pool.allocations)
+    3
+
+The pool holds on to no more than `maxBuffers` free arrays of each
+shape and type, so its memory stays bounded by the deepest expression
+that was evaluated.
+
+    >>> pool = _BufferPool(maxBuffers=1)
+    >>> pool.give(numerix.empty((2,)))
+    >>> pool.give(numerix.empty((2,)))
+    >>> print(pool.nbytes)
+    16
+    >>> pool.clear()
+    >>> print(pool.nbytes)
+    0
+"""
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tools import numerix
+
+class _BufferPool(object):
+    """Free lists of arrays, keyed by shape and type
+
+    Parameters
+    ----------
+    maxBuffers : int
+        Largest number of free arrays of each shape and type to keep.
+    """
+    def __init__(self, maxBuffers=16):
+        self.maxBuffers = maxBuffers
+        self._free = {}
+        self.allocations = 0
+
+    def take(self, shape, dtype):
+        """Borrow an uninitialized array
+
+        The array must be handed back to :meth:`give` when its contents
+        are no longer needed (or may simply be dropped).
+        """
+        dtype = numerix.dtype(dtype)
+        free = self._free.get((tuple(shape), dtype.str))
+        if free:
+            return free.pop()
+        self.allocations += 1
+        return numerix.empty(shape, dtype=dtype)
+
+    def give(self, buffer):
+        """Return a borrowed array to the pool
+        """
+        free = self._free.setdefault((buffer.shape, buffer.dtype.str), [])
+        if len(free) < self.maxBuffers:
+            free.append(buffer)
+
+    def clear(self):
+        """Release all free arrays
+        """
+        self._free = {}
+
+    @property
+    def nbytes(self):
+        """Memory held by free arrays
+        """
+        return sum(buffer.nbytes for free in self._free.values() for buffer in free)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,396 @@
+"""Binary checkpoints of `CellVariable` objects and their mesh
+
+Unlike :mod:`fipy.tools.dump`, which pickles an object into a gzip
+stream, a checkpoint stores the mesh and the values (and old values) of
+each `CellVariable` as raw, aligned binary arrays. Uncompressed arrays
+are read with :func:`numpy.memmap`, so each processor only touches the
+cells it needs, and no data is broadcast between processors.
+Compressed arrays are stored in independently compressed chunks, so
+a processor only decompresses the chunks that hold its cells.
+
+The file consists of an 8-byte magic string, the little-endian
+length of a pickled header, the header itself, and then each array,
+starting on a multiple of 64 bytes.
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import pickle
+import struct
+import zlib
+
+from fipy.tools import numerix
+from fipy.tools import parallelComm
+
+__all__ = ["write", "read"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+_MAGIC = b"FIPYCKP1"
+_ALIGNMENT = 64
+
+class _ArrayRef(object):
+    """Placeholder for an array stored in the body of the checkpoint.
+    """
+    def __init__(self, name, masked=False):
+        self.name = name
+        self.masked = masked
+
+def _aligned(offset):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+class _Writer(object):
+    def __init__(self, compression, chunkSize):
+        if compression not in (None, "zlib"):
+            raise ValueError("Unknown compression: %s" % compression)
+        self.compression = compression
+        self.chunkSize = chunkSize
+        self.table = {}
+        self.blobs = []
+
+    def add(self, name, arr):
+        arr = numerix.ascontiguousarray(arr)
+        entry = dict(dtype=arr.dtype.str,
+                     shape=arr.shape,
+                     compression=self.compression)
+
+        if self.compression is None:
+            blobs = [arr.tobytes()]
+        else:
+            flat = arr.ravel()
+            chunk = max(1, self.chunkSize // max(1, arr.itemsize))
+            entry["chunk"] = chunk
+            blobs = [zlib.compress(flat[start:start + chunk].tobytes())
+                     for start in range(0, len(flat), chunk)]
+            entry["chunkBytes"] = [len(blob) for blob in blobs]
+
+        entry["nbytes"] = sum(len(blob) for blob in blobs)
+        self.table[name] = entry
+        self.blobs.append((name, blobs))
+
+    def addState(self, prefix, state):
+        """Replace the arrays in a `state` dictionary by `_ArrayRef` objects.
+        """
+        state = state.copy()
+        for key, value in state.items():
+            if isinstance(value, numerix.MA.MaskedArray):
+                name = prefix + key
+                self.add(name + ".data", numerix.MA.filled(value))
+                self.add(name + ".mask", numerix.MA.getmaskarray(value))
+                state[key] = _ArrayRef(name, masked=True)
+            elif isinstance(value, numerix.ndarray) and value.dtype != object:
+                name = prefix + key
+                self.add(name, value)
+                state[key] = _ArrayRef(name)
+        return state
+
+    def layout(self):
+        """Assign each array its offset in the body and return the
+        size of the body.
+        """
+        offset = 0
+        for name, blobs in self.blobs:
+            self.table[name]["offset"] = offset
+            offset = _aligned(offset + self.table[name]["nbytes"])
+        return offset
+
+    def pickleHeader(self, header, start):
+        """Pickle `header` for a body that follows it, where the header
+        is written `start` bytes into the file.
+
+        Returns the pickled header, with the (aligned) offset of the
+        body recorded in ``header["bodyOffset"]``.
+        """
+        header["arrays"] = self.table
+        # the body offset is part of the header, so estimate it
+        # generously and then pad to it
+        header["bodyOffset"] = 0
+        headerBytes = pickle.dumps(header, protocol=2)
+        bodyOffset = _aligned(start + len(headerBytes) + 16)
+        header["bodyOffset"] = bodyOffset
+        headerBytes = pickle.dumps(header, protocol=2)
+        assert start + len(headerBytes) <= bodyOffset
+        return headerBytes
+
+    def writeBody(self, f, bodyOffset):
+        for name, blobs in self.blobs:
+            f.seek(bodyOffset + self.table[name]["offset"])
+            for blob in blobs:
+                f.write(blob)
+
+    def save(self, filename, header):
+        self.layout()
+        headerBytes = self.pickleHeader(header, start=len(_MAGIC) + 8)
+
+        with open(filename, "wb") as f:
+            f.write(_MAGIC)
+            f.write(struct.pack("<Q", len(headerBytes)))
+            f.write(headerBytes)
+            self.writeBody(f, header["bodyOffset"])
+
+class _Reader(object):
+    def __init__(self, filename, header=None):
+        self.filename = filename
+        if header is None:
+            with open(filename, "rb") as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    raise IOError("%s is not a FiPy checkpoint" % filename)
+                length, = struct.unpack("<Q", f.read(8))
+                header = pickle.loads(f.read(length))
+        self.header = header
+        self.table = self.header["arrays"]
+
+    def get(self, name, IDs=None):
+        """Read array `name`, restricted to `IDs` along its last axis.
+        """
+        entry = self.table[name]
+        dtype = numerix.dtype(entry["dtype"])
+        shape = tuple(entry["shape"])
+        offset = self.header["bodyOffset"] + entry["offset"]
+
+        if entry["compression"] is None:
+            if numerix.prod(shape) == 0:
+                arr = numerix.zeros(shape, dtype=dtype)
+            else:
+                arr = numerix.memmap(self.filename, dtype=dtype, mode="r",
+                                     offset=offset, shape=shape)
+            if IDs is None:
+                return numerix.array(arr)
+            else:
+                return numerix.array(arr[..., IDs])
+
+        chunk = entry["chunk"]
+        starts = numerix.cumsum([0] + entry["chunkBytes"]) + offset
+        size = int(numerix.prod(shape))
+
+        if IDs is None:
+            needed = numerix.arange(len(entry["chunkBytes"]))
+        else:
+            flatIDs = (numerix.arange(size // max(1, shape[-1]))[:, numerix.newaxis] * shape[-1]
+                       + numerix.asarray(IDs)[numerix.newaxis, :])
+            needed = numerix.unique(flatIDs // chunk)
+
+        flat = numerix.zeros((size,), dtype=dtype)
+        with open(self.filename, "rb") as f:
+            for i in needed:
+                f.seek(starts[i])
+                data = zlib.decompress(f.read(starts[i + 1] - starts[i]))
+                values = numerix.frombuffer(data, dtype=dtype)
+                flat[i * chunk:i * chunk + len(values)] = values
+
+        arr = flat.reshape(shape)
+        if IDs is None:
+            return arr
+        else:
+            return arr[..., IDs]
+
+    def getState(self, state):
+        state = state.copy()
+        for key, value in state.items():
+            if isinstance(value, _ArrayRef):
+                if value.masked:
+                    state[key] = numerix.MA.array(self.get(value.name + ".data"),
+                                                  mask=self.get(value.name + ".mask"))
+                else:
+                    state[key] = self.get(value.name)
+        return state
+
+def _rootValue(var, root=0):
+    """The global value of a `CellVariable` on processor `root`
+
+    Unlike `globalValue`, which sends the whole value to every
+    processor, only `root` receives the values of the others.  Returns
+    `None` on the other processors.
+    """
+    mesh = var.mesh
+    comm = mesh.communicator
+    if comm.Nproc == 1:
+        return numerix.asarray(var.globalValue)
+
+    localValue = numerix.asarray(var.value)[..., mesh._localNonOverlappingCellIDs]
+    globalIDs = comm.gather(mesh._globalNonOverlappingCellIDs, root=root)
+    localValues = comm.gather(localValue, root=root)
+    if comm.procID != root:
+        return None
+
+    globalValue = numerix.empty(localValue.shape[:-1] + (mesh.globalNumberOfCells,),
+                                dtype=localValue.dtype)
+    globalValue[..., numerix.concatenate(globalIDs)] = numerix.concatenate(localValues, axis=-1)
+    return globalValue
+
+def write(filename, variables, compression=None, chunkSize=2**20, communicator=parallelComm):
+    """Write a binary checkpoint of one or more `CellVariable` objects.
+
+    All variables must be defined on the same mesh, which is stored only
+    once.
+
+        >>> from fipy import CellVariable, Grid2D
+        >>> import tempfile, os
+        >>> mesh = Grid2D(nx=3, ny=2)
+        >>> phi = CellVariable(mesh=mesh, name="phi", value=mesh.x, hasOld=True)
+        >>> phi.updateOld()
+        >>> phi.setValue(mesh.y)
+        >>> grad = CellVariable(mesh=mesh, name="grad", rank=1, value=mesh.cellCenters)
+        >>> (f, filename) = tempfile.mkstemp(".fipy")
+        >>> write(filename, (phi, grad))
+        >>> newPhi, newGrad = read(filename)
+        >>> print(newPhi.name, newGrad.name)
+        phi grad
+        >>> print(numerix.allequal(newPhi, phi))
+        True
+        >>> print(numerix.allequal(newPhi.old, phi.old))
+        True
+        >>> print(numerix.allequal(newGrad, grad))
+        True
+
+    Compressed checkpoints round trip, too, and the variables can be
+    placed on an existing mesh
+
+        >>> write(filename, phi, compression="zlib", chunkSize=16)
+        >>> newPhi = read(filename, mesh=mesh)
+        >>> print(newPhi.mesh is mesh)
+        True
+        >>> print(numerix.allequal(newPhi, phi))
+        True
+        >>> print(numerix.allequal(newPhi.old, phi.old))
+        True
+
+    Unstructured meshes are stored as arrays
+
+        >>> from fipy import Tri2D
+        >>> tri = Tri2D(nx=2, ny=2)
+        >>> x = CellVariable(mesh=tri, value=tri.x)
+        >>> write(filename, [x])
+        >>> newX, = read(filename)
+        >>> print(numerix.allclose(newX, newX.mesh.x))
+        True
+
+    Only `CellVariable` objects can be stored
+
+        >>> from fipy import FaceVariable
+        >>> write(filename, FaceVariable(mesh=mesh))
+        Traceback (most recent call last):
+            ...
+        TypeError: Only CellVariable objects can be checkpointed, not FaceVariable
+
+        >>> os.close(f)
+        >>> os.remove(filename)
+
+    Parameters
+    ----------
+    filename : str
+        Name of the checkpoint file.
+    variables : ~fipy.variables.cellVariable.CellVariable or list of ~fipy.variables.cellVariable.CellVariable
+        The variables to store. :func:`read` returns the same structure.
+    compression : {None, "zlib"}
+        Compress each array in independent chunks.  Uncompressed
+        checkpoints are read by memory mapping.
+    chunkSize : int
+        Number of bytes in each compressed chunk.
+    communicator : ~fipy.tools.comms.commWrapper.CommWrapper
+        A duck-typed object with `procID` and `Nproc` attributes is sufficient
+    """
+    from fipy.variables.variable import Variable
+    from fipy.variables.cellVariable import CellVariable
+
+    single = isinstance(variables, Variable)
+    if single:
+        variables = [variables]
+    else:
+        variables = list(variables)
+
+    for var in variables:
+        if not isinstance(var, CellVariable):
+            raise TypeError("Only CellVariable objects can be checkpointed, not %s"
+                            % var.__class__.__name__)
+
+    mesh = variables[0].mesh
+    for var in variables:
+        if var.mesh is not mesh:
+            raise ValueError("All variables must be defined on the same mesh")
+
+    entries = []
+    arrays = []
+    for i, var in enumerate(variables):
+        entry = dict(cls=var.__class__,
+                     name=var.name,
+                     unit=var.unit,
+                     hasOld=var._old is not None)
+        # gathering is collective, so all processors must take part
+        arrays.append(("var%d.value" % i, _rootValue(var)))
+        if entry["hasOld"]:
+            arrays.append(("var%d.old" % i, _rootValue(var.old)))
+        entries.append(entry)
+
+    if communicator.procID == 0:
+        writer = _Writer(compression=compression, chunkSize=chunkSize)
+        meshState = writer.addState("mesh.", mesh.__getstate__())
+        for name, value in arrays:
+            writer.add(name, value)
+        writer.save(filename,
+                    header=dict(meshClass=mesh.__class__,
+                                meshState=meshState,
+                                globalNumberOfCells=mesh.globalNumberOfCells,
+                                variables=entries,
+                                single=single))
+
+    communicator.Barrier()
+
+def read(filename, mesh=None, communicator=parallelComm):
+    """Read the `CellVariable` objects stored by :func:`write`.
+
+    Each processor reads only the values of its own (overlapping) cells.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the checkpoint file.
+    mesh : ~fipy.meshes.mesh.Mesh
+        Mesh to define the variables on. If `None`, the stored mesh is
+        reconstructed.
+    communicator : ~fipy.tools.comms.commWrapper.CommWrapper
+        A duck-typed object with `procID` and `Nproc` attributes is sufficient
+    """
+    from fipy.variables.cellVariable import CellVariable
+
+    reader = _Reader(filename)
+    header = reader.header
+
+    if mesh is None:
+        meshClass = header["meshClass"]
+        mesh = meshClass.__new__(meshClass)
+        mesh.__setstate__(reader.getState(header["meshState"]))
+    elif mesh.globalNumberOfCells != header["globalNumberOfCells"]:
+        raise ValueError("%s has %d cells, but the checkpoint has %d"
+                         % (mesh, mesh.globalNumberOfCells, header["globalNumberOfCells"]))
+
+    IDs = mesh._globalOverlappingCellIDs
+
+    variables = []
+    for i, entry in enumerate(header["variables"]):
+        old = None
+        if entry["hasOld"]:
+            old = CellVariable(mesh=mesh, value=reader.get("var%d.old" % i, IDs))
+
+        var = entry["cls"].__new__(entry["cls"])
+        var.__setstate__(dict(mesh=mesh,
+                              name=entry["name"],
+                              value=reader.get("var%d.value" % i, IDs),
+                              unit=entry["unit"],
+                              old=old))
+        variables.append(var)
+
+    if header["single"]:
+        return variables[0]
+    else:
+        return variables
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
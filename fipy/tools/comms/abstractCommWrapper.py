@@ -48,6 +48,9 @@ class AbstractCommWrapper(object):
     def allgather(self, obj):
         return obj
 
+    def gather(self, obj, root=0):
+        return obj
+
     def sum(self, a, axis=None):
         return a.sum(axis=axis)
 
@@ -22,6 +22,10 @@ def write(data, filename = None, extension = '', communicator=parallelComm):
     Pickle an object and write it to a file. Wrapper for
     `cPickle.dump()`.
 
+    For large meshes or many processors, :func:`fipy.tools.checkpoint.write`
+    stores `CellVariable` objects in a binary format that is much faster to
+    read back.
+
     Test to check pickling and unpickling.
 
         >>> from fipy.meshes import Grid1D
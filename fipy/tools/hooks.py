@@ -0,0 +1,223 @@
+"""Event hooks for profiling the assembly and solution of equations
+
+Any callable taking an event name and a dictionary of information can
+be registered with :func:`register` to be notified whenever FiPy builds
+or solves a linear system.  No information is gathered (and no clock is
+read) unless at least one hook is registered.
+
+The events, and the information that accompanies them, are
+
+``"build"``
+    emitted by :meth:`~fipy.terms.term.Term._prepareLinearSystem` once the
+    matrix of a `Term` has been assembled: `term`, `var`, `solver`,
+    `time` (seconds spent building), `size` (number of rows) and
+    `nnz` (number of stored entries, or `None` if the matrix cannot tell).
+
+``"solve"``
+    emitted by :meth:`~fipy.solvers.solver.Solver._solve`: `solver`, `var`,
+    `time`, `iterations` and `residual` (the last two are `None` when the
+    solver suite does not report them).
+
+``"sweep"``
+    emitted by :meth:`~fipy.terms.term.Term.sweep`: `term`, `var`,
+    `solver`, `time` (including building and solving) and `residual`.
+
+``"exit"``
+    emitted by :meth:`~fipy.solvers.solver.Solver.__exit__`: `solver`.
+
+The :class:`Collector` aggregates these events for each solution variable
+
+    >>> from fipy import CellVariable, Grid1D, TransientTerm, DiffusionTerm
+    >>> mesh = Grid1D(nx=10)
+    >>> phi = CellVariable(mesh=mesh, name="phi", hasOld=True)
+    >>> psi = CellVariable(mesh=mesh, name="psi", hasOld=True)
+    >>> phi.constrain(1., mesh.facesLeft)
+    >>> eqPhi = TransientTerm() == DiffusionTerm(coeff=psi + 1.)
+    >>> eqPsi = TransientTerm() == DiffusionTerm()
+    >>> with Collector() as collector:
+    ...     for step in range(3):
+    ...         res = eqPhi.sweep(var=phi, dt=1.)
+    ...         res = eqPsi.sweep(var=psi, dt=1.)
+    ...     res = eqPhi.sweep(var=phi, dt=1.)
+    >>> stats = collector.statistics
+    >>> print(sorted(stats.keys()))
+    ['phi', 'psi']
+    >>> print(stats["phi"]["sweep"]["calls"], stats["psi"]["sweep"]["calls"])
+    4 3
+    >>> print(stats["phi"]["build"]["size"], stats["phi"]["build"]["nnz"] > 0)
+    10 True
+    >>> print(stats["phi"]["solve"]["time"] >= 0)
+    True
+
+The collector is removed when the `with` block ends
+
+    >>> print(collector in _hooks)
+    False
+
+and :meth:`Collector.report` tabulates the statistics, most
+expensive first.
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+import time
+
+__all__ = ["register", "unregister", "emit", "Collector"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+_hooks = []
+
+_clock = time.perf_counter
+
+def register(hook):
+    """Call `hook(event, info)` for every subsequent event.
+
+    Returns `hook`, so this function can be used as a decorator.
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+    return hook
+
+def unregister(hook):
+    """Stop notifying `hook` of events.
+    """
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+def emit(event, **info):
+    """Notify the registered hooks of `event`.
+
+    Callers should test `_hooks` first, so that no information is
+    gathered when nobody is listening.
+    """
+    for hook in list(_hooks):
+        hook(event, info)
+
+def _timedSolve(_solve):
+    """Decorate a `Solver._solve` implementation to emit ``"solve"`` events.
+
+    Solvers report convergence by setting `_iterations` and `_residual`
+    in `_solve_`.
+    """
+    def solve(self):
+        if not _hooks:
+            return _solve(self)
+
+        var = self.var
+        self._iterations = self._residual = None
+        start = _clock()
+        result = _solve(self)
+        emit("solve",
+             solver=self,
+             var=var,
+             time=_clock() - start,
+             iterations=self._iterations,
+             residual=self._residual)
+        return result
+
+    solve.__name__ = _solve.__name__
+    solve.__doc__ = _solve.__doc__
+    return solve
+
+def _variableName(var):
+    """Label `var` by its name, or by its class and identity if unnamed.
+    """
+    name = getattr(var, "name", "")
+    if not name:
+        name = "%s at %#x" % (var.__class__.__name__, id(var))
+    return name
+
+class Collector(object):
+    """Aggregate the statistics of build, solve and sweep events.
+
+    Statistics are kept for each `key(info)`, by default the name of the
+    solution variable, so that the most expensive equation of a
+    segregated (or coupled) system can be identified.  For each key and
+    event, the collector accumulates the number of `calls`, the total
+    `time` and the largest single time (`maxTime`).  Build events also
+    record the latest `size` and `nnz`, solve events the total and
+    largest number of `iterations` and the latest `residual`, and sweep
+    events the latest `residual`.
+
+    Parameters
+    ----------
+    key : function
+        Takes the `info` dictionary of an event and returns the label to
+        aggregate it under.
+    """
+
+    def __init__(self, key=None):
+        if key is None:
+            key = lambda info: _variableName(info.get("var"))
+        self.key = key
+        self.reset()
+
+    def reset(self):
+        """Discard all statistics.
+        """
+        self.statistics = {}
+
+    def __call__(self, event, info):
+        if event == "exit":
+            return
+
+        stats = self.statistics.setdefault(self.key(info), {})
+        stat = stats.get(event)
+        if stat is None:
+            stat = stats[event] = dict(calls=0, time=0., maxTime=0.)
+
+        stat["calls"] += 1
+        stat["time"] += info["time"]
+        stat["maxTime"] = max(stat["maxTime"], info["time"])
+
+        if event == "build":
+            stat["size"] = info["size"]
+            stat["nnz"] = info["nnz"]
+        elif event == "solve":
+            iterations = info["iterations"]
+            if iterations is not None:
+                stat["iterations"] = stat.get("iterations", 0) + iterations
+                stat["maxIterations"] = max(stat.get("maxIterations", 0), iterations)
+            stat["residual"] = info["residual"]
+        elif event == "sweep":
+            stat["residual"] = info["residual"]
+
+    def __enter__(self):
+        register(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        unregister(self)
+
+    def report(self):
+        """Tabulate the statistics, ordered by total sweep (or solve) time.
+        """
+        def total(item):
+            stats = item[1]
+            return -max(stats.get(event, {}).get("time", 0.)
+                        for event in ("sweep", "solve", "build"))
+
+        lines = ["%-20s %-6s %8s %12s %12s %10s %12s"
+                 % ("key", "event", "calls", "time", "max time", "its", "residual")]
+        for key, stats in sorted(self.statistics.items(), key=total):
+            for event in ("build", "solve", "sweep"):
+                if event not in stats:
+                    continue
+                stat = stats[event]
+                iterations = stat.get("iterations")
+                residual = stat.get("residual")
+                lines.append("%-20s %-6s %8d %12.6g %12.6g %10s %12s"
+                             % (key, event, stat["calls"], stat["time"], stat["maxTime"],
+                                "" if iterations is None else iterations,
+                                "" if residual is None else "%.6g" % float(residual)))
+        return "\n".join(lines)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,324 @@
+"""Fused evaluation of `Variable` expressions
+
+Evaluating an expression like ``a * b + c`` one operation at a time
+allocates a temporary array for every intermediate result.  When a
+kernel backend is selected, an `_OperatorVariable` instead turns its
+whole (uncached) expression tree into a single expression, which is
+compiled once for each combination of argument types and then
+evaluated in one pass over the arrays.
+
+Available backends are
+
+`numexpr`
+    compiles the expression for the :term:`numexpr` virtual machine
+`numba`
+    compiles the expression into a :term:`Numba` `ufunc`
+
+Select one with the `--numexpr` or `--numba` flags or by setting the
+`FIPY_KERNELS` environment variable to the name of the backend (`auto`
+picks the first one that can be imported).  Operations that a backend
+cannot express, such as indexing or reductions, are evaluated in the
+usual way and their results passed to the kernel.
+
+    >>> from fipy import Variable
+    >>> from fipy.tools import numerix, kernels
+    >>> a = Variable(value=(1., 2., 3.))
+    >>> b = Variable(value=(4., 5., 6.))
+    >>> expression = numerix.sin(a) * b + a**2 / (b - 1)
+    >>> argDict = {}
+    >>> print(expression._getKernelString(argDict=argDict))
+    ((sin(var000) * var01) + (((var100 ** var101)) / (var110 - var111)))
+    >>> print(sorted(argDict.keys()))
+    ['var000', 'var01', 'var100', 'var101', 'var110', 'var111']
+
+    The kernel is compiled the first time the expression is evaluated
+    and reused when its arguments change value, but not type.
+
+    >>> old = kernels.backend
+    >>> _setBackend("numexpr") # doctest: +NUMEXPR
+    >>> print(numerix.allclose(expression,
+    ...                        numerix.sin(a.value) * b.value
+    ...                        + a.value**2 / (b.value - 1))) # doctest: +NUMEXPR
+    True
+    >>> a.value = (7., 8., 9.)
+    >>> print(numerix.allclose(expression,
+    ...                        numerix.sin(a.value) * b.value
+    ...                        + a.value**2 / (b.value - 1))) # doctest: +NUMEXPR
+    True
+    >>> print(len(kernels.backend._kernels)) # doctest: +NUMEXPR
+    1
+
+    >>> _setBackend("numba") # doctest: +NUMBA
+    >>> print(numerix.allclose(expression,
+    ...                        numerix.sin(a.value) * b.value
+    ...                        + a.value**2 / (b.value - 1))) # doctest: +NUMBA
+    True
+    >>> a.value = (1., 2., 3.)
+    >>> print(numerix.allclose(expression,
+    ...                        numerix.sin(a.value) * b.value
+    ...                        + a.value**2 / (b.value - 1))) # doctest: +NUMBA
+    True
+    >>> print(len(kernels.backend._kernels)) # doctest: +NUMBA
+    1
+
+    `remainder` takes the sign of the divisor, which `fmod` does not, so
+    it is evaluated by NumPy
+
+    >>> c = Variable(value=(-3., -1., 0., 1.))
+    >>> _setBackend("numexpr") # doctest: +NUMEXPR
+    >>> print(numerix.remainder(c, 2)) # doctest: +NUMEXPR
+    [ 1.  1.  0.  1.]
+    >>> _setBackend("numba") # doctest: +NUMBA
+    >>> print(numerix.remainder(c, 2)) # doctest: +NUMBA
+    [ 1.  1.  0.  1.]
+    >>> _setBackend(old)
+
+"""
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+__all__ = ["backend"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+import os
+import re
+import sys
+
+from fipy.tools import numerix
+from fipy.tests.doctestPlus import register_skipper
+
+def _hasModule(name):
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+register_skipper(flag="NUMEXPR",
+                 test=lambda: _hasModule("numexpr"),
+                 why="`numexpr` cannot be imported")
+
+register_skipper(flag="NUMBA",
+                 test=lambda: _hasModule("numba"),
+                 why="`numba` cannot be imported")
+
+# functions that every backend can evaluate elementwise
+_functions = ("sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2",
+              "sinh", "cosh", "tanh", "arcsinh", "arccosh", "arctanh",
+              "exp", "expm1", "log", "log10", "log1p", "sqrt", "abs",
+              "floor", "ceil", "fmod")
+
+# functions that are spelled differently, or are operators, in a kernel
+# (`remainder` is not `fmod`, which takes the sign of the dividend)
+_aliases = {"fabs": "abs",
+            "absolute": "abs"}
+
+_operators = {"add": "+",
+              "subtract": "-",
+              "multiply": "*",
+              "divide": "/",
+              "true_divide": "/",
+              "power": "**",
+              "pow": "**",
+              "less": "<",
+              "less_equal": "<=",
+              "greater": ">",
+              "greater_equal": ">=",
+              "equal": "==",
+              "not_equal": "!="}
+
+def _call(function, args):
+    """Spell a function call the way a kernel expects
+
+        >>> print(_call("pow", ["var0", "var1"]))
+        (var0 ** var1)
+        >>> print(_call("fabs", ["var0"]))
+        abs(var0)
+        >>> print(_call("negative", ["var0"]))
+        negative(var0)
+    """
+    if function in _operators and len(args) == 2:
+        return "(%s %s %s)" % (args[0], _operators[function], args[1])
+    return "%s(%s)" % (_aliases.get(function, function), ", ".join(args))
+
+_tokens = re.compile(r"""\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+                             |(?P<name>[A-Za-z_]\w*)
+                             |(?P<operator>\*\*|[<>=!]=|[-+*/%<>&|~(),]))""",
+                     re.VERBOSE)
+
+def _isFusable(expression, argNames):
+    """Check that `expression` only uses arithmetic, comparisons,
+    `_functions` and the arguments in `argNames`
+
+        >>> print(_isFusable("(sin(var0) * var1) + 2.5e-3", ["var0", "var1"]))
+        True
+        >>> print(_isFusable("var0[index]", ["var0"]))
+        False
+        >>> print(_isFusable("var0.any(axis=axis)", ["var0"]))
+        False
+        >>> print(_isFusable("spam(var0)", ["var0"]))
+        False
+    """
+    position = 0
+    while position < len(expression):
+        match = _tokens.match(expression, position)
+        if match is None:
+            if expression[position:].strip():
+                return False
+            break
+        name = match.group("name")
+        if name is not None:
+            isCall = expression[match.end():].lstrip().startswith("(")
+            if isCall and name not in _functions:
+                return False
+            elif not isCall and name not in argNames:
+                return False
+        position = match.end()
+    return True
+
+class _KernelBackend(object):
+    """Compiles expressions into kernels and evaluates them
+
+    Kernels are cached by expression and by the type and
+    dimensionality of each argument.
+    """
+    name = None
+
+    def __init__(self):
+        self._kernels = {}
+
+    def evaluate(self, expression, argDict):
+        """Evaluate `expression` with the arrays in `argDict`
+
+        Returns `None` if the expression cannot be evaluated by this
+        backend, in which case the caller must evaluate it some other
+        way.
+        """
+        names = sorted(argDict.keys())
+        args = []
+        for name in names:
+            arg = argDict[name]
+            if (isinstance(arg, numerix.MA.MaskedArray)
+                or not isinstance(arg, (numerix.ndarray, numerix.generic, int, float, complex))):
+                # masks and units would be lost
+                return None
+            args.append(numerix.asarray(arg))
+
+        signature = (expression,) + tuple((arg.dtype.str, arg.ndim) for arg in args)
+        try:
+            kernel = self._kernels[signature]
+        except KeyError:
+            try:
+                kernel = self._compile(expression, names, args)
+            except Exception:
+                # remember that this expression can't be compiled
+                kernel = None
+            self._kernels[signature] = kernel
+
+        if kernel is None:
+            return None
+
+        result = kernel(*args)
+
+        dtype = numerix.dtype(result.dtype.str)
+        if result.dtype.char != dtype.char:
+            # e.g., `longlong` where NumPy would give `long`
+            result = result.view(dtype)
+
+        return result
+
+    def _compile(self, expression, names, args):
+        raise NotImplementedError
+
+class _NumexprBackend(_KernelBackend):
+    name = "numexpr"
+
+    def __init__(self):
+        import numexpr
+        _KernelBackend.__init__(self)
+
+    def _compile(self, expression, names, args):
+        import numexpr
+        from numexpr.necompiler import getType
+
+        kernel = numexpr.NumExpr(expression,
+                                 signature=[(name, getType(arg)) for name, arg in zip(names, args)],
+                                 truediv=True)
+
+        def evaluate(*args):
+            return kernel(*args, out=None, order='K', casting='safe', ex_uses_vml=False)
+
+        return evaluate
+
+class _NumbaBackend(_KernelBackend):
+    name = "numba"
+
+    def __init__(self):
+        import numba
+        _KernelBackend.__init__(self)
+
+    def _compile(self, expression, names, args):
+        import numba
+
+        if "~" in expression:
+            # Numba inverts booleans bitwise
+            raise SyntaxError("`~` is not supported by the Numba backend")
+
+        namespace = dict((name, getattr(numerix.NUMERIX, name)) for name in _functions)
+        source = "def kernel(%s):\n    return %s\n" % (", ".join(names), expression)
+        exec(compile(source, "<fipy kernel>", "exec"), namespace)
+
+        # a dynamic ufunc compiles a loop for each new combination of dtypes
+        return numba.vectorize(nopython=True)(namespace["kernel"])
+
+_backends = {"numexpr": _NumexprBackend,
+             "numba": _NumbaBackend}
+
+def _makeBackend(name):
+    """Instantiate the backend called `name`
+
+    `"auto"` picks the first backend that can be imported.  `None`, the
+    empty string and `"none"` turn off fused evaluation.
+    """
+    if name in (None, "", "none"):
+        return None
+    elif name == "auto":
+        for name in ("numexpr", "numba"):
+            try:
+                return _backends[name]()
+            except ImportError:
+                pass
+        return None
+    elif name in _backends:
+        return _backends[name]()
+    else:
+        raise ValueError("Unknown kernel backend %s; choose from %s"
+                         % (repr(name), ", ".join(["auto"] + sorted(_backends.keys()))))
+
+def _setBackend(name):
+    """Select the backend called `name`, or the backend object `name`
+    """
+    global backend
+    if isinstance(name, _KernelBackend) or name is None:
+        backend = name
+    else:
+        backend = _makeBackend(name)
+
+def _parseBackend():
+    args = [s.lower() for s in sys.argv[1:]]
+    # any command-line specified backend takes precedence over environment variables
+    for name in sorted(_backends.keys()):
+        if "--%s" % name in args:
+            return name
+    return os.environ.get("FIPY_KERNELS", "").lower()
+
+backend = _makeBackend(_parseBackend())
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -9,7 +9,12 @@ def _suite():
             'dimensions.physicalField',
             'numerix',
             'dump',
+            'checkpoint',
+            'timeSeries',
+            'hooks',
             'vector',
+            'kernels',
+            'bufferPool',
         ), base = __name__)
 
     return theSuite
@@ -0,0 +1,476 @@
+"""Append-only time series of `CellVariable` objects
+
+Writing a :mod:`~fipy.tools.checkpoint`, a :mod:`~fipy.tools.dump` or a
+viewer file at every step stores the mesh again each time.  A time
+series stores the mesh once, when it is created, and then appends the
+values of the same `CellVariable` objects each time
+:meth:`TimeSeriesWriter.write` is called.  Values are stored as raw
+binary arrays, optionally compressed in independent chunks, in the
+same encoding as a checkpoint.  Compression and writing can be done by
+a background thread, so that the simulation does not wait for them.
+
+    >>> from fipy import CellVariable, Grid2D
+    >>> import tempfile, os
+    >>> mesh = Grid2D(nx=3, ny=2)
+    >>> phi = CellVariable(mesh=mesh, name="phi", value=0.)
+    >>> vel = CellVariable(mesh=mesh, name="vel", rank=1, value=mesh.cellCenters)
+    >>> (f, filename) = tempfile.mkstemp(".fipy")
+    >>> with TimeSeriesWriter(filename, (phi, vel), compression="zlib") as writer:
+    ...     for step in range(5):
+    ...         phi.setValue(step * mesh.x)
+    ...         writer.write(time=step * 0.1)
+
+:class:`TimeSeriesReader` reads any step, in any order, without reading
+the others
+
+    >>> reader = TimeSeriesReader(filename)
+    >>> print(len(reader), reader.names)
+    5 ['phi', 'vel']
+    >>> print(numerix.allclose(reader.times, [0., 0.1, 0.2, 0.3, 0.4]))
+    True
+    >>> newPhi, newVel = reader[3]
+    >>> print(newPhi.name, numerix.allclose(newPhi, 3 * mesh.x))
+    phi True
+    >>> print(newVel.rank, numerix.allclose(newVel, mesh.cellCenters))
+    1 True
+    >>> print(numerix.allclose(reader.read(-1, names="phi"), 4 * mesh.x))
+    True
+
+More steps can be appended to an existing time series
+
+    >>> writer = TimeSeriesWriter(filename, (phi, vel), mode="a", asynchronous=True)
+    >>> phi.setValue(-1.)
+    >>> writer.write(time=0.5)
+    >>> writer.close()
+    >>> reader.refresh()
+    >>> print(len(reader), reader.times[-1])
+    6 0.5
+    >>> print(numerix.allclose(reader.read(5, names="phi"), -1.))
+    True
+
+Unnamed variables are told apart by their order
+
+    >>> psi = CellVariable(mesh=mesh, value=mesh.y)
+    >>> chi = CellVariable(mesh=mesh, value=-mesh.y)
+    >>> with TimeSeriesWriter(filename, (psi, chi)) as writer:
+    ...     writer.write(time=0.)
+    >>> newPsi, newChi = TimeSeriesReader(filename)[0]
+    >>> print(numerix.allclose(newPsi, mesh.y), numerix.allclose(newChi, -mesh.y))
+    True True
+    >>> TimeSeriesReader(filename).read(0, names="")
+    Traceback (most recent call last):
+        ...
+    ValueError: 2 stored variables are named ''
+
+but named variables must not share a name
+
+    >>> TimeSeriesWriter(filename, (phi, CellVariable(mesh=mesh, name="phi")))
+    Traceback (most recent call last):
+        ...
+    ValueError: Variables must not share a name
+
+A closed writer cannot write, and only a time series can be appended to
+
+    >>> writer.write(time=1.) # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+        ...
+    OSError: closed
+    >>> with open(filename, "wb") as other:
+    ...     other.write(b"spam") and None
+    >>> TimeSeriesWriter(filename, phi, mode="a") # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+        ...
+    OSError: not a FiPy time series
+
+    >>> os.close(f)
+    >>> os.remove(filename)
+
+The file consists of an 8-byte magic string followed by records, each
+starting on a multiple of 64 bytes.  A record begins with the
+little-endian lengths of its pickled header and of the whole record,
+which are written last, so a record that was cut short (e.g., by a
+crash) is ignored.  The first record describes the mesh and the
+variables and each following record holds one step.
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+import os
+import pickle
+import struct
+import threading
+
+from fipy.tools import numerix
+from fipy.tools import parallelComm
+from fipy.tools.checkpoint import _Writer, _Reader, _aligned, _rootValue
+
+__all__ = ["TimeSeriesWriter", "TimeSeriesReader"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+_MAGIC = b"FIPYTSR1"
+_PREFIX = struct.Struct("<QQ")
+
+def _scan(f, start):
+    """Read the headers of the complete records from `start` on
+
+    Returns a list of ``(position, header)`` and the position just after
+    the last complete record.
+    """
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    records = []
+    position = _aligned(start)
+    while position + _PREFIX.size <= size:
+        f.seek(position)
+        headerLength, recordLength = _PREFIX.unpack(f.read(_PREFIX.size))
+        if headerLength == 0 or position + recordLength > size:
+            break
+        records.append((position, pickle.loads(f.read(headerLength))))
+        position += recordLength
+    return records, position
+
+class TimeSeriesWriter(object):
+    """Append the values of `CellVariable` objects to a time series
+
+    Parameters
+    ----------
+    filename : str
+        Name of the time series file.
+    variables : ~fipy.variables.cellVariable.CellVariable or list of ~fipy.variables.cellVariable.CellVariable
+        The variables to store at each step.  All must be defined on
+        the same mesh.
+    mode : {"w", "a"}
+        Whether to create a new file, or to append to an existing time
+        series of variables with the same names on a mesh with the same
+        number of cells.
+    compression : {None, "zlib"}
+        Compress each array in independent chunks.  Uncompressed steps
+        are read by memory mapping.
+    chunkSize : int
+        Number of bytes in each compressed chunk.
+    asynchronous : bool
+        Compress and write steps in a background thread.
+    maxPending : int
+        Number of steps that may wait for the background thread before
+        :meth:`write` blocks.
+    communicator : ~fipy.tools.comms.commWrapper.CommWrapper
+        A duck-typed object with `procID` and `Nproc` attributes is sufficient
+    """
+    def __init__(self, filename, variables, mode="w", compression=None, chunkSize=2**20,
+                 asynchronous=False, maxPending=2, communicator=parallelComm):
+        from fipy.variables.cellVariable import CellVariable
+
+        if mode not in ("w", "a"):
+            raise ValueError("Unknown mode: %s" % mode)
+        if compression not in (None, "zlib"):
+            raise ValueError("Unknown compression: %s" % compression)
+
+        if isinstance(variables, CellVariable):
+            variables = [variables]
+        self.variables = list(variables)
+
+        mesh = self.variables[0].mesh
+        for var in self.variables:
+            if var.mesh is not mesh:
+                raise ValueError("All variables must be defined on the same mesh")
+
+        named = [var.name for var in self.variables if var.name]
+        if len(set(named)) != len(named):
+            raise ValueError("Variables must not share a name")
+
+        self.filename = filename
+        self.compression = compression
+        self.chunkSize = chunkSize
+        self.communicator = communicator
+        self.steps = 0
+
+        self._file = None
+        self._closed = False
+        self._thread = None
+        self._error = None
+
+        failure = None
+        if communicator.procID == 0:
+            try:
+                self._open(mode, mesh)
+            except Exception as error:
+                failure = error
+        # the other processors must not go on to a collective `write()`
+        failure, self.steps = communicator.bcast((failure, self.steps), root=0)
+        if failure is not None:
+            raise failure
+
+        if communicator.procID == 0 and asynchronous:
+            from queue import Queue
+            self._queue = Queue(maxsize=maxPending)
+            self._thread = threading.Thread(target=self._work)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _open(self, mode, mesh):
+        """Open the file on processor 0 and check or write its description
+        """
+        names = [var.name for var in self.variables]
+        if mode == "a" and os.path.exists(self.filename) and os.path.getsize(self.filename) > 0:
+            self._file = open(self.filename, "r+b")
+            if self._file.read(len(_MAGIC)) != _MAGIC:
+                self._file.close()
+                raise IOError("%s is not a FiPy time series" % self.filename)
+            records, self._position = _scan(self._file, len(_MAGIC))
+            if len(records) == 0:
+                self._file.close()
+                raise IOError("%s has no description of its mesh" % self.filename)
+            header = records[0][1]
+            if ([entry["name"] for entry in header["variables"]] != names
+                or header["globalNumberOfCells"] != mesh.globalNumberOfCells):
+                self._file.close()
+                raise ValueError("%s holds different variables or a different mesh" % self.filename)
+            self.steps = len(records) - 1
+            # discard any record that was cut short
+            self._file.truncate(self._position)
+        else:
+            self._file = open(self.filename, "wb")
+            self._file.write(_MAGIC)
+            self._position = len(_MAGIC)
+
+            writer = _Writer(compression=self.compression, chunkSize=self.chunkSize)
+            meshState = writer.addState("mesh.", mesh.__getstate__())
+            self._append(writer, dict(kind="mesh",
+                                      meshClass=mesh.__class__,
+                                      meshState=meshState,
+                                      globalNumberOfCells=mesh.globalNumberOfCells,
+                                      variables=[dict(name=var.name,
+                                                      unit=var.unit,
+                                                      elementshape=var.shape[:-1])
+                                                 for var in self.variables]))
+
+    def _append(self, writer, header):
+        """Write a record at the end of the file
+        """
+        position = _aligned(self._position)
+        bodySize = writer.layout()
+        headerBytes = writer.pickleHeader(header, start=position + _PREFIX.size)
+        end = _aligned(header["bodyOffset"] + bodySize)
+
+        f = self._file
+        f.seek(position)
+        f.write(_PREFIX.pack(0, 0))
+        f.write(headerBytes)
+        writer.writeBody(f, header["bodyOffset"])
+        if f.tell() < end:
+            f.seek(end - 1)
+            f.write(b"\0")
+        f.flush()
+        # only now is the record complete
+        f.seek(position)
+        f.write(_PREFIX.pack(len(headerBytes), end - position))
+        f.flush()
+
+        self._position = end
+
+    def _encode(self, time, step, values):
+        writer = _Writer(compression=self.compression, chunkSize=self.chunkSize)
+        for i, value in enumerate(values):
+            writer.add("var%d" % i, value)
+        self._append(writer, dict(kind="step", time=time, step=step))
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is not None and self._error is None:
+                    self._encode(*item)
+            except Exception as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+            if item is None:
+                break
+
+    def _raise(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def write(self, time=None):
+        """Append the current values of the variables
+
+        Parameters
+        ----------
+        time : float
+            The time of this step.  Defaults to the number of steps
+            written before.
+        """
+        if self._closed:
+            raise IOError("%s is closed" % self.filename)
+
+        if time is None:
+            time = self.steps
+
+        # gathering is collective, so all processors must take part
+        values = [_rootValue(var) for var in self.variables]
+
+        if self.communicator.procID == 0:
+            self._raise()
+            if self._thread is not None:
+                # the variables may change before the values are written
+                self._queue.put((time, self.steps, [numerix.array(value) for value in values]))
+            else:
+                self._encode(time, self.steps, values)
+
+        self.steps += 1
+
+    def flush(self):
+        """Wait until all steps are written
+        """
+        if self._thread is not None:
+            self._queue.join()
+        self._raise()
+
+    def close(self):
+        """Write any pending steps and close the file
+        """
+        self._closed = True
+        if self._file is not None:
+            try:
+                if self._thread is not None:
+                    self._queue.put(None)
+                    self._thread.join()
+                    self._thread = None
+                self._raise()
+            finally:
+                self._file.close()
+                self._file = None
+
+        self.communicator.Barrier()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class TimeSeriesReader(object):
+    """Read the steps of a time series written by :class:`TimeSeriesWriter`
+
+    Each processor reads only the values of its own (overlapping) cells.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the time series file.
+    mesh : ~fipy.meshes.mesh.Mesh
+        Mesh to define the variables on. If `None`, the stored mesh is
+        reconstructed.
+    """
+    def __init__(self, filename, mesh=None):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise IOError("%s is not a FiPy time series" % filename)
+            records, self._position = _scan(f, len(_MAGIC))
+        if len(records) == 0:
+            raise IOError("%s has no description of its mesh" % filename)
+
+        self._header = records[0][1]
+        self._steps = [header for position, header in records[1:]]
+
+        if mesh is not None and mesh.globalNumberOfCells != self._header["globalNumberOfCells"]:
+            raise ValueError("%s has %d cells, but the time series has %d"
+                             % (mesh, mesh.globalNumberOfCells, self._header["globalNumberOfCells"]))
+        self._mesh = mesh
+
+    def refresh(self):
+        """Pick up any steps appended since the file was opened
+        """
+        with open(self.filename, "rb") as f:
+            records, self._position = _scan(f, self._position)
+        self._steps.extend(header for position, header in records)
+
+    def __len__(self):
+        return len(self._steps)
+
+    @property
+    def times(self):
+        """The time of each step"""
+        return [header["time"] for header in self._steps]
+
+    @property
+    def names(self):
+        """The names of the stored variables"""
+        return [entry["name"] for entry in self._header["variables"]]
+
+    @property
+    def mesh(self):
+        """The mesh of the stored variables"""
+        if self._mesh is None:
+            meshClass = self._header["meshClass"]
+            mesh = meshClass.__new__(meshClass)
+            mesh.__setstate__(_Reader(self.filename, header=self._header).getState(self._header["meshState"]))
+            self._mesh = mesh
+        return self._mesh
+
+    def read(self, index, names=None):
+        """Read the variables stored at step `index`
+
+        Parameters
+        ----------
+        index : int
+            Number of the step.  Negative numbers count from the last step.
+        names : str or list of str
+            Which variables to read.  Defaults to all of them, which is
+            the only way to read unnamed variables.
+
+        Returns
+        -------
+        ~fipy.variables.cellVariable.CellVariable or list of ~fipy.variables.cellVariable.CellVariable
+            A single variable if `names` is a single name.
+        """
+        from fipy.variables.cellVariable import CellVariable
+
+        single = isinstance(names, str)
+        if names is None:
+            columns = list(range(len(self.names)))
+        else:
+            if single:
+                names = [names]
+            columns = [self._column(name) for name in names]
+
+        mesh = self.mesh
+        IDs = mesh._globalOverlappingCellIDs
+        reader = _Reader(self.filename, header=self._steps[index])
+
+        variables = []
+        for i in columns:
+            entry = self._header["variables"][i]
+            variables.append(CellVariable(mesh=mesh,
+                                          name=entry["name"],
+                                          value=reader.get("var%d" % i, IDs),
+                                          unit=entry["unit"],
+                                          elementshape=entry["elementshape"]))
+
+        if single:
+            return variables[0]
+        else:
+            return variables
+
+    def _column(self, name):
+        """Position of the only stored variable called `name`
+        """
+        columns = [i for i, stored in enumerate(self.names) if stored == name]
+        if len(columns) != 1:
+            raise ValueError("%d stored variables are named %s" % (len(columns), repr(name)))
+        return columns[0]
+
+    def __getitem__(self, index):
+        return self.read(index)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -21,10 +21,11 @@ def _putAdd(vector, ids, additionVector, mask=False):
     if numerix.sometrue(mask):
         if len(vector.shape) < len(additionVector.shape):
             for j in range(vector.shape[0]):
-                for id, value, masked in zip(ids.flat, additionVector[j].flat, mask.flat):
-                    if not masked:
-                        vector[j].flat[id] += value
-        else:
+                if not _bincountAdd(vector[j], ids, additionVector[j], mask):
+                    for id, value, masked in zip(ids.flat, additionVector[j].flat, mask.flat):
+                        if not masked:
+                            vector[j].flat[id] += value
+        elif not _bincountAdd(vector, ids, additionVector, mask):
             for id, value, masked in zip(ids.flat, additionVector.flat, mask.flat):
                 if not masked:
                     vector.flat[id] += value
@@ -32,12 +33,52 @@ def _putAdd(vector, ids, additionVector, mask=False):
     else:
         if len(vector.shape) < len(additionVector.shape):
             for j in range(vector.shape[0]):
-                for id, value in zip(ids.flat, additionVector[j].flat):
-                    vector[j].flat[id] += value
-        else:
+                if not _bincountAdd(vector[j], ids, additionVector[j]):
+                    for id, value in zip(ids.flat, additionVector[j].flat):
+                        vector[j].flat[id] += value
+        elif not _bincountAdd(vector, ids, additionVector):
             for id, value in zip(ids.flat, additionVector.flat):
                 vector.flat[id] += value
 
+def _bincountAdd(vector, ids, additionVector, mask=None):
+    """Vectorized `vector.flat[id] += value` for each unmasked `id` and `value`
+
+    Repeated `ids` accumulate.  Returns `False`, leaving `vector`
+    untouched, unless `vector` is an array of floats and `ids`,
+    `additionVector` (and `mask`) are the same size, with no negative
+    `ids`.
+
+        >>> v = numerix.zeros((2, 2), 'd')
+        >>> print(_bincountAdd(v, numerix.array([0, 3, 3, 1]), numerix.array([1., 2., 3., 4.]),
+        ...                    mask=numerix.array([False, False, False, True])))
+        True
+        >>> print(v)
+        [[ 1.  0.]
+         [ 0.  5.]]
+    """
+    if not isinstance(vector, numerix.ndarray) or vector.dtype.kind != 'f':
+        return False
+
+    ids = numerix.MA.filled(ids, 0).ravel()
+    additionVector = numerix.MA.filled(additionVector, 0).ravel()
+
+    if (ids.dtype.kind not in 'iu'
+        or additionVector.dtype.kind not in 'biuf'
+        or len(ids) != len(additionVector)
+        or (len(ids) > 0 and ids.min() < 0)):
+        return False
+
+    if mask is not None:
+        mask = numerix.asarray(mask, dtype=bool).ravel()
+        if len(mask) != len(ids):
+            return False
+        ids = ids[~mask]
+        additionVector = additionVector[~mask]
+
+    vector += numerix.bincount(ids, weights=additionVector, minlength=vector.size).reshape(vector.shape)
+
+    return True
+
 if inline.doInline:
     ## FIXME: inline version doesn't account for all of the conditions that Python
     ## version does.
@@ -67,6 +67,10 @@ class _AddOverFacesVariable(CellVariable):
         return self._makeValue(value = val)
 
     def _calcValueNoInline(self):
+        summed = self.mesh._addOverCellFaces(self.faceVariable.value)
+        if summed is not None:
+            return summed / self.mesh.cellVolumes
+
         ids = self.mesh.cellFaceIDs
 
         contributions = numerix.take(self.faceVariable, ids, axis=-1)
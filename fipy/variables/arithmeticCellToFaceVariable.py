@@ -29,4 +29,16 @@ class _ArithmeticCellToFaceVariable(_CellToFaceVariable):
         def _calcValue_(self, alpha, id1, id2):
             cell1 = numerix.take(self.var, id1, axis=-1)
             cell2 = numerix.take(self.var, id2, axis=-1)
+            return self._interpolate(cell1, cell2, alpha)
+
+        _calcsInPlace = True
+
+        @staticmethod
+        def _interpolate(cell1, cell2, alpha):
             return (cell2 - cell1) * alpha + cell1
+
+        @staticmethod
+        def _interpolateIn(cell1, cell2, alpha, out, pool):
+            numerix.subtract(cell2, cell1, out=out)
+            numerix.multiply(out, alpha, out=out)
+            return numerix.add(out, cell1, out=out)
@@ -4,6 +4,7 @@ from __future__ import unicode_literals
 
 __docformat__ = 'restructuredtext'
 
+from fipy.tools import numerix
 from fipy.tools.numerix import random
 from fipy.variables.noiseVariable import NoiseVariable
 
@@ -82,7 +83,7 @@ class BetaNoiseVariable(NoiseVariable):
       :alt: histogram of random values with a beta distribution
 
     """
-    def __init__(self, mesh, alpha, beta, name = '', hasOld = 0):
+    def __init__(self, mesh, alpha, beta, name = '', hasOld = 0, seed = None):
         r"""
         Parameters
         ----------
@@ -92,8 +93,12 @@ class BetaNoiseVariable(NoiseVariable):
             The parameter :math:`\alpha`.
         beta : float
             The parameter :math:`\beta`.
+        seed : int
+            Key of the counter-based generator, or `None` to draw from
+            `fipy.tools.numerix.random` on the first processor (see
+            :class:`~fipy.variables.noiseVariable.NoiseVariable`).
         """
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
         self.alpha = self._requires(alpha)
         self.beta = self._requires(beta)
 
@@ -101,6 +106,12 @@ class BetaNoiseVariable(NoiseVariable):
         return random.beta(a = self.alpha, b = self.beta,
                            size = [self.mesh.globalNumberOfCells])
 
+    def _counterRandom(self):
+        # X / (X + Y) for X ~ Gamma(alpha) and Y ~ Gamma(beta)
+        x = self._counterGamma(numerix.asarray(self.alpha), stream=0)
+        y = self._counterGamma(numerix.asarray(self.beta), stream=2**31)
+        return x / (x + y)
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
@@ -15,6 +15,36 @@ class _CellToFaceVariable(FaceVariable):
 
         return self._calcValue_(alpha=alpha, id1=id1, id2=id2)
 
+    def _calcValueIn(self, out):
+        """Interpolate into `out`, taking the cell values on either side
+        of each face into arrays from the mesh's `_BufferPool`
+        """
+        alpha = self.mesh._faceToCellDistanceRatio
+        id1, id2 = self.mesh._adjacentCellIDs
+        pool = self._bufferPool
+        value, borrowed = self.var._borrowValue(pool)
+        try:
+            if (out is None
+                or type(value) is not numerix.ndarray
+                or type(alpha) is not numerix.ndarray
+                or out.shape != value.shape[:-1] + id1.shape
+                or not (out.dtype == value.dtype == alpha.dtype)):
+                cell1 = numerix.take(value, id1, axis=-1)
+                cell2 = numerix.take(value, id2, axis=-1)
+                return self._interpolate(cell1, cell2, alpha)
+
+            cell1 = pool.take(out.shape, out.dtype)
+            cell2 = pool.take(out.shape, out.dtype)
+            numerix.NUMERIX.take(value, id1, axis=-1, out=cell1, mode='clip')
+            numerix.NUMERIX.take(value, id2, axis=-1, out=cell2, mode='clip')
+            out = self._interpolateIn(cell1, cell2, alpha, out=out, pool=pool)
+            pool.give(cell1)
+            pool.give(cell2)
+            return out
+        finally:
+            if borrowed:
+                pool.give(value)
+
     def release(self, constraint):
         """Remove `constraint` from `self`
 
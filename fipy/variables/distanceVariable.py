@@ -49,7 +49,7 @@ def _parseLSMSolver():
 LSM_SOLVER = _parseLSMSolver()
 
 register_skipper(flag="LSM",
-                 test=lambda : LSM_SOLVER is not None,
+                 test=lambda : LSM_SOLVER in ('lsmlib', 'skfmm'),
                  why="neither `lsmlib` nor `skfmm` can be found on the $PATH")
 
 register_skipper(flag="LSMLIB",
@@ -223,6 +223,40 @@ class DistanceVariable(CellVariable):
     >>> print(numerix.allclose(var, answer, rtol=1e-9)) #doctest: +SKFMM
     True
 
+    Meshes that are not grids, 3D meshes (for `lsmlib`) and narrow
+    bands are handled by a built-in, first order, solver (see
+    :mod:`fipy.variables.fastMarching`), which is also used when neither
+    `lsmlib` nor `skfmm` is available, or when the `FIPY_LSM` environment
+    variable is set to `fipy`.
+
+    >>> from fipy.meshes import Grid3D
+    >>> mesh = Grid3D(nx=10, ny=10, nz=10, communicator=serialComm)
+    >>> x, y, z = mesh.cellCenters
+    >>> var = DistanceVariable(mesh=mesh, value=numerix.where(z > 4., 1., -1.))
+    >>> var.calcDistanceFunction(narrowBand=3)
+    >>> print(numerix.allclose(var[abs(z - 4.) < 4], (z - 4.)[abs(z - 4.) < 4]))
+    True
+    >>> print(numerix.allclose(var[abs(z - 4.) > 4], numerix.sign(z - 4.)[abs(z - 4.) > 4]))
+    True
+
+    A variable is extended from the cells on the positive side of the
+    zero level set
+
+    >>> extensionVar = CellVariable(mesh=mesh, value=x * (z > 4.))
+    >>> var.extendVariable(extensionVar)
+    >>> print(numerix.allclose(extensionVar, x))
+    True
+
+    The zero level set on an unstructured mesh
+
+    >>> from fipy.meshes import Tri2D
+    >>> mesh = Tri2D(nx=5, ny=5)
+    >>> x, y = mesh.cellCenters
+    >>> var = DistanceVariable(mesh=mesh, value=x - 2.5)
+    >>> var.calcDistanceFunction()
+    >>> interior = (y > 1) & (y < 4)
+    >>> print(numerix.allclose(var[interior], (x - 2.5)[interior], atol=0.05))
+    True
     """
     def __init__(self, mesh, name = '', value = 0., unit = None, hasOld = 0):
         """
@@ -248,7 +282,27 @@ class DistanceVariable(CellVariable):
     def _calcValue(self):
         return self._value
 
-    def extendVariable(self, extensionVariable, order=2):
+    @property
+    def _fastMarching(self):
+        if not hasattr(self, "_fastMarchingSolver"):
+            from fipy.variables.fastMarching import _FastMarching
+            self._fastMarchingSolver = _FastMarching(self.mesh)
+        return self._fastMarchingSolver
+
+    def _externalLSMSolver(self, narrowBand):
+        """Name of the library to solve with, or `None` for the built-in solver.
+        """
+        if narrowBand is None and LSM_SOLVER in ('lsmlib', 'skfmm'):
+            try:
+                self.getLSMshape()
+            except Exception:
+                return None
+            if LSM_SOLVER == 'lsmlib' and hasattr(self.mesh, 'nz'):
+                return None
+            return LSM_SOLVER
+        return None
+
+    def extendVariable(self, extensionVariable, order=2, narrowBand=None):
         """
 
         Calculates the extension of `extensionVariable` from the zero
@@ -258,18 +312,30 @@ class DistanceVariable(CellVariable):
         ----------
         extensionVariable : ~fipy.variables.cellVariable.CellVariable
             The variable to extend from the zero level set.
+        order : {`1`, `2`}
+            The order of accuracy of `lsmlib` or `skfmm`.  The built-in
+            solver is first order.
+        narrowBand : int
+            Only extend to the cells within this many cells of the zero
+            level set (with the built-in solver).
         """
 
+        LSMSolver = self._externalLSMSolver(narrowBand)
+        if LSMSolver is None:
+            tmp, extensionValue = self._fastMarching.solve(self._value,
+                                                           extension=extensionVariable.value,
+                                                           narrowBand=narrowBand)
+            extensionVariable[:] = extensionValue
+            return
+
         dx, shape = self.getLSMshape()
         extensionValue = numerix.reshape(extensionVariable.value, shape)
         phi = numerix.reshape(self._value, shape)
 
-        if LSM_SOLVER == 'lsmlib':
+        if LSMSolver == 'lsmlib':
             from pylsmlib import computeExtensionFields as extension_velocities
-        elif LSM_SOLVER == 'skfmm':
-            from skfmm import extension_velocities
         else:
-            raise Exception("Neither `lsmlib` nor `skfmm` can be found on the $PATH")
+            from skfmm import extension_velocities
 
         tmp, extensionValue = extension_velocities(phi, extensionValue, ext_mask=phi < 0., dx=dx, order=order)
         extensionVariable[:] = extensionValue.flatten()
@@ -278,7 +344,8 @@ class DistanceVariable(CellVariable):
         mesh = self.mesh
 
         if hasattr(mesh, 'nz'):
-            raise Exception("3D meshes not yet implemented")
+            dx = (mesh.dz, mesh.dy, mesh.dx)
+            shape = (mesh.nz, mesh.ny, mesh.nx)
         elif hasattr(mesh, 'ny'):
             dx = (mesh.dy, mesh.dx)
             shape = (mesh.ny, mesh.nx)
@@ -290,7 +357,7 @@ class DistanceVariable(CellVariable):
 
         return dx, shape
 
-    def calcDistanceFunction(self, order=2):
+    def calcDistanceFunction(self, order=2, narrowBand=None):
         """
         Calculates the `distanceVariable` as a distance function.
 
@@ -298,16 +365,24 @@ class DistanceVariable(CellVariable):
         ----------
         order : {`1`, `2`}
             The order of accuracy for the distance function calculation
+            by `lsmlib` or `skfmm`.  The built-in solver is first order.
+        narrowBand : int
+            Only recalculate the cells within this many cells of the
+            zero level set (with the built-in solver).
         """
 
+        LSMSolver = self._externalLSMSolver(narrowBand)
+        if LSMSolver is None:
+            self._value, tmp = self._fastMarching.solve(self._value, narrowBand=narrowBand)
+            self._markFresh()
+            return
+
         dx, shape = self.getLSMshape()
 
-        if LSM_SOLVER == 'lsmlib':
+        if LSMSolver == 'lsmlib':
             from pylsmlib import distance
-        elif LSM_SOLVER == 'skfmm':
-            from skfmm import distance
         else:
-            raise Exception("Neither `lsmlib` nor `skfmm` can be found on the $PATH")
+            from skfmm import distance
 
         self._value = distance(numerix.reshape(self._value, shape), dx=dx, order=order).flatten()
         self._markFresh()
@@ -4,6 +4,7 @@ from __future__ import unicode_literals
 
 __docformat__ = 'restructuredtext'
 
+from fipy.tools import numerix
 from fipy.tools.numerix import random
 from fipy.variables.noiseVariable import NoiseVariable
 
@@ -76,7 +77,7 @@ class ExponentialNoiseVariable(NoiseVariable):
       :alt: histogram of random values with an exponential distribution
 
     """
-    def __init__(self, mesh, mean=0.0, name = '', hasOld = 0):
+    def __init__(self, mesh, mean=0.0, name = '', hasOld = 0, seed = None):
         r"""
         Parameters
         ----------
@@ -84,14 +85,22 @@ class ExponentialNoiseVariable(NoiseVariable):
             The mesh on which to define the noise.
         mean : float
             The mean of the distribution :math:`\mu`.
+        seed : int
+            Key of the counter-based generator, or `None` to draw from
+            `fipy.tools.numerix.random` on the first processor (see
+            :class:`~fipy.variables.noiseVariable.NoiseVariable`).
         """
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
         self.mean = self._requires(mean)
 
     def random(self):
         return random.exponential(scale = self.mean,
                                   size = [self.mesh.globalNumberOfCells])
 
+    def _counterRandom(self):
+        u, _ = self._counterUniforms(stream=0)
+        return -numerix.log1p(-u) * numerix.asarray(self.mean)
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
@@ -45,6 +45,22 @@ class _FaceGradContributions(FaceVariable):
         faceValue = self.var.arithmeticFaceValue.numericValue
         return self.mesh._areaProjections[(slice(0, None, None),) + (numerix.newaxis,) * (len(faceValue.shape) - 1) + (slice(0, None, None),)] * faceValue[numerix.newaxis]
 
+    _calcsInPlace = True
+
+    def _calcValueIn(self, out):
+        faceValue = self.var.arithmeticFaceValue.numericValue
+        areaProjections = self.mesh._areaProjections
+        if (out is not None
+            and type(faceValue) is numerix.ndarray
+            and type(areaProjections) is numerix.ndarray):
+            areaProjections = areaProjections[(slice(0, None, None),) + (numerix.newaxis,) * (len(faceValue.shape) - 1) + (slice(0, None, None),)]
+            faceValue = faceValue[numerix.newaxis]
+            if (out.shape == numerix.broadcast(areaProjections, faceValue).shape
+                and out.dtype == numerix.result_type(areaProjections.dtype, faceValue.dtype)):
+                return numerix.multiply(areaProjections, faceValue, out=out)
+
+        return self._calcValue()
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
@@ -0,0 +1,357 @@
+"""Built-in solver for the distance function and extension velocities
+
+Solves
+
+.. math::
+
+   \\abs{\\nabla \\phi} = 1
+
+from the zero level set of :math:`\\phi`, and
+
+.. math::
+
+   \\nabla u \\cdot \\nabla \\phi = 0
+
+from the values of :math:`u` next to the zero level set, on any mesh.
+Each cell is updated from the values of its neighbors, given by
+`_cellToCellIDs`, using every simplex of up to `dim` neighbors (with
+the cell as its apex) that is upwind of the cell.  The updates are
+made for a whole front of cells at a time, and repeated for the
+neighbors of any cell whose value changed, until no value changes (the
+"fast iterative method").  The solution is first order accurate.
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import itertools
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+
+__all__ = []
+
+# neighbors in directions closer than this (cosine) are treated as parallel
+_PARALLEL = 0.9
+
+class _FastMarching(object):
+    """
+    Distance to a line on an unstructured mesh.  The solution is exact
+    in the interior, but not next to boundaries that cut across the
+    characteristics.
+
+    >>> from fipy import Tri2D
+    >>> mesh = Tri2D(nx=10, ny=10)
+    >>> x, y = mesh.cellCenters.value
+    >>> distance, extension = _FastMarching(mesh).solve(x - 5.)
+    >>> error = abs(distance - (x - 5.))
+    >>> print(error.max() < 0.35, error[(y > 1) & (y < 9)].max() < 0.1)
+    True True
+
+    Distance to a sphere on a 3D mesh, with first order errors
+
+    >>> from fipy import Grid3D
+    >>> mesh = Grid3D(nx=12, ny=12, nz=12)
+    >>> x, y, z = mesh.cellCenters.value
+    >>> r = numerix.sqrt((x - 6.)**2 + (y - 6.)**2 + (z - 6.)**2)
+    >>> distance, extension = _FastMarching(mesh).solve(r - 3.)
+    >>> print(abs(distance - (r - 3.)).max() < 0.7)
+    True
+
+    Only the cells within `narrowBand` cells of the interface are
+    updated
+
+    >>> phi = numerix.where(r > 3., 1., -1.)
+    >>> distance, extension = _FastMarching(mesh).solve(phi, narrowBand=2)
+    >>> print(abs(distance - (r - 3.))[abs(r - 3.) < 1.5].max() < 0.7)
+    True
+    >>> print(numerix.allequal(distance[abs(r - 3.) > 4.], phi[abs(r - 3.) > 4.]))
+    True
+    """
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.dim = mesh.dim
+
+        IDs = mesh._cellToCellIDs
+        self.exterior = MA.getmaskarray(IDs)
+        self.adjacentIDs = numerix.array(mesh._cellToCellIDsFilled)
+
+        centers = numerix.array(mesh.cellCenters.value)
+        displacement = (numerix.take(centers, self.adjacentIDs, axis=1)
+                        - centers[:, numerix.newaxis, :])
+
+        # across periodic boundaries, the cell centers are not adjacent
+        distances = numerix.array(MA.filled(mesh._cellToCellDistances, 1.))
+        lengths = numerix.sqrt(numerix.sum(displacement**2, axis=0))
+        wrapped = abs(lengths - distances) > 1e-6 * distances
+        displacement = numerix.where(wrapped[numerix.newaxis],
+                                     distances * numerix.array(mesh._cellNormals),
+                                     displacement)
+
+        self.displacement = numerix.where(self.exterior[numerix.newaxis], 0., displacement)
+        self.lengths = numerix.sqrt(numerix.sum(self.displacement**2, axis=0))
+        self.units = self.displacement / numerix.where(self.exterior, 1., self.lengths)
+
+        # dot products of the displacements to each pair of neighbors
+        self.gram = numerix.einsum('ian,ibn->abn', self.displacement, self.displacement)
+
+        # simplices of neighbors that span as many dimensions as they have
+        # neighbors, and the cells that they are regular for
+        self.combinations = []
+        for k in range(2, self.dim + 1):
+            for combination in itertools.combinations(range(self.adjacentIDs.shape[0]), k):
+                combination = list(combination)
+                G = self._gram(combination, Ellipsis)
+                Q, det = _invert(G)
+                lengths = numerix.prod(numerix.array([G[a, a] for a in range(k)]), axis=0)
+                regular = ((det > 1e-3 * lengths)
+                           & ~self.exterior[combination].any(axis=0))
+                if regular.any():
+                    self.combinations.append((combination, regular))
+
+    def _gram(self, combination, IDs):
+        return numerix.array([[self.gram[a, b, IDs] for b in combination]
+                              for a in combination])
+
+    def _interfaceDistances(self, phi):
+        """Distances from the cells next to the zero level set to the
+        level set, interpolated linearly along the links to the
+        neighbors on the other side.
+
+        >>> from fipy import Grid2D
+        >>> mesh = Grid2D(nx=2, ny=2)
+        >>> fm = _FastMarching(mesh)
+        >>> interface, distance = fm._interfaceDistances(numerix.array((-1., 1., 1., 1.)))
+        >>> print(interface)
+        [ True  True  True False]
+        >>> print(numerix.allclose(distance[interface],
+        ...                        (1 / numerix.sqrt(8), 0.5, 0.5)))
+        True
+        """
+        positive = phi >= 0
+        crossing = ~self.exterior & (positive[self.adjacentIDs] != positive)
+        interface = crossing.any(axis=0)
+
+        IDs = numerix.nonzero(interface)[0]
+        distance = numerix.zeros(phi.shape, dtype=float)
+        if len(IDs) == 0:
+            return interface, distance
+
+        cross = crossing[:, IDs]
+        here = abs(phi[IDs])
+        there = abs(phi[self.adjacentIDs[:, IDs]])
+        with numerix.errstate(invalid='ignore', divide='ignore'):
+            s = numerix.where(cross,
+                              self.lengths[:, IDs] * here / (here + there),
+                              numerix.inf)
+        s = numerix.where(numerix.isnan(s), 0., s)
+        units = self.units[:, :, IDs]
+        cells = numerix.arange(len(IDs))
+
+        first = numerix.argmin(s, axis=0)
+        s0 = s[first, cells]
+        e0 = units[:, first, cells]
+
+        # nearest crossing in another direction
+        parallel = abs(numerix.sum(units * e0[:, numerix.newaxis], axis=0)) >= _PARALLEL
+        s1 = numerix.where(parallel, numerix.inf, s)
+        second = numerix.argmin(s1, axis=0)
+        has1 = numerix.isfinite(s1[second, cells])
+        s1 = numerix.where(has1, s1[second, cells], 0.)
+        e1 = units[:, second, cells]
+
+        q0 = s0 * e0
+        q1 = s1 * e1
+        b = q1 - q0
+        bb = numerix.sum(b**2, axis=0)
+        v = -q0
+        with numerix.errstate(invalid='ignore', divide='ignore'):
+            r = v - numerix.sum(v * b, axis=0) / bb * b
+        d = numerix.where(has1, numerix.sqrt(numerix.sum(r**2, axis=0)), s0)
+
+        if self.dim == 3:
+            # nearest crossing out of the plane of the first two
+            normal = numerix.cross(e0, e1, axis=0)
+            with numerix.errstate(invalid='ignore', divide='ignore'):
+                # without a second crossing, e1 may be parallel to e0,
+                # but those cells are excluded from s2 below
+                normal /= numerix.sqrt(numerix.sum(normal**2, axis=0))
+            inPlane = abs(numerix.sum(units * normal[:, numerix.newaxis], axis=0)) < (1 - _PARALLEL**2)**0.5
+            s2 = numerix.where(inPlane | parallel | ~has1, numerix.inf, s)
+            third = numerix.argmin(s2, axis=0)
+            has2 = numerix.isfinite(s2[third, cells])
+            q2 = numerix.where(has2, s2[third, cells], 0.) * units[:, third, cells]
+            n = numerix.cross(q1 - q0, q2 - q0, axis=0)
+            with numerix.errstate(invalid='ignore', divide='ignore'):
+                d2 = abs(numerix.sum(q0 * n, axis=0)) / numerix.sqrt(numerix.sum(n**2, axis=0))
+            d = numerix.where(has2, d2, d)
+
+        distance[IDs] = d
+        return interface, distance
+
+    def _update(self, IDs, distance, known, extension):
+        """Upwind values of the `distance` (and the `extension`) at cells
+        `IDs` from their `known` neighbors.
+        """
+        adjacent = self.adjacentIDs[:, IDs]
+        usable = ~self.exterior[:, IDs] & known[adjacent]
+        values = numerix.where(usable, distance[adjacent], numerix.inf)
+        cells = numerix.arange(len(IDs))
+
+        candidates = values + self.lengths[:, IDs]
+        nearest = numerix.argmin(candidates, axis=0)
+        best = candidates[nearest, cells]
+        bestExtension = extension[..., adjacent[nearest, cells]]
+
+        for combination, regular in self.combinations:
+            v = values[combination]
+            sub = numerix.nonzero(regular[IDs] & numerix.isfinite(v).all(axis=0))[0]
+            if len(sub) == 0:
+                continue
+            v = v[:, sub]
+            Q, det = _invert(self._gram(combination, IDs[sub]))
+
+            Qv = (Q * v[numerix.newaxis]).sum(axis=1)
+            a = Q.sum(axis=(0, 1))
+            b = Qv.sum(axis=0)
+            c = (v * Qv).sum(axis=0)
+            discriminant = b**2 - a * (c - 1.)
+            with numerix.errstate(invalid='ignore'):
+                trial = (b + numerix.sqrt(discriminant)) / a
+                weights = (Q * (trial - v)[numerix.newaxis]).sum(axis=1)
+                upwind = ((discriminant >= 0)
+                          & (weights >= -1e-12 * abs(weights).max(axis=0)).all(axis=0)
+                          & (trial < best[sub]))
+            if not upwind.any():
+                continue
+
+            sub, trial, weights = sub[upwind], trial[upwind], weights[:, upwind]
+            weights = numerix.maximum(weights, 0.)
+            weights /= weights.sum(axis=0)
+            best[sub] = trial
+            bestExtension[..., sub] = (weights
+                                       * extension[..., adjacent[combination][:, sub]]).sum(axis=-2)
+
+        return best, bestExtension
+
+    def _neighbors(self, IDs):
+        adjacent = self.adjacentIDs[:, IDs][~self.exterior[:, IDs]]
+        return numerix.unique(adjacent)
+
+    def band(self, interface, width):
+        """Cells within `width` cells of the `interface` cells.
+
+        >>> from fipy import Grid1D
+        >>> fm = _FastMarching(Grid1D(nx=8))
+        >>> interface = numerix.zeros(8, dtype=bool)
+        >>> interface[3] = True
+        >>> print(fm.band(interface, 2).astype(int))
+        [0 1 1 1 1 1 0 0]
+        """
+        inBand = interface.copy()
+        for i in range(width):
+            inBand[self._neighbors(numerix.nonzero(inBand)[0])] = True
+        return inBand
+
+    def solve(self, phi, extension=None, narrowBand=None):
+        """Reinitialize the level set function `phi` to a signed distance.
+
+        Parameters
+        ----------
+        phi : array_like
+            The level set function.
+        extension : array_like
+            Values to extend from the cells with `phi >= 0` next to the
+            zero level set to all other cells.
+        narrowBand : int
+            Only update cells within this many cells of the zero
+            level set.
+
+        Returns
+        -------
+        distance, extension : ndarray
+            The signed distance and the extended values.  Cells that are
+            out of the band (or that cannot be reached from the zero
+            level set) keep their values.
+        """
+        phi = numerix.array(phi, dtype=float)
+        N = len(phi)
+        if extension is None:
+            extension = numerix.zeros((N,), dtype=float)
+        else:
+            extension = numerix.array(extension, dtype=float)
+
+        positive = phi >= 0
+        sign = numerix.where(positive, 1., -1.)
+        interface, distance = self._interfaceDistances(phi)
+
+        if narrowBand is None:
+            inBand = numerix.ones((N,), dtype=bool)
+        else:
+            inBand = self.band(interface, narrowBand)
+
+        # the extension of cells on the negative side of the level set
+        # comes from their neighbors on the positive side
+        sources = interface & positive
+        negative = numerix.nonzero(interface & ~positive)[0]
+        if len(negative) > 0:
+            tmp, extension[..., negative] = self._update(negative, distance, sources, extension)
+
+        known = interface.copy()
+        distance = numerix.where(known, distance, numerix.inf)
+        free = inBand & ~interface
+
+        active = self._neighbors(numerix.nonzero(interface)[0])
+        active = active[free[active]]
+        while len(active) > 0:
+            trial, trialExtension = self._update(active, distance, known, extension)
+            old = distance[active]
+            changed = (trial < old - 1e-12 * abs(trial)) | (numerix.isinf(old) & numerix.isfinite(trial))
+            changed |= numerix.isfinite(trial) & (abs(trialExtension - extension[..., active])
+                                                  > 1e-12 * (1. + abs(trialExtension))).reshape((-1, len(active))).any(axis=0)
+            active = active[changed]
+            distance[active] = trial[changed]
+            extension[..., active] = trialExtension[..., changed]
+            known[active] = True
+
+            active = self._neighbors(active)
+            active = active[free[active]]
+
+        reached = numerix.isfinite(distance)
+        distance = numerix.where(reached & inBand, sign * distance, phi)
+
+        return distance, extension
+
+def _invert(G):
+    """Inverses and determinants of a stack of 2x2 or 3x3 matrices,
+    with the stacking along the last axis.
+
+    >>> G = numerix.array(((2., 1.), (1., 3.)))[..., numerix.newaxis]
+    >>> Q, det = _invert(G)
+    >>> print(numerix.allclose(Q[..., 0].dot(G[..., 0]), numerix.identity(2)), det[0])
+    True 5.0
+    >>> G = numerix.array(((2., 1., 0.), (1., 3., 1.), (0., 1., 4.)))[..., numerix.newaxis]
+    >>> Q, det = _invert(G)
+    >>> print(numerix.allclose(Q[..., 0].dot(G[..., 0]), numerix.identity(3)), det[0])
+    True 18.0
+    """
+    if G.shape[0] == 2:
+        adjugate = numerix.array(((G[1, 1], -G[0, 1]),
+                                  (-G[1, 0], G[0, 0])))
+    else:
+        adjugate = numerix.array([[G[(j + 1) % 3, (i + 1) % 3] * G[(j + 2) % 3, (i + 2) % 3]
+                                   - G[(j + 1) % 3, (i + 2) % 3] * G[(j + 2) % 3, (i + 1) % 3]
+                                   for j in range(3)] for i in range(3)])
+    det = (G[0] * adjugate[:, 0]).sum(axis=0)
+    with numerix.errstate(invalid='ignore', divide='ignore'):
+        return adjugate / det, det
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
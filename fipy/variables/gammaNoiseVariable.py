@@ -4,6 +4,7 @@ from __future__ import unicode_literals
 
 __docformat__ = 'restructuredtext'
 
+from fipy.tools import numerix
 from fipy.tools.numerix import random
 from fipy.variables.noiseVariable import NoiseVariable
 
@@ -81,7 +82,7 @@ class GammaNoiseVariable(NoiseVariable):
       :alt: histogram of random values with a gamma distribution
 
     """
-    def __init__(self, mesh, shape, rate, name = '', hasOld = 0):
+    def __init__(self, mesh, shape, rate, name = '', hasOld = 0, seed = None):
         r"""
         Parameters
         ----------
@@ -91,9 +92,12 @@ class GammaNoiseVariable(NoiseVariable):
             The shape parameter, :math:`\alpha`.
         rate : float
             The rate or inverse scale parameter, :math:`\beta`.
-
+        seed : int
+            Key of the counter-based generator, or `None` to draw from
+            `fipy.tools.numerix.random` on the first processor (see
+            :class:`~fipy.variables.noiseVariable.NoiseVariable`).
         """
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
         self.shapeParam = self._requires(shape)
         self.rate = self._requires(rate)
 
@@ -101,6 +105,11 @@ class GammaNoiseVariable(NoiseVariable):
         return random.gamma(shape=self.shapeParam, scale=self.rate,
                             size=[self.mesh.globalNumberOfCells])
 
+    def _counterRandom(self):
+        # the same parameterization as `random()`
+        return (self._counterGamma(numerix.asarray(self.shapeParam), stream=0)
+                * numerix.asarray(self.rate))
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
@@ -1,5 +1,6 @@
 from __future__ import division
 from __future__ import unicode_literals
+from builtins import range
 __docformat__ = 'restructuredtext'
 
 __all__ = []
@@ -69,6 +70,10 @@ class _GaussCellGradVariable(CellVariable):
         return self._makeValue(value = val)
 
     def _calcValueNoInline(self, N, M, ids, orientations, volumes):
+        summed = self.mesh._addOverCellFaces(self.faceGradientContributions.value)
+        if summed is not None:
+            return summed / volumes
+
         contributions = numerix.take(self.faceGradientContributions, ids, axis=-1)
         grad = numerix.array(numerix.sum(orientations * contributions, -2))
         return grad / volumes
@@ -87,6 +92,55 @@ class _GaussCellGradVariable(CellVariable):
                                            orientations=self.mesh._cellToFaceOrientations,
                                            volumes=self.mesh.cellVolumes)
 
+    @property
+    def _calcsInPlace(self):
+        return not (inline.doInline and self.var.rank == 0)
+
+    def _calcValueIn(self, out):
+        """`_calcValueNoInline()` into `out`
+
+        The contributions of the faces of each cell are added up by the
+        mesh's sparse `_cellFaceSum` operator, directly into `out`, when
+        it is available.  Otherwise they are gathered into an array from the mesh's
+        `_BufferPool`, laid out the way `numerix.sum` lays them out to
+        add them up, so that the sums are identical.
+        """
+        volumes = self.mesh.cellVolumes
+        if (out is not None
+            and self._calcsInPlace
+            and type(volumes) is numerix.ndarray):
+            summed = self.mesh._addOverCellFaces(self.faceGradientContributions.value, out=out)
+            if summed is out:
+                return numerix.true_divide(out, volumes, out=out)
+            elif (summed is not None
+                  and out.shape == summed.shape
+                  and out.dtype == summed.dtype):
+                return numerix.true_divide(summed, volumes, out=out)
+
+        # uniform grids calculate these anew each time, so only ask for
+        # them when they are needed
+        contributions = self.faceGradientContributions.numericValue
+        ids = self.mesh.cellFaceIDs
+        orientations = self.mesh._cellToFaceOrientations
+        if (out is None
+            or not self._calcsInPlace
+            or not all(type(a) is numerix.ndarray for a in (contributions, ids, orientations, volumes))
+            or 0 in contributions.shape + ids.shape
+            or out.shape != contributions.shape[:-1] + ids.shape[-1:]
+            or not (out.dtype == contributions.dtype == volumes.dtype == numerix.dtype(float))):
+            return self._calcValue()
+
+        M = ids.shape[0]
+        pool = self._bufferPool
+        taken = pool.take((M,) + out.shape, out.dtype)
+        for face in range(M):
+            numerix.NUMERIX.take(contributions, ids[face], axis=-1, out=taken[face], mode='clip')
+        numerix.multiply(taken, orientations.reshape((M,) + (1,) * (len(out.shape) - 1) + ids.shape[-1:]),
+                         out=taken)
+        numerix.NUMERIX.dot(numerix.ones((1, M)), taken.reshape((M, -1)), out=out.reshape((1, -1)))
+        pool.give(taken)
+
+        return numerix.true_divide(out, volumes, out=out)
 
 def _test():
     import fipy.tests.doctestPlus
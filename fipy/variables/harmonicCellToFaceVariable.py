@@ -38,6 +38,12 @@ class _HarmonicCellToFaceVariable(_CellToFaceVariable):
         def _calcValue_(self, alpha, id1, id2):
             cell1 = numerix.take(self.var, id1, axis=-1)
             cell2 = numerix.take(self.var, id2, axis=-1)
+            return self._interpolate(cell1, cell2, alpha)
+
+        _calcsInPlace = True
+
+        @staticmethod
+        def _interpolate(cell1, cell2, alpha):
             value = ((cell2 - cell1) * alpha + cell1)
             eps = 1e-20
             value = (value == 0.) * eps + (value != 0.) * value
@@ -46,3 +52,29 @@ class _HarmonicCellToFaceVariable(_CellToFaceVariable):
             value = (cell1Xcell2 >= 0.) * value
 
             return value
+
+        @staticmethod
+        def _interpolateIn(cell1, cell2, alpha, out, pool):
+            """`_interpolate()` into `out`, operation for operation,
+            reusing `cell1` and `cell2` once they have been consumed
+            """
+            value = out
+            numerix.subtract(cell2, cell1, out=value)
+            numerix.multiply(value, alpha, out=value)
+            numerix.add(value, cell1, out=value)
+            eps = 1e-20
+            mask = pool.take(value.shape, bool)
+            other = pool.take(value.shape, bool)
+            cell1Xcell2 = numerix.multiply(cell1, cell2, out=cell1)
+            numerix.multiply(numerix.equal(value, 0., out=mask), eps, out=cell2)
+            numerix.multiply(numerix.not_equal(value, 0., out=mask), value, out=value)
+            numerix.add(cell2, value, out=value)
+            numerix.bitwise_or(numerix.greater(value, eps, out=mask),
+                               numerix.less(value, -eps, out=other), out=mask)
+            numerix.multiply(mask, cell1Xcell2, out=cell2)
+            numerix.true_divide(cell2, value, out=value)
+            numerix.multiply(numerix.greater_equal(cell1Xcell2, 0., out=mask), value, out=value)
+            pool.give(mask)
+            pool.give(other)
+
+            return value
@@ -233,6 +233,12 @@ class _MeshVariable(Variable):
                 or (self.elementshape + self._getShapeFromMesh(self.mesh))
                 or ())
 
+    @property
+    def _bufferPool(self):
+        if self.mesh is None:
+            return Variable._bufferPool.fget(self)
+        return self.mesh._bufferPool
+
     def _dot(a, b, index):
         """
         Workhorse method to calculate the scalar product
@@ -14,6 +14,9 @@ class _ModCellGradVariable(_GaussCellGradVariable):
         self.modIn = modIn
         self.modPy = modPy
 
+    # the gradient must be wrapped after it is calculated
+    _calcsInPlace = False
+
 
     def _calcValueInline(self, N, M, ids, orientations, volumes):
         val = self._array.copy()
@@ -1,6 +1,9 @@
+from __future__ import division
 from __future__ import unicode_literals
+from builtins import range
 __docformat__ = 'restructuredtext'
 
+from fipy.tools import numerix
 from fipy.variables.cellVariable import CellVariable
 
 __all__ = ["NoiseVariable"]
@@ -20,11 +23,57 @@ class NoiseVariable(CellVariable):
     The `seed()` and `get_seed()` functions of the
     `fipy.tools.numerix.random` module can be set and query the random
     number generated used by all `NoiseVariable` objects.
+
+    If a `seed` is given, the noise is instead drawn from the counter-based
+    Philox-4x32 generator [Salmon2011]_, keyed by the `seed`, the number
+    of times the noise has been scrambled (the `step`) and the global ID
+    of each cell.  Each processor generates the values of its own cells
+    only, and the noise does not depend on the number of processors.
+    Variables that should be independent need different seeds.
+
+    >>> from fipy import Grid2D, GaussianNoiseVariable
+    >>> class _Comm(object):
+    ...     def __init__(self, procID, Nproc):
+    ...         self.procID = procID
+    ...         self.Nproc = Nproc
+    >>> serial = GaussianNoiseVariable(mesh=Grid2D(nx=20, ny=20,
+    ...                                            communicator=_Comm(0, 1)),
+    ...                                seed=1234)
+    >>> serial.scramble()
+    >>> for procID in range(4):
+    ...     noise = GaussianNoiseVariable(mesh=Grid2D(nx=20, ny=20,
+    ...                                               communicator=_Comm(procID, 4)),
+    ...                                   seed=1234)
+    ...     noise.scramble()
+    ...     IDs = noise.mesh._globalOverlappingCellIDs
+    ...     print(numerix.allequal(noise.value, serial.value[IDs]))
+    True
+    True
+    True
+    True
+
+    Scrambling moves on to the next `step`; setting the `step` repeats
+    earlier noise
+
+    >>> first = serial.value.copy()
+    >>> serial.scramble()
+    >>> print(numerix.allequal(serial.value, first))
+    False
+    >>> serial.step = 1
+    >>> print(numerix.allequal(serial.value, first))
+    True
+
+    .. [Salmon2011] J. K. Salmon, M. A. Moraes, R. O. Dror and D. E. Shaw,
+       "Parallel random numbers: as easy as 1, 2, 3", *Proceedings of the
+       2011 International Conference for High Performance Computing,
+       Networking, Storage and Analysis* (2011).
     """
-    def __init__(self, mesh, name = '', hasOld = 0):
+    def __init__(self, mesh, name = '', hasOld = 0, seed = None):
         if self.__class__ is NoiseVariable:
             raise NotImplementedError("can't instantiate abstract base class")
 
+        self.seed = seed
+        self._step = -1
         CellVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
         self.scramble()
 
@@ -41,6 +90,18 @@ class NoiseVariable(CellVariable):
         """
         Generate a new random distribution.
         """
+        self._step += 1
+        self._markStale()
+
+    @property
+    def step(self):
+        """Number of times the counter-based noise has been scrambled.
+        """
+        return self._step
+
+    @step.setter
+    def step(self, step):
+        self._step = step
         self._markStale()
 
     def random(self):
@@ -53,9 +114,82 @@ class NoiseVariable(CellVariable):
         else:
             return None
 
+    def _counterRandom(self):
+        """Draw the values of the local cells from the counter-based generator.
+        """
+        raise NotImplementedError
+
+    def _counterUniforms(self, stream, IDs=None):
+        """Two independent uniform samples in [0, 1) for each local cell.
+
+        Parameters
+        ----------
+        stream : int
+            Index of the draw for this `step`.  Distinct streams give
+            independent samples.
+        IDs : array_like of int
+            Local cells to draw for (all by default).
+        """
+        globalIDs = numerix.asarray(self.mesh._globalOverlappingCellIDs, dtype=numerix.uint64)
+        if IDs is not None:
+            globalIDs = globalIDs[IDs]
+        seed = int(self.seed)
+        step = int(self._step)
+        words = _philox4x32(counter=(globalIDs & _MASK32,
+                                     globalIDs >> numerix.uint64(32),
+                                     step & 0xFFFFFFFF,
+                                     stream & 0xFFFFFFFF),
+                            key=(seed & 0xFFFFFFFF, (seed >> 32) & 0xFFFFFFFF))
+        return _uniform(words[0], words[1]), _uniform(words[2], words[3])
+
+    def _counterNormal(self, stream, IDs=None):
+        """Standard normal samples for each local cell, by the Box-Muller transform.
+        """
+        u1, u2 = self._counterUniforms(stream, IDs)
+        return numerix.sqrt(-2. * numerix.log1p(-u1)) * numerix.cos(2. * numerix.pi * u2)
+
+    def _counterGamma(self, shape, stream):
+        """Samples of unit scale gamma distributions for each local cell.
+
+        Uses the rejection method of Marsaglia and Tsang, with each attempt
+        drawn from a stream of its own, so that the samples do not depend
+        on which other cells were rejected.  Streams `stream` and above
+        are used.
+        """
+        N = self.mesh.numberOfCells
+        shape = numerix.array(numerix.broadcast_to(numerix.asarray(shape, dtype=float), (N,)))
+        boost = shape < 1.
+        d = numerix.where(boost, shape + 1., shape) - 1. / 3.
+        c = 1. / numerix.sqrt(9. * d)
+
+        sample = numerix.empty((N,), dtype=float)
+        pending = numerix.arange(N)
+        attempt = 0
+        while len(pending) > 0:
+            z = self._counterNormal(stream + 1 + 2 * attempt, IDs=pending)
+            u, _ = self._counterUniforms(stream + 2 + 2 * attempt, IDs=pending)
+            dp = d[pending]
+            v = (1. + c[pending] * z)**3
+            with numerix.errstate(invalid='ignore', divide='ignore'):
+                accept = (v > 0) & (numerix.log1p(-u)
+                                    < 0.5 * z**2 + dp - dp * v + dp * numerix.log(v))
+            sample[pending[accept]] = dp[accept] * v[accept]
+            pending = pending[~accept]
+            attempt += 1
+
+        if boost.any():
+            # Gamma(a) = Gamma(a + 1) * U**(1 / a) for a < 1
+            u, _ = self._counterUniforms(stream)
+            sample[boost] *= (1. - u[boost])**(1. / shape[boost])
+
+        return sample
+
     def _calcValue(self):
         from fipy.tools import parallelComm
 
+        if self.seed is not None:
+            return self._counterRandom()
+
         rnd = self.parallelRandom()
 
         if parallelComm.Nproc > 1:
@@ -64,3 +198,53 @@ class NoiseVariable(CellVariable):
             return rnd[self.mesh._globalOverlappingCellIDs]
         else:
             return rnd
+
+_MASK32 = numerix.uint64(0xFFFFFFFF)
+_PHILOX_M0 = numerix.uint64(0xD2511F53)
+_PHILOX_M1 = numerix.uint64(0xCD9E8D57)
+_PHILOX_W0 = 0x9E3779B9
+_PHILOX_W1 = 0xBB67AE85
+
+def _philox4x32(counter, key, rounds=10):
+    """The Philox-4x32 bijection of four 32 bit `counter` words under two
+    32 bit `key` words, applied element-wise.
+
+    Known answers from the reference implementation
+
+    >>> def hexify(words):
+    ...     print(" ".join("%08x" % int(w) for w in words))
+    >>> hexify(_philox4x32((0, 0, 0, 0), (0, 0)))
+    6627e8d5 e169c58d bc57ac4c 9b00dbd8
+    >>> hexify(_philox4x32((0xffffffff,) * 4, (0xffffffff,) * 2))
+    408f276d 41c83b0e a20bc7c6 6d5451fd
+    >>> hexify(_philox4x32((0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344),
+    ...                    (0xa4093822, 0x299f31d0)))
+    d16cfe09 94fdcceb 5001e420 24126ea1
+    """
+    c0, c1, c2, c3 = numerix.broadcast_arrays(*[numerix.asarray(c, dtype=numerix.uint64)
+                                                for c in counter])
+    k0, k1 = [numerix.uint64(k) for k in key]
+    for r in range(rounds):
+        p0 = c0 * _PHILOX_M0
+        p1 = c2 * _PHILOX_M1
+        c0, c1, c2, c3 = (((p1 >> numerix.uint64(32)) ^ c1 ^ k0),
+                          p1 & _MASK32,
+                          ((p0 >> numerix.uint64(32)) ^ c3 ^ k1),
+                          p0 & _MASK32)
+        k0 = numerix.uint64((int(k0) + _PHILOX_W0) & 0xFFFFFFFF)
+        k1 = numerix.uint64((int(k1) + _PHILOX_W1) & 0xFFFFFFFF)
+    return c0, c1, c2, c3
+
+def _uniform(high, low):
+    """Double in [0, 1) from the top 53 bits of two 32 bit words.
+    """
+    return (((high >> numerix.uint64(5)) * numerix.uint64(67108864)
+             + (low >> numerix.uint64(6))).astype(float)
+            / 9007199254740992.)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -7,11 +7,132 @@ __docformat__ = 'restructuredtext'
 __all__ = []
 
 import dis
+import re
 import sys
 
 from fipy.variables.variable import Variable
 from fipy.tools import numerix
 
+_instructionCache = {}
+
+def _instructions(code):
+    """Disassemble `code` once; operators are represented over and over
+    """
+    try:
+        return _instructionCache[code]
+    except KeyError:
+        instructions = _instructionCache[code] = list(dis.get_instructions(code))
+        return instructions
+
+# operators that are equivalent to a `ufunc` when applied to arrays
+_binaryUfuncs = {"+": "add",
+                 "-": "subtract",
+                 "*": "multiply",
+                 "/": "true_divide",
+                 "**": "power",
+                 "<": "less",
+                 "<=": "less_equal",
+                 ">": "greater",
+                 ">=": "greater_equal",
+                 "==": "equal",
+                 "!=": "not_equal",
+                 "&": "bitwise_and",
+                 "|": "bitwise_or",
+                 "^": "bitwise_xor"}
+
+_unaryUfuncs = {"-": "negative",
+                "+": "positive",
+                "~": "invert"}
+
+_ufuncPatterns = [re.compile(r"^var(?P<a>\d+) (?P<op>\S+) var(?P<b>\d+)$"),
+                  re.compile(r"^(?P<op>[-+~])\(var(?P<a>\d+)\)$"),
+                  re.compile(r"^(?P<function>[\w.]+)\(var(?P<a>\d+)(?:, var(?P<b>\d+))?\)$")]
+
+_ufuncCache = {}
+
+def _parseUfunc(representation, nargs):
+    """Find the `ufunc` that an operator applies to its arguments
+
+    Returns the `ufunc` and the order in which it takes the arguments,
+    or `None` if the operator is not a `ufunc` of all of its arguments.
+
+        >>> print(_parseUfunc("(var1 - var0)", 2))
+        (<ufunc 'subtract'>, (1, 0))
+        >>> print(_parseUfunc("-(var0)", 1))
+        (<ufunc 'negative'>, (0,))
+        >>> print(_parseUfunc("pow(var0, var1)", 2))
+        (<ufunc 'power'>, (0, 1))
+        >>> print(_parseUfunc("numerix.fabs(var0)", 1))
+        (<ufunc 'fabs'>, (0,))
+        >>> print(_parseUfunc("var0[index]", 1))
+        None
+        >>> print(_parseUfunc("numerix.dot(var0, var1)", 2))
+        None
+    """
+    while representation.startswith("(") and representation.endswith(")"):
+        representation = representation[1:-1]
+
+    for pattern in _ufuncPatterns:
+        match = pattern.match(representation)
+        if match is not None:
+            break
+    else:
+        return None
+
+    groups = match.groupdict()
+    order = tuple(int(groups[arg]) for arg in ("a", "b") if groups.get(arg) is not None)
+    if sorted(order) != list(range(nargs)):
+        return None
+
+    if groups.get("function") is None:
+        if len(order) == 2:
+            name = _binaryUfuncs.get(groups["op"])
+        else:
+            name = _unaryUfuncs.get(groups["op"])
+    elif groups["function"] == "pow":
+        name = "power"
+    elif groups["function"].startswith("numerix."):
+        name = groups["function"][len("numerix."):]
+    else:
+        name = None
+
+    ufunc = getattr(numerix, name, None) if name is not None else None
+    if (not isinstance(ufunc, numerix.ufunc)
+        or ufunc.nin != nargs or ufunc.nout != 1):
+        return None
+
+    return ufunc, order
+
+def _power(base, exponent, out=None):
+    """`numerix.power`, taking the same shortcuts as ``base ** exponent``
+
+    NumPy squares, takes square roots and reciprocals when an array is
+    raised to a scalar power of 2, 0.5 or -1, which is not bitwise
+    identical to `numerix.power`.
+    """
+    if (base.dtype.kind in "fc" and exponent.ndim == 0
+        and exponent.dtype.kind in "iuf"):
+        e = float(exponent)
+        if e == 2.:
+            return numerix.square(base, out=out)
+        elif e == .5:
+            return numerix.sqrt(base, out=out)
+        elif e == -1.:
+            return numerix.reciprocal(base, out=out)
+        elif e == 1.:
+            return numerix.positive(base, out=out)
+        elif e == 0.:
+            if out is None:
+                out = numerix.empty(base.shape, dtype=base.dtype)
+            out[...] = 1
+            return out
+    return numerix.power(base, exponent, out=out)
+
+def _applyUfunc(ufunc, args, out=None):
+    if ufunc is numerix.power:
+        return _power(args[0], args[1], out=out)
+    return ufunc(*args, out=out)
+
 def _OperatorVariableClass(baseClass=object):
     class _OperatorVariable(baseClass):
         def __init__(self, op, var, opShape=(), canInline=True, unit=None, inlineComment=None, valueMattersForUnit=None, *args, **kwargs):
@@ -48,15 +169,120 @@ def _OperatorVariableClass(baseClass=object):
             if not self.canInline:
                 return self._calcValue_()
             else:
-                from fipy.tools import inline
+                from fipy.tools import inline, kernels
                 if inline.doInline:
                     return self._execInline(comment=self.comment)
+                elif kernels.backend is not None:
+                    return self._execKernel()
+                elif self._inPlace and self._ufunc is not None:
+                    return self._calcValueIn(out=None)
                 else:
                     return self._calcValue_()
 
         def _calcValue_(self):
             pass
 
+        @property
+        def _ufunc(self):
+            """The `ufunc` that `op` applies to the values of `var`, and
+            the order in which it takes them, or `None`
+            """
+            if isinstance(self.op, numerix.ufunc):
+                if self.op.nin == len(self.var) and self.op.nout == 1:
+                    return self.op, tuple(range(len(self.var)))
+                return None
+
+            code = getattr(self.op, "__code__", None)
+            if code is None:
+                return None
+            try:
+                return _ufuncCache[code]
+            except KeyError:
+                try:
+                    s = self._getRepresentation(style="ufunc")
+                except SyntaxError:
+                    s = ""
+                ufunc = _ufuncCache[code] = _parseUfunc(s, len(self.var))
+                return ufunc
+
+        @property
+        def _calcsInPlace(self):
+            from fipy.tools import inline, kernels
+            return (self.canInline
+                    and not inline.doInline
+                    and kernels.backend is None
+                    and self._ufunc is not None)
+
+        def _calcValueIn(self, out):
+            """Apply `op` with `out=`, borrowing arrays from the mesh's
+            `_BufferPool` for the values of uncached operands
+            """
+            if not self._calcsInPlace:
+                return self._calcValue()
+            value, borrowed = self._applyIn(out=out, pool=None)
+            return value
+
+        def _borrowValue(self, pool):
+            if (not self._inPlace
+                or self._isCached()
+                or len(self.constraints) > 0
+                or not self._calcsInPlace):
+                return baseClass._borrowValue(self, pool)
+
+            value, borrowed = self._applyIn(out=None, pool=pool)
+            self._setValueInternal(value=None)
+            self._markCalculated()
+            return value, borrowed
+
+        def _applyIn(self, out, pool):
+            """Apply `op` to the values of `var`
+
+            The result is written into `out` if it has the right shape
+            and type, otherwise into an array taken from `pool` (if
+            not `None`) or into a new array.  Returns the result and
+            whether it was taken from `pool`.
+            """
+            ufunc, order = self._ufunc
+            operandPool = self._bufferPool
+            values = []
+            borrowed = []
+            for var in self.var:
+                value, isBorrowed = var._borrowValue(operandPool)
+                values.append(value)
+                if isBorrowed:
+                    borrowed.append(value)
+
+            try:
+                args = [values[i] for i in order]
+                shape = None
+                if all(type(arg) is numerix.ndarray for arg in args):
+                    try:
+                        shape = numerix.broadcast(*args).shape
+                    except ValueError:
+                        pass
+
+                if not shape:
+                    # units, masks, scalars or mismatched shapes
+                    return self.op(*values), False
+
+                # let NumPy decide the type of the result
+                with numerix.errstate(all='ignore'):
+                    dtype = _applyUfunc(ufunc, [arg.reshape(-1)[:1] if arg.ndim else arg
+                                                for arg in args]).dtype
+
+                isBorrowed = False
+                if out is None or out.shape != shape or out.dtype != dtype:
+                    if pool is None:
+                        out = numerix.empty(shape, dtype=dtype)
+                    else:
+                        out = pool.take(shape, dtype)
+                        isBorrowed = True
+
+                return _applyUfunc(ufunc, args, out=out), isBorrowed
+            finally:
+                for value in borrowed:
+                    operandPool.give(value)
+
         def _isCached(self):
             return (Variable._isCached(self)
                     or (len(self.subscribedVariables) > 1 and not self._cacheNever))
@@ -67,24 +293,71 @@ def _OperatorVariableClass(baseClass=object):
             else:
                 s = baseClass._getCstring(self, argDict=argDict, id=id)
             if freshen:
-                self._markFresh()
+                self._markCalculated()
 
             return s
 
+        def _getKernelString(self, argDict={}, id="", freshen=False):
+            if self.canInline:
+                from fipy.tools import kernels
+                kernelArgs = {}
+                try:
+                    s = self._getRepresentation(style="kernel", argDict=kernelArgs, id=id, freshen=freshen)
+                except SyntaxError:
+                    s = None
+                if s is not None and kernels._isFusable(s, list(kernelArgs.keys())):
+                    argDict.update(kernelArgs)
+                    if freshen:
+                        self._markCalculated()
+                    return s
+
+            # the kernel can't express this operation, so calculate it
+            # in the usual way and pass the result to the kernel
+            identifier = 'var%s' % (id)
+            argDict[identifier] = self._calcValue_()
+            if freshen:
+                self._markCalculated()
+
+            return identifier
+
+        def _execKernel(self):
+            """
+            Evaluate the uncached expression tree rooted here as a single
+            fused kernel, using the backend selected in `fipy.tools.kernels`
+            """
+            if self.shape == ():
+                # nothing to gain from fusing scalar operations
+                return self._calcValue_()
+
+            from fipy.tools import kernels
+            argDict = {}
+            s = self._getKernelString(argDict=argDict, freshen=True)
+
+            if s in argDict:
+                # nothing could be fused
+                return argDict[s]
+
+            value = kernels.backend.evaluate(s, argDict)
+            if value is None:
+                value = self._calcValue_()
+
+            return value
+
         def _getRepresentation(self, style="__repr__", argDict={}, id=id, freshen=False):
             """
 
             Parameters
             ----------
-            style : {'__repr__', 'name', 'TeX', 'C'}
+            style : {'__repr__', 'name', 'TeX', 'C', 'kernel', 'ufunc'}
                desired formatting for representation
             """
             if isinstance(self.op, numerix.ufunc):
-                return "%s(%s)" % (self.op.__name__, ", ".join([self.__var(i, style, argDict, id, freshen)
-                                                               for i in range(len(self.var))]))
+                return self.__call(self.op.__name__,
+                                   [self.__var(i, style, argDict, id, freshen) for i in range(len(self.var))],
+                                   style)
 
             try:
-                instructions = dis.get_instructions(self.op.__code__)
+                instructions = _instructions(self.op.__code__)
                 parseInstructions = self._py3kInstructions
             except AttributeError:
                 instructions = [ord(byte) for byte in self.op.__code__.co_code]
@@ -125,6 +398,15 @@ def _OperatorVariableClass(baseClass=object):
                     result = v._variableClass._getCstring(v, argDict,
                                                                id=id + str(i),
                                                                freshen=False)
+            elif style == "kernel":
+                if not v._isCached():
+                    result = v._getKernelString(argDict, id=id + str(i), freshen=freshen)
+                else:
+                    result = v._variableClass._getKernelString(v, argDict,
+                                                               id=id + str(i),
+                                                               freshen=False)
+            elif style == "ufunc":
+                result = "var%d" % i
             else:
                 raise SyntaxError("Unknown style: %s" % style)
 
@@ -195,9 +477,14 @@ def _OperatorVariableClass(baseClass=object):
 
         def _py3kInstructions(self, instructions, style, argDict, id, freshen):
             stack = []
-            
+            kwnames = ()
+
             for ins in instructions:
-                if ins.opname == 'UNARY_CONVERT':
+                if ins.opname in ('RESUME', 'PUSH_NULL', 'PRECALL', 'CACHE', 'NOP',
+                                  'COPY_FREE_VARS', 'MAKE_CELL'):
+                    # Python 3.11 bookkeeping that doesn't affect the expression
+                    continue
+                elif ins.opname == 'UNARY_CONVERT':
                     stack.append("`" + stack.pop() + "`")
                 elif ins.opname == 'BINARY_SUBSCR':
                     stack.append(stack.pop(-2) + "[" + stack.pop() + "]")
@@ -205,14 +492,20 @@ def _OperatorVariableClass(baseClass=object):
                     s = stack.pop()
                     if style == 'C':
                         return s.replace('numerix.', '').replace('arc', 'a')
+                    elif style == 'kernel':
+                        return s.replace('numerix.', '')
                     else:
                         return s
                 elif ins.opname == 'LOAD_CONST':
-                    stack.append(ins.argval)
-                elif ins.opname == 'LOAD_ATTR':
+                    if isinstance(ins.argval, tuple):
+                        # keyword names of CALL_FUNCTION_KW
+                        stack.append(ins.argval)
+                    else:
+                        stack.append(repr(ins.argval))
+                elif ins.opname in ('LOAD_ATTR', 'LOAD_METHOD'):
                     stack.append(stack.pop() + "." + ins.argval)
                 elif ins.opname == 'COMPARE_OP':
-                    stack.append(stack.pop(-2) + " " + dis.cmp_op[ins.arg] + " " + stack.pop())
+                    stack.append(stack.pop(-2) + " " + ins.argval + " " + stack.pop())
                 elif ins.opname == 'LOAD_GLOBAL':
                     stack.append(ins.argval)
                 elif ins.opname == 'LOAD_FAST':
@@ -220,7 +513,7 @@ def _OperatorVariableClass(baseClass=object):
                 elif ins.opname == 'CALL_FUNCTION':
                     # args are last ins.arg items on stack
                     args, stack = stack[-ins.arg:], stack[:-ins.arg]
-                    stack.append(stack.pop() + "(" + ", ".join(args) + ")")
+                    stack.append(self.__call(stack.pop(), args, style))
                 elif ins.opname == 'CALL_FUNCTION_KW':
                     kws = list(stack.pop())
                     # args are last ins.arg items on stack
@@ -228,7 +521,19 @@ def _OperatorVariableClass(baseClass=object):
                     kwargs = []
                     while kws:
                         kwargs.append(kws.pop() + "=" + args.pop())
-                    stack.append(stack.pop() + "(" + ", ".join(args + kwargs) + ")")
+                    stack.append(self.__call(stack.pop(), args + kwargs, style))
+                elif ins.opname == 'KW_NAMES':
+                    kwnames = list(self.op.__code__.co_consts[ins.arg])
+                elif ins.opname == 'CALL':
+                    # args are last ins.arg items on stack,
+                    # the last of which are named by a preceding KW_NAMES
+                    args, stack = stack[len(stack) - ins.arg:], stack[:len(stack) - ins.arg]
+                    kwargs = []
+                    while kwnames:
+                        kwargs.insert(0, kwnames.pop() + "=" + args.pop())
+                    stack.append(self.__call(stack.pop(), args + kwargs, style))
+                elif ins.opname == 'BINARY_OP':
+                    stack.append(stack.pop(-2) + " " + ins.argrepr + " " + stack.pop())
                 elif ins.opname == 'LOAD_DEREF':
                     stack.append(ins.argval)
                 elif ins.opcode in self._unop:
@@ -238,6 +543,13 @@ def _OperatorVariableClass(baseClass=object):
                 else:
                     raise SyntaxError("Unknown instruction: %s" % repr(ins))
 
+        def __call(self, function, args, style):
+            if style == 'kernel':
+                from fipy.tools import kernels
+                return kernels._call(function.replace('numerix.', ''), args)
+            else:
+                return function + "(" + ", ".join(args) + ")"
+
         @property
         def _varProxy(self):
             """list of dimensional scalars that stand in for `self.var`
@@ -1203,6 +1515,42 @@ def _testBinOp(self):
     """
     pass
 
+def _testInPlace(self):
+    """
+    Test of in-place evaluation
+
+    Intermediate results are written into arrays recycled from the
+    mesh's `_BufferPool`, so reevaluating an expression only allocates
+    its result.
+
+        >>> from fipy import Grid1D, CellVariable
+        >>> from fipy.tools import kernels
+        >>> mesh = Grid1D(nx=3)
+        >>> phi = CellVariable(mesh=mesh, value=(1., 2., 4.))
+        >>> D = (1 - phi)**2 / (1 + phi)
+        >>> old, oldBackend = Variable._inPlace, kernels.backend
+        >>> Variable._inPlace = True
+        >>> kernels._setBackend(None)
+        >>> print(D)
+        [ 0.          0.33333333  1.8       ]
+        >>> allocations = mesh._bufferPool.allocations
+        >>> phi.value = (3., 2., 1.)
+        >>> print(D)
+        [ 1.          0.33333333  0.        ]
+        >>> print(mesh._bufferPool.allocations == allocations)
+        True
+
+    Operators that are not `ufunc` objects are evaluated as usual
+
+        >>> E = (D * phi).sum()
+        >>> print(numerix.allclose(E, 11. / 3))
+        True
+
+        >>> Variable._inPlace = old
+        >>> kernels._setBackend(oldBackend)
+    """
+    pass
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
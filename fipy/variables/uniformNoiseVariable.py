@@ -45,7 +45,7 @@ class UniformNoiseVariable(NoiseVariable):
        :align: center
        :alt: histogram of random values with a uniform distribution
     """
-    def __init__(self, mesh, name = '', minimum = 0., maximum = 1., hasOld = 0):
+    def __init__(self, mesh, name = '', minimum = 0., maximum = 1., hasOld = 0, seed = None):
         """
         Parameters
         ----------
@@ -55,15 +55,23 @@ class UniformNoiseVariable(NoiseVariable):
             The minimum (not-inclusive) value of the distribution.
         maximum : float
             The maximum (not-inclusive) value of the distribution.
+        seed : int
+            Key of the counter-based generator, or `None` to draw from
+            `fipy.tools.numerix.random` on the first processor (see
+            :class:`~fipy.variables.noiseVariable.NoiseVariable`).
         """
         self.minimum = minimum
         self.maximum = maximum
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
 
     def random(self):
         return random.uniform(self.minimum, self.maximum,
                               size=[self.mesh.globalNumberOfCells])
 
+    def _counterRandom(self):
+        u, _ = self._counterUniforms(stream=0)
+        return self.minimum + (self.maximum - self.minimum) * u
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
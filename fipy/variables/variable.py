@@ -11,11 +11,34 @@ from fipy.tools.dimensions import physicalField
 from fipy.tools import numerix
 from fipy.tools import parser
 from fipy.tools import inline
+from fipy.tools.bufferPool import _BufferPool
 
 __all__ = ["Variable"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
+# scratch arrays for `Variable` objects that don't live on a mesh
+_bufferPool = _BufferPool()
+
+# Changes to any `Variable` are numbered in order, so that a cached
+# `Variable` can tell whether it is stale by comparing the revision at
+# which it was last calculated with the latest revision at which anything
+# it depends on changed.
+_revision = 0
+
+def _advanceRevision():
+    global _revision
+    _revision += 1
+    return _revision
+
+# bumped when dependencies are added to a `Variable` that other variables
+# depend on, which invalidates flattened dependencies
+_topology = 0
+
+# variables whose latest change is being worked out
+_verifying = set()
+_cyclic = False
+
 class Variable(object):
     """
     Lazily evaluated quantity with units.
@@ -46,8 +69,24 @@ class Variable(object):
     if parser.parse("--cache", action="store_true"):
         _cacheAlways = True
 
+    _inPlace = (os.getenv("FIPY_INPLACE") is not None) or False
+    if parser.parse("--inplace", action="store_true"):
+        _inPlace = True
+
     _cacheNever = False
 
+    # revision at which the value of `self` last changed
+    _changedAt = 0
+    # revision as of which the value of `self` was last calculated
+    _freshAt = -1
+    # latest change of `self` or anything it depends on,
+    # as last worked out at revision `_verifiedAt`
+    _latest = 0
+    _verifiedAt = -1
+    # see `_getUpstream`
+    _upstream = None
+    _upstreamAt = -1
+
     def __new__(cls, *args, **kwds):
         return object.__new__(cls)
 
@@ -92,8 +131,8 @@ class Variable(object):
 
         self._cached = cached
 
-        self.stale = 1
-        self._markFresh()
+        # nothing can depend on `self` yet
+        self._changedAt = self._freshAt = _revision
 
 ##    __array_priority__ and __array_wrap__ are required to override
 ##    the default behavior of numpy. If a numpy array and a Variable
@@ -434,6 +473,26 @@ class Variable(object):
          else:
              return identifier + self._getCIndexString(shape)
 
+    def _getKernelString(self, argDict={}, id="", freshen=None):
+        """
+        Generate the expression and arguments to be evaluated by a fused
+        kernel (see `fipy.tools.kernels`)
+
+            >>> from future.utils import text_to_native_str as ttns
+
+            >>> argDict = {}
+            >>> ttns((Variable((1, 2)) * Variable(3))._getKernelString(argDict=argDict))
+            '(var0 * var1)'
+            >>> print(argDict["var1"])
+            3
+
+        freshen is ignored
+        """
+        identifier = 'var%s' % (id)
+        argDict[identifier] = self.value
+
+        return identifier
+
     def tostring(self, max_line_width=75, precision=8, suppress_small=False, separator=' '):
         return numerix.tostring(self.value,
                                 max_line_width=max_line_width,
@@ -489,13 +548,17 @@ class Variable(object):
 
         """
 
-        if self.stale or not self._isCached() or self._value is None:
-            value = self._calcValue()
+        if not self._isCached() or self._value is None or self.stale:
+            revision = _revision
+            if self._inPlace and self._isCached():
+                value = self._calcValueInPlace()
+            else:
+                value = self._calcValue()
             if self._isCached():
                 self._setValueInternal(value=value)
             else:
                 self._setValueInternal(value=None)
-            self._markFresh()
+            self._markCalculated(revision)
         else:
             value = self._value
 
@@ -793,6 +856,76 @@ class Variable(object):
     def _calcValue(self):
         return self._value
 
+    def _calcValueIn(self, out):
+        """Calculate the value, writing it into `out` where possible
+
+        `out` is either `None` or an array, owned by this `Variable`,
+        with the shape and type of the last value.  Returns the value,
+        which must be a new array if it isn't `out`.
+        """
+        return self._calcValue()
+
+    @property
+    def _calcsInPlace(self):
+        """Whether `_calcValueIn()` can write into its `out` argument"""
+        return False
+
+    def _calcValueInPlace(self):
+        """Recalculate the value of a cached `Variable` into the array
+        that holds its last value
+
+        Subsequent evaluations overwrite the array returned by `value`,
+        rather than allocating a new one, once the `Variable` has made
+        an array of its own.
+
+            >>> from fipy import Grid1D, CellVariable
+            >>> mesh = Grid1D(nx=3)
+            >>> phi = CellVariable(mesh=mesh, value=(1., 2., 4.))
+            >>> faceValue = phi.arithmeticFaceValue
+            >>> old = Variable._inPlace
+            >>> Variable._inPlace = True
+            >>> first = faceValue.value
+            >>> phi.value = (3., 2., 1.)
+            >>> second = faceValue.value
+            >>> print(second is first)
+            True
+            >>> print(second)
+            [ 3.   2.5  1.5  1. ]
+            >>> Variable._inPlace = old
+        """
+        buffer = getattr(self, "_valueBuffer", None)
+        if buffer is not None and buffer is self._value:
+            value = self._calcValueIn(out=buffer)
+            owned = True
+        else:
+            value = self._calcValue()
+            owned = False
+
+        self._valueBuffer = None
+        if (self._calcsInPlace
+            and type(value) is numerix.ndarray
+            and value.shape != ()):
+            if not owned:
+                # the value may belong to somebody else
+                value = value.copy()
+            self._valueBuffer = value
+
+        return value
+
+    @property
+    def _bufferPool(self):
+        """Scratch arrays for evaluating the operands of this `Variable`"""
+        return _bufferPool
+
+    def _borrowValue(self, pool):
+        """Evaluate, writing an uncached result into an array taken from
+        `pool`
+
+        Returns the value and whether it should be given back to `pool`
+        once it has been used.
+        """
+        return self.value, False
+
     def _calcValueNoInline(self):
         raise NotImplementedError
 
@@ -800,7 +933,10 @@ class Variable(object):
         raise NotImplementedError
 
     def _getSubscribedVariables(self):
-        self._subscribedVariables = [sub for sub in self._subscribedVariables if sub() is not None]
+        for sub in self._subscribedVariables:
+            if sub() is None:
+                self._subscribedVariables = [sub for sub in self._subscribedVariables if sub() is not None]
+                break
 
         return self._subscribedVariables
 
@@ -810,30 +946,159 @@ class Variable(object):
     subscribedVariables = property(_getSubscribedVariables,
                                    _setSubscribedVariables)
 
-    def __markStale(self):
-        for subscriber in self.subscribedVariables:
-            if subscriber() is not None:
-                ## Even though getSubscribedVariables() strips out dead
-                ## references, subscriber() might still be dead due to the
-                ## vagaries of garbage collection and the possibility that
-                ## later subscribedVariables were removed, changing the
-                ## dependencies of this subscriber.
-                ## See <https://github.com/usnistgov/fipy/issues/103> for more explanation.
-                subscriber()._markStale()
-
     def _markFresh(self):
-        self.stale = 0
-        self.__markStale()
+        """Record that the value of `self` has been assigned
+
+        Nothing is done to the variables that depend on `self`; they
+        find out that they are stale the next time they are read.
+        """
+        self._changedAt = self._freshAt = _advanceRevision()
 
     def _markStale(self):
-        if not self.stale:
-            self.stale = 1
-            self.__markStale()
+        """Record that `self` must be recalculated before it is next read
+        """
+        self._changedAt = _advanceRevision()
+
+    def _markCalculated(self, revision=None):
+        """Record that the value of `self` is up to date as of `revision`
+        (by default, the current revision)
+        """
+        if revision is None:
+            revision = _revision
+        self._freshAt = revision
+
+    def _getStale(self):
+        return self._latestChange() > self._freshAt
+
+    def _setStale(self, stale):
+        if stale:
+            self._markStale()
+        else:
+            self._markCalculated()
+
+    stale = property(_getStale, _setStale,
+                     doc="""Whether `self`, or anything it depends on, has
+                     changed since `self` was last calculated
+
+                     Assigning values bumps a revision counter and does
+                     not touch the dependent variables, so a batch of
+                     assignments costs the same no matter how many
+                     variables depend on them
+
+                     >>> a = Variable(value=1.)
+                     >>> b = Variable(value=2.)
+                     >>> c = (a * b + a)
+                     >>> c.cacheMe()
+                     >>> d = c**2
+                     >>> d.cacheMe()
+                     >>> print(d)
+                     9.0
+                     >>> print(c.stale, d.stale)
+                     False False
+                     >>> for i in range(10):
+                     ...     a.value = i
+                     >>> print(c.stale, d.stale)
+                     True True
+
+                     and the graph is only walked once, when a dependent
+                     variable is read
+
+                     >>> print(d)
+                     729.0
+                     >>> print(c.stale, d.stale)
+                     False False
+                     """)
+
+    def _getUpstream(self):
+        """The variables that `self` depends on, flattened
+
+        Returns the variables that `self` depends on, directly or through
+        uncached variables, and the cached variables (that depend on
+        others in turn) where that search stops.  The lists are kept
+        until the shape of the dependency graph changes.
+        """
+        if self._upstreamAt != _topology:
+            direct = []
+            cached = []
+            seen = set([id(self)])
+            stack = list(self.requiredVariables)
+            while stack:
+                var = stack.pop()
+                if id(var) in seen:
+                    continue
+                seen.add(id(var))
+                if len(var.requiredVariables) == 0:
+                    direct.append(var)
+                elif var._isCached():
+                    cached.append(var)
+                else:
+                    direct.append(var)
+                    stack.extend(var.requiredVariables)
+            self._upstream = (direct, cached)
+            self._upstreamAt = _topology
+        return self._upstream
+
+    def _latestChange(self):
+        """Latest revision at which `self`, or any variable it depends
+        on, changed
+
+        The result is remembered until the next revision, so a variable
+        shared by many others is only checked once per revision.
+        Constraints can make the graph cyclic, in which case only the
+        result for the variable that was asked is remembered.
+
+            >>> a = Variable(value=1.)
+            >>> b = a + 1
+            >>> b.cacheMe()
+            >>> c = a._requires(b)
+            >>> print(b)
+            2.0
+            >>> a.value = 5
+            >>> print(b._latestChange() == a._changedAt)
+            True
+            >>> print(b)
+            6.0
+        """
+        global _cyclic
+        revision = _revision
+        if self._verifiedAt == revision:
+            return self._latest
+        if id(self) in _verifying:
+            # `self` depends on itself
+            _cyclic = True
+            return self._changedAt
+
+        outermost = (len(_verifying) == 0)
+        _verifying.add(id(self))
+        try:
+            direct, cached = self._getUpstream()
+            latest = max([self._changedAt]
+                         + [var._changedAt for var in direct]
+                         + [var._latestChange() for var in cached])
+            if outermost or not _cyclic:
+                self._latest = latest
+                self._verifiedAt = revision
+        finally:
+            _verifying.discard(id(self))
+            if outermost:
+                _cyclic = False
+
+        return latest
+
+    def _reshapeGraph(self):
+        """Discard flattened dependencies that may include `self`
+        """
+        global _topology
+        if len(self.subscribedVariables) > 0:
+            _topology += 1
+        else:
+            self._upstreamAt = -1
 
     def _requires(self, var):
         if isinstance(var, Variable):
             self.requiredVariables.append(var)
             var._requiredBy(self)
+            self._reshapeGraph()
         else:
             from fipy.variables.constant import _Constant
             var = _Constant(value=var)
@@ -66,7 +66,7 @@ class Matplotlib2DGridViewer(AbstractMatplotlib2DViewer):
 
     def _getLimit(self, key, default=None):
         limit = AbstractMatplotlib2DViewer._getLimit(self, key, default=default)
-        if limit is None:
+        if limit is None and any(k in key for k in ('xmin', 'xmax', 'ymin', 'ymax')):
             X, Y = self.vars[0].mesh.faceCenters
             if 'xmin' in key:
                 limit = float(min(X))
@@ -96,8 +96,15 @@ class Matplotlib2DGridViewer(AbstractMatplotlib2DViewer):
         return reshape(array(self.vars[0]), self.vars[0].mesh.shape[::-1])[::-1]
 
     def _plot(self):
-        self.norm.vmin = self._getLimit(('datamin', 'zmin'))
-        self.norm.vmax = self._getLimit(('datamax', 'zmax'))
+        datamin = self._getLimit(('datamin', 'zmin'))
+        datamax = self._getLimit(('datamax', 'zmax'))
+
+        if not self._changedSinceDrawn(self.vars[0].value, datamin, datamax,
+                                       self.norm.__class__):
+            return False
+
+        self.norm.vmin = datamin
+        self.norm.vmax = datamax
 
         self.image.set_data(self.norm(self._data))
 
@@ -23,11 +23,24 @@ class Matplotlib2DViewer(AbstractMatplotlib2DViewer):
     The `Matplotlib2DViewer` plots a 2D `CellVariable` using Matplotlib_.
 
     .. _Matplotlib: http://matplotlib.sourceforge.net/
+
+    Drawing every cell as a polygon takes longer than many time steps on
+    meshes of millions of cells, so large meshes are instead rasterized:
+    the cells are drawn once, off screen, to find the cell covering each
+    pixel of the axes, and every plot only looks up the values of those
+    cells.  The map from pixels to cells is kept until the axes are
+    resized or their limits change.
     """
 
     __doc__ += AbstractMatplotlib2DViewer._test2Dirregular(viewer="Matplotlib2DViewer")
 
-    def __init__(self, vars, title=None, limits={}, cmap=None, colorbar='vertical', axes=None, figaspect='auto', **kwlimits):
+    # meshes with more cells are rasterized by default
+    _rasterizeThreshold = 100000
+
+    # cell IDs, plus 1 for the background, are encoded in 24 bits of RGB
+    _maxRasterizedCells = 2**24 - 1
+
+    def __init__(self, vars, title=None, limits={}, cmap=None, colorbar='vertical', axes=None, figaspect='auto', rasterize=None, **kwlimits):
         """Creates a `Matplotlib2DViewer`.
 
         Parameters
@@ -52,6 +65,10 @@ class Matplotlib2DViewer(AbstractMatplotlib2DViewer):
             desired aspect ratio of figure. If arg is a number, use that aspect
             ratio. If arg is `auto`, the aspect ratio will be determined from
             the Variable's mesh.
+        rasterize : bool, optional
+            draw the cells as an image at the resolution of the axes,
+            rather than as polygons.  If `None`, meshes of more than
+            100000 cells, and fewer than 2**24, are rasterized.
         """
         kwlimits.update(limits)
         AbstractMatplotlib2DViewer.__init__(self, vars=vars, title=title, figaspect=figaspect,
@@ -60,6 +77,15 @@ class Matplotlib2DViewer(AbstractMatplotlib2DViewer):
 
         self.mesh = self.vars[0].mesh
 
+        if rasterize is None:
+            rasterize = (self._rasterizeThreshold
+                         < self.mesh.numberOfCells
+                         <= self._maxRasterizedCells)
+        elif rasterize and self.mesh.numberOfCells > self._maxRasterizedCells:
+            raise ValueError("Only meshes of at most %d cells can be rasterized"
+                             % self._maxRasterizedCells)
+        self.rasterize = rasterize
+
         vertexIDs = self.mesh._orderedCellVertexIDs
 
         vertexCoords = self.mesh.vertexCoords
@@ -67,6 +93,33 @@ class Matplotlib2DViewer(AbstractMatplotlib2DViewer):
         xCoords = numerix.take(vertexCoords[0], vertexIDs)
         yCoords = numerix.take(vertexCoords[1], vertexIDs)
 
+        xmin = self._getLimit('xmin', default=xCoords.min())
+        xmax = self._getLimit('xmax', default=xCoords.max())
+        ymin = self._getLimit('ymin', default=yCoords.min())
+        ymax = self._getLimit('ymax', default=yCoords.max())
+
+        if self.rasterize:
+            # repeat the last vertex of cells with fewer vertices than
+            # others, so that all polygons have the same length
+            missing = numerix.MA.getmaskarray(xCoords)
+            X = numerix.array(numerix.MA.filled(xCoords, 0.), dtype=float)
+            Y = numerix.array(numerix.MA.filled(yCoords, 0.), dtype=float)
+            for j in range(1, X.shape[0]):
+                X[j] = numerix.where(missing[j], X[j-1], X[j])
+                Y[j] = numerix.where(missing[j], Y[j-1], Y[j])
+            self._cellVertices = numerix.array((X, Y)).transpose(2, 1, 0)
+            self._rasterMap = None
+            self.image = self.axes.imshow(numerix.zeros((1, 1)),
+                                          extent=(xmin, xmax, ymin, ymax),
+                                          origin='lower', interpolation='nearest',
+                                          aspect='auto',
+                                          vmin=0, vmax=1,
+                                          cmap=self.cmap)
+            self.axes.set_xlim(xmin=xmin, xmax=xmax)
+            self.axes.set_ylim(ymin=ymin, ymax=ymax)
+            self._plot()
+            return
+
         polys = []
 
         for x, y in zip(xCoords.swapaxes(0, 1), yCoords.swapaxes(0, 1)):
@@ -85,11 +138,6 @@ class Matplotlib2DViewer(AbstractMatplotlib2DViewer):
             # PolyCollection not child of PatchCollection in matplotlib 0.98
             self.axes.add_collection(self.collection)
 
-        xmin = self._getLimit('xmin', default=xCoords.min())
-        xmax = self._getLimit('xmax', default=xCoords.max())
-        ymin = self._getLimit('ymin', default=yCoords.min())
-        ymax = self._getLimit('ymax', default=yCoords.max())
-
         self.axes.set_xlim(xmin=xmin, xmax=xmax)
         self.axes.set_ylim(ymin=ymin, ymax=ymax)
 
@@ -117,13 +165,32 @@ class Matplotlib2DViewer(AbstractMatplotlib2DViewer):
 
         Z = self.vars[0].value
 
-        self.norm.vmin = self._getLimit(('datamin', 'zmin'))
-        self.norm.vmax = self._getLimit(('datamax', 'zmax'))
+        datamin = self._getLimit(('datamin', 'zmin'))
+        datamax = self._getLimit(('datamax', 'zmax'))
+
+        if self.rasterize:
+            rasterKey = self._rasterKey
+        else:
+            rasterKey = None
+
+        if not self._changedSinceDrawn(Z, datamin, datamax, rasterKey,
+                                       self.cmap, self.norm.__class__):
+            return False
+
+        self.norm.vmin = datamin
+        self.norm.vmax = datamax
 
-        rgba = self.cmap(self.norm(Z))
+        if self.rasterize:
+            self.norm.autoscale_None(Z)
+            IDs, outside = self._getRasterMap(rasterKey)
+            self.image.set_data(self.norm(numerix.MA.masked_array(numerix.take(Z, IDs),
+                                                                  mask=outside)))
+            self.image.set_cmap(self.cmap)
+        else:
+            rgba = self.cmap(self.norm(Z))
 
-        self.collection.set_facecolors(rgba)
-        self.collection.set_edgecolors(rgba)
+            self.collection.set_facecolors(rgba)
+            self.collection.set_edgecolors(rgba)
 
         if self.colorbar is not None:
             self.colorbar.plot() #vmin=zmin, vmax=zmax)
@@ -134,6 +201,89 @@ class Matplotlib2DViewer(AbstractMatplotlib2DViewer):
 ##        plt.ylim(ymin=self._getLimit('ymin'),
 ##                 ymax=self._getLimit('ymax'))
 
+    @property
+    def _rasterKey(self):
+        """The limits and pixel size of the axes
+        """
+        bbox = self.axes.get_window_extent()
+        return (tuple(self.axes.get_xlim()), tuple(self.axes.get_ylim()),
+                max(int(round(bbox.width)), 1), max(int(round(bbox.height)), 1))
+
+    def _getRasterMap(self, rasterKey):
+        """The cell shown by each pixel of the axes
+
+        The cells are drawn, without antialiasing, in colors that encode
+        their IDs, and the IDs are read back from the pixels.
+
+            >>> from fipy import Grid2D, CellVariable
+            >>> mesh = Grid2D(nx=3, ny=2)
+            >>> viewer = Matplotlib2DViewer(vars=CellVariable(mesh=mesh),
+            ...                             rasterize=True, colorbar=None)
+            >>> IDs, outside = viewer._getRasterMap(viewer._rasterKey)
+            >>> print(numerix.unique(IDs[~outside]))
+            [0 1 2 3 4 5]
+            >>> print(viewer._getRasterMap(viewer._rasterKey)[0] is IDs)
+            True
+
+        IDs beyond 24 bits of color would wrap around, so larger meshes
+        are drawn as polygons
+
+            >>> class _Small(Matplotlib2DViewer):
+            ...     _rasterizeThreshold = 1
+            ...     _maxRasterizedCells = 5
+            >>> print(_Small(vars=CellVariable(mesh=mesh), colorbar=None).rasterize)
+            False
+            >>> _Small(vars=CellVariable(mesh=mesh), rasterize=True, colorbar=None)
+            Traceback (most recent call last):
+                ...
+            ValueError: Only meshes of at most 5 cells can be rasterized
+
+        Parameters
+        ----------
+        rasterKey : tuple
+            The limits and pixel size of the axes, from `_rasterKey`.
+
+        Returns
+        -------
+        tuple of (ndarray, ndarray)
+            The IDs of the cells shown by the pixels and whether the pixels
+            are outside of the mesh, each of the shape of the image.
+        """
+        if self._rasterMap is None or self._rasterMap[0] != rasterKey:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.collections import PolyCollection
+            from matplotlib.figure import Figure
+
+            (xmin, xmax), (ymin, ymax), width, height = rasterKey
+
+            fig = Figure(figsize=(width / 100., height / 100.), dpi=100,
+                         facecolor="black")
+            canvas = FigureCanvasAgg(fig)
+            axes = fig.add_axes([0, 0, 1, 1])
+            axes.set_axis_off()
+            axes.set_xlim(xmin, xmax)
+            axes.set_ylim(ymin, ymax)
+
+            # 0 is left for the background
+            IDs = numerix.arange(1, len(self._cellVertices) + 1)
+            colors = numerix.array(((IDs >> 16) & 255,
+                                    (IDs >> 8) & 255,
+                                    IDs & 255)).T / 255.
+            axes.add_collection(PolyCollection(self._cellVertices,
+                                               facecolors=colors,
+                                               edgecolors="none",
+                                               linewidths=0,
+                                               antialiaseds=False))
+            canvas.draw()
+
+            rgb = numerix.asarray(canvas.buffer_rgba())[::-1, :, :3].astype(int)
+            IDs = (rgb[..., 0] << 16) + (rgb[..., 1] << 8) + rgb[..., 2] - 1
+
+            self._rasterMap = (rasterKey, numerix.where(IDs < 0, 0, IDs), IDs < 0)
+            self.image.set_extent((xmin, xmax, ymin, ymax))
+
+        return self._rasterMap[1:]
+
 if __name__ == "__main__":
     import fipy.tests.doctestPlus
     fipy.tests.doctestPlus.execButNoTest()
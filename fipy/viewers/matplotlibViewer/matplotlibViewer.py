@@ -154,14 +154,14 @@ class AbstractMatplotlibViewer(AbstractViewer):
 
         plt.ioff()
 
-        self._plot()
+        # `_plot()` returns `False` when nothing has changed since the last draw
+        if self._plot() is not False:
+            plt.draw()
 
-        plt.draw()
-
-        try:
-            fig.canvas.flush_events()
-        except NotImplementedError:
-            pass
+            try:
+                fig.canvas.flush_events()
+            except NotImplementedError:
+                pass
 
         plt.ion()
 
@@ -178,6 +178,34 @@ class AbstractMatplotlibViewer(AbstractViewer):
         if filename is not None:
             fig.savefig(filename)
 
+    def _changedSinceDrawn(self, values, *settings):
+        """Whether `values` or `settings` differ from the last time they
+        were drawn
+
+        Parameters
+        ----------
+        values : array_like
+            Data to display.
+        *settings
+            Anything else that affects the display, such as limits.
+
+        Returns
+        -------
+        bool
+            `True` if they need to be drawn.
+        """
+        from fipy.tools import numerix
+
+        drawn = getattr(self, "_drawn", None)
+        if (drawn is not None
+            and drawn[1] == settings
+            and numerix.array_equal(drawn[0], values)):
+            return False
+
+        self._drawn = (numerix.array(values, copy=True), settings)
+
+        return True
+
     def _validFileExtensions(self):
         return ["""
         Matplotlib has no reliable way to determine
@@ -0,0 +1,217 @@
+"""Shared-memory ring buffer of frames for the Mayavi viewer
+
+:class:`~fipy.viewers.mayaviViewer.mayaviClient.MayaviClient` sends
+the mesh to the `mayaviDaemon` once, in VTK files, and then pushes only
+the values of its variables, one frame per `plot()`, through a
+`_FrameRing` in shared memory.
+
+The client never waits for the daemon.  The daemon always takes the
+newest frame and skips the older ones, and when it falls so far behind
+that the ring is full, the client drops new frames.
+
+    >>> from fipy.tools import numerix
+    >>> ring = _FrameRing(frameSize=3, slots=2) # doctest: +SHARED_MEMORY
+    >>> daemon = _FrameRing(name=ring.name) # doctest: +SHARED_MEMORY
+    >>> print(daemon.pop()) # doctest: +SHARED_MEMORY
+    None
+    >>> print(ring.push(numerix.array((1., 2., 3.)))) # doctest: +SHARED_MEMORY
+    True
+    >>> print(ring.push(numerix.array((4., 5., 6.)), filename="frame.png")) # doctest: +SHARED_MEMORY
+    True
+    >>> print(ring.push(numerix.array((7., 8., 9.)))) # doctest: +SHARED_MEMORY
+    False
+    >>> values, filename = daemon.pop() # doctest: +SHARED_MEMORY
+    >>> print(list(values), filename) # doctest: +SHARED_MEMORY
+    [4.0, 5.0, 6.0] frame.png
+    >>> print(ring.dropped, daemon.skipped) # doctest: +SHARED_MEMORY
+    1 1
+    >>> print(ring.push(numerix.array((7., 8., 9.)))) # doctest: +SHARED_MEMORY
+    True
+    >>> values, filename = daemon.pop() # doctest: +SHARED_MEMORY
+    >>> print(list(values), repr(filename)) # doctest: +SHARED_MEMORY
+    [7.0, 8.0, 9.0] None
+    >>> daemon.close() # doctest: +SHARED_MEMORY
+    >>> ring.close() # doctest: +SHARED_MEMORY
+"""
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tests.doctestPlus import register_skipper
+from fipy.tools import numerix
+
+def _checkForSharedMemory():
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        return False
+    return True
+
+register_skipper(flag="SHARED_MEMORY",
+                 test=_checkForSharedMemory,
+                 why="`multiprocessing.shared_memory` is not available")
+
+# header entries
+_SLOTS, _FRAMESIZE, _WRITTEN, _READ, _DROPPED, _SKIPPED = list(range(6))
+_HEADERSIZE = 8
+
+# per slot, a sequence number and a filename length ahead of the filename
+# and the values
+_FILENAMESIZE = 256
+
+# rings created by this process
+_created = set()
+
+class _FrameRing(object):
+    """Single producer, single consumer ring of equal sized frames
+
+    Each frame holds `frameSize` floats and, optionally, the name of a
+    file to save the rendered frame to.
+
+    Parameters
+    ----------
+    frameSize : int
+        Number of values in each frame.  Only needed to create the ring.
+    slots : int
+        Number of frames the ring holds, at least 2.
+    name : str
+        Name of an existing ring to attach to.
+    """
+    def __init__(self, frameSize=None, slots=4, name=None):
+        from multiprocessing import shared_memory
+
+        if name is None:
+            if slots < 2:
+                raise ValueError("a _FrameRing needs at least 2 slots")
+            nbytes = 8 * (_HEADERSIZE + slots * self._slotSize(frameSize))
+            self._memory = shared_memory.SharedMemory(create=True, size=nbytes)
+            _created.add(self._memory.name)
+            self._owner = True
+        else:
+            try:
+                self._memory = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # before Python 3.13, attaching also registers the block
+                # for removal when this process exits
+                from multiprocessing import resource_tracker
+                self._memory = shared_memory.SharedMemory(name=name)
+                if self._memory.name not in _created:
+                    resource_tracker.unregister(self._memory._name, "shared_memory")
+            self._owner = False
+
+        self._header = numerix.ndarray((_HEADERSIZE,), dtype='<u8',
+                                       buffer=self._memory.buf)
+        if self._owner:
+            self._header[:] = 0
+            self._header[_SLOTS] = slots
+            self._header[_FRAMESIZE] = frameSize
+
+        slots = int(self._header[_SLOTS])
+        frameSize = int(self._header[_FRAMESIZE])
+        slotSize = self._slotSize(frameSize)
+        self._slots = numerix.ndarray((slots, slotSize), dtype='<u8',
+                                      buffer=self._memory.buf,
+                                      offset=8 * _HEADERSIZE)
+        self._filenames = self._slots[:, 2:2 + _FILENAMESIZE // 8].view('u1')
+        self._values = self._slots[:, 2 + _FILENAMESIZE // 8:].view('<f8')
+
+    @staticmethod
+    def _slotSize(frameSize):
+        return 2 + _FILENAMESIZE // 8 + frameSize
+
+    @property
+    def name(self):
+        """Name to attach to the ring from another process
+        """
+        return self._memory.name
+
+    @property
+    def frameSize(self):
+        return int(self._header[_FRAMESIZE])
+
+    @property
+    def dropped(self):
+        """Number of frames that did not fit in the ring
+        """
+        return int(self._header[_DROPPED])
+
+    @property
+    def skipped(self):
+        """Number of frames passed over for a newer one
+        """
+        return int(self._header[_SKIPPED])
+
+    def push(self, values, filename=None):
+        """Add a frame, unless the ring is full
+
+        Parameters
+        ----------
+        values : array_like
+            The `frameSize` values of the frame.
+        filename : str
+            File to save the rendered frame to.
+
+        Returns
+        -------
+        bool
+            Whether the frame was added.
+        """
+        written = int(self._header[_WRITTEN])
+        if written - int(self._header[_READ]) >= len(self._slots):
+            self._header[_DROPPED] += 1
+            return False
+
+        slot = written % len(self._slots)
+        self._values[slot] = numerix.ravel(values)
+        encoded = (filename or "").encode("utf-8")[:_FILENAMESIZE]
+        self._filenames[slot, :len(encoded)] = numerix.frombuffer(encoded, dtype='u1')
+        self._slots[slot, 1] = len(encoded)
+        self._slots[slot, 0] = written + 1
+
+        # publish only once the frame is complete
+        self._header[_WRITTEN] = written + 1
+
+        return True
+
+    def pop(self):
+        """Take the newest frame and release all the others
+
+        Returns
+        -------
+        tuple of (ndarray, str) or None
+            The values and filename of the newest frame, or `None` if no
+            frame has been added since the last `pop()`.
+        """
+        written = int(self._header[_WRITTEN])
+        read = int(self._header[_READ])
+        if written == read:
+            return None
+
+        slot = (written - 1) % len(self._slots)
+        values = self._values[slot].copy()
+        filename = self._filenames[slot, :int(self._slots[slot, 1])].tobytes().decode("utf-8")
+
+        self._header[_SKIPPED] += written - read - 1
+        self._header[_READ] = written
+
+        return values, filename or None
+
+    def close(self):
+        """Detach from the ring, and remove it if this process created it
+        """
+        if self._memory is not None:
+            del self._header, self._slots, self._filenames, self._values
+            self._memory.close()
+            if self._owner:
+                self._memory.unlink()
+                _created.discard(self.name)
+            self._memory = None
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 from builtins import str
 __docformat__ = 'restructuredtext'
 
+import json
 import os
 import subprocess
 import sys
@@ -21,13 +22,18 @@ class MayaviClient(AbstractViewer):
 
     .. _Mayavi: http://code.enthought.com/projects/mayavi
 
+    The mesh is handed to the separate Mayavi process once.  After that,
+    each :meth:`plot` only copies the values of the variables into a ring
+    buffer in shared memory.  If the Mayavi process falls behind, frames
+    are dropped rather than holding up the solution.
+
     """
     __doc__ += AbstractViewer._test1D(viewer="MayaviClient")
     __doc__ += AbstractViewer._test2D(viewer="MayaviClient")
     __doc__ += AbstractViewer._test2Dirregular(viewer="MayaviClient")
     __doc__ += AbstractViewer._test3D(viewer="MayaviClient")
 
-    def __init__(self, vars, title=None, daemon_file=None, fps=1.0, **kwlimits):
+    def __init__(self, vars, title=None, daemon_file=None, fps=1.0, transport=None, **kwlimits):
         """Create a `MayaviClient`.
 
         Parameters
@@ -46,13 +52,32 @@ class MayaviClient(AbstractViewer):
             Defaults to `fipy/viewers/mayaviViewer/mayaviDaemon.py`
         fps : float, optional
             frames per second to attempt to display
+        transport : {"sharedMemory", "file"}, optional
+            how frames reach the Mayavi process.  `"sharedMemory"` (the
+            default, where available) sends only the values of the
+            variables, through shared memory, and drops frames that the
+            Mayavi process has no room for.  `"file"` writes all of the
+            VTK data to disk for every frame and waits until the Mayavi
+            process has read it.
         """
         self.fps = fps
 
+        if transport is None:
+            from fipy.viewers.mayaviViewer.frameRing import _checkForSharedMemory
+            if _checkForSharedMemory():
+                transport = "sharedMemory"
+            else:
+                transport = "file"
+        elif transport not in ("sharedMemory", "file"):
+            raise ValueError("transport must be 'sharedMemory' or 'file'")
+        self.transport = transport
+        self._ring = None
+
         self.vtkdir = tempfile.mkdtemp()
         self.vtkcellfname = os.path.join(self.vtkdir, "cell.vtk")
         self.vtkfacefname = os.path.join(self.vtkdir, "face.vtk")
         self.vtklockfname = os.path.join(self.vtkdir, "lock")
+        self.vtkringfname = os.path.join(self.vtkdir, "ring.json")
 
         from fipy.viewers.vtkViewer import VTKCellViewer, VTKFaceViewer
 
@@ -72,7 +97,11 @@ class MayaviClient(AbstractViewer):
 
         AbstractViewer.__init__(self, vars=cell_vars + face_vars, title=title, **kwlimits)
 
-        self.plot()
+        if self.transport == "sharedMemory":
+            self._writeVTK()
+            self._openRing()
+        else:
+            self.plot()
 
         from pkg_resources import Requirement, resource_filename
         daemon_file = (daemon_file
@@ -83,11 +112,14 @@ class MayaviClient(AbstractViewer):
 
         cmd = [pyth,
                daemon_file,
-               "--lock",
-               self.vtklockfname,
                "--fps",
                str(self.fps)]
 
+        if self.transport == "sharedMemory":
+            cmd += ["--ring", self.vtkringfname]
+        else:
+            cmd += ["--lock", self.vtklockfname]
+
         if self.vtkCellViewer is not None:
             cmd += ["--cell", self.vtkcellfname]
 
@@ -107,7 +139,10 @@ class MayaviClient(AbstractViewer):
         self.daemon = subprocess.Popen(cmd)
 
     def __del__(self):
-        for fname in [self.vtkcellfname, self.vtkfacefname, self.vtklockfname]:
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+        for fname in [self.vtkcellfname, self.vtkfacefname, self.vtklockfname, self.vtkringfname]:
             if fname and os.path.isfile(fname):
                 os.unlink(fname)
         os.rmdir(self.vtkdir)
@@ -137,20 +172,57 @@ class MayaviClient(AbstractViewer):
         else:
             return []
 
+    def _writeVTK(self):
+        if self.vtkCellViewer is not None:
+            self.vtkCellViewer.plot(filename=self.vtkcellfname)
+        if self.vtkFaceViewer is not None:
+            self.vtkFaceViewer.plot(filename=self.vtkfacefname)
+
+    def _frameArrays(self):
+        """The `(kind, name, value)` of each array sent in a frame
+        """
+        arrays = []
+        for kind, viewer in (("cell", self.vtkCellViewer),
+                             ("face", self.vtkFaceViewer)):
+            if viewer is not None:
+                for var in viewer.vars:
+                    name, rank, value = viewer._nameRankValue(var)
+                    arrays.append((kind, name, value))
+        return arrays
+
+    def _openRing(self):
+        from fipy.tools import numerix
+        from fipy.viewers.mayaviViewer.frameRing import _FrameRing
+
+        arrays = self._frameArrays()
+        self._ring = _FrameRing(frameSize=sum(numerix.size(value) for kind, name, value in arrays))
+
+        with open(self.vtkringfname, 'w') as f:
+            json.dump({"ring": self._ring.name,
+                       "arrays": [(kind, name, numerix.shape(value)) for kind, name, value in arrays]}, f)
+
     def plot(self, filename=None):
+        if self.transport == "sharedMemory":
+            from fipy.tools import numerix
+
+            values = [numerix.ravel(value) for kind, name, value in self._frameArrays()]
+            if len(values) > 0:
+                values = numerix.concatenate(values)
+            self._ring.push(values, filename=filename)
+            return
+
         start = time.time()
         plotted = False
         while not plotted:
             if not os.path.isfile(self.vtklockfname):
-                if self.vtkCellViewer is not None:
-                    self.vtkCellViewer.plot(filename=self.vtkcellfname)
-                if self.vtkFaceViewer is not None:
-                    self.vtkFaceViewer.plot(filename=self.vtkfacefname)
-                lock = file(self.vtklockfname, 'w')
+                self._writeVTK()
+                lock = open(self.vtklockfname, 'w')
                 if filename is not None:
                     lock.write(filename)
                 lock.close()
                 plotted = True
+            else:
+                time.sleep(0.1 / self.fps)
 
             if (time.time() - start > 30. / self.fps) and not plotted:
                 print("viewer: NOT READY")
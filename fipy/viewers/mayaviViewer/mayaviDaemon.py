@@ -1,5 +1,6 @@
-"""A simple script that polls a data file for changes and then updates
-the Mayavi pipeline automatically.
+"""A simple script that polls a data file, or a ring buffer of frames in
+shared memory, for changes and then updates the Mayavi pipeline
+automatically.
 
 This script is based heavily on the `poll_file.py` example in the Mayavi distribution.
 
@@ -23,6 +24,7 @@ from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
 # Standard imports.
+import json
 import os
 import signal
 import sys
@@ -40,7 +42,8 @@ except ImportError as e:
     from enthought.mayavi import mlab
 
 # FiPy library imports
-from fipy.tools.numerix import array, concatenate, where, zeros
+from fipy.tools.numerix import array, concatenate, prod, where, zeros
+from fipy.viewers.mayaviViewer.frameRing import _FrameRing
 
 __all__ = ["MayaviDaemon"]
 from future.utils import text_to_native_str
@@ -70,6 +73,9 @@ class MayaviDaemon(Mayavi):
         parser.add_option("-l", "--lock", action="store", dest="lock", type="string", default=None,
                           help="path of lock file")
 
+        parser.add_option("-r", "--ring", action="store", dest="ring", type="string", default=None,
+                          help="path of the description of a shared memory ring of frames")
+
         parser.add_option("-c", "--cell", action="store", dest="cell", type="string", default=None,
                           help="path of cell vtk file")
 
@@ -106,6 +112,7 @@ class MayaviDaemon(Mayavi):
         (options, args) = parser.parse_args(argv)
 
         self.lockfname = options.lock
+        self.ringfname = options.ring
         self.cellfname = options.cell
         self.facefname = options.face
         self.bounds = [options.xmin, options.xmax,
@@ -170,12 +177,24 @@ class MayaviDaemon(Mayavi):
 
         self.view_data()
 
-        # Poll the lock file.
-        self.timer = Timer(1000 / self.fps, self.poll_file)
+        if self.ringfname is not None:
+            with open(self.ringfname, 'r') as f:
+                description = json.load(f)
+            self.ring = _FrameRing(name=description["ring"])
+            self.arrays = description["arrays"]
+
+            # Poll the ring of frames.
+            self.timer = Timer(1000 / self.fps, self.poll_ring)
+        else:
+            # Poll the lock file.
+            self.timer = Timer(1000 / self.fps, self.poll_file)
 
     def __del__(self):
+        if getattr(self, "ring", None) is not None:
+            self.ring.close()
+            self.ring = None
         dir = None
-        for fname in [self.cellfname, self.facefname, self.lockfname]:
+        for fname in [self.cellfname, self.facefname, self.lockfname, self.ringfname]:
             if fname and os.path.isfile(fname):
                 os.unlink(fname)
                 if not dir:
@@ -193,13 +212,55 @@ class MayaviDaemon(Mayavi):
         if os.path.isfile(self.lockfname):
             self.update_pipeline(self.cellsource)
             self.update_pipeline(self.facesource)
-            lock = file(self.lockfname, 'r')
+            lock = open(self.lockfname, 'r')
             filename = lock.read()
             lock.close()
             if len(filename) > 0:
                 mlab.savefig(filename)
             os.unlink(self.lockfname)
 
+    def poll_ring(self):
+        frame = self.ring.pop()
+        if frame is not None:
+            values, filename = frame
+            offset = 0
+            for kind, name, shape in self.arrays:
+                size = int(prod(shape))
+                if kind == "cell":
+                    self.update_values(self.cellsource, "cell_data", name,
+                                       values[offset:offset + size].reshape(shape))
+                else:
+                    self.update_values(self.facesource, "point_data", name,
+                                       values[offset:offset + size].reshape(shape))
+                offset += size
+            self.refresh_pipeline(self.cellsource)
+            self.refresh_pipeline(self.facesource)
+            if filename is not None:
+                mlab.savefig(filename)
+
+    def update_values(self, source, attribute, name, value):
+        """Copy `value` into the array `name` of the data read by `source`
+        """
+        if source is not None and value.size > 0:
+            for out in source.outputs:
+                data = getattr(out, attribute).get_array(name)
+                if data is not None:
+                    data.to_array()[:] = value
+                    data.modified()
+
+    def refresh_pipeline(self, source):
+        """Propagate changed values through the pipeline, without
+        rereading the file.
+        """
+        if source is not None:
+            source.scene.disable_render = True
+            source.scene.anti_aliasing_frames = 0
+            for out in source.outputs:
+                out.modified()
+            # Propagate the changes in the pipeline.
+            source.data_changed = True
+            source.scene.disable_render = False
+
     def update_pipeline(self, source):
         """Override this to do something else if needed.
         """